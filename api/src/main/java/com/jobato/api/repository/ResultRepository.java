@@ -3,6 +3,10 @@ package com.jobato.api.repository;
 import com.jobato.api.model.ResultItem;
 import org.springframework.stereotype.Repository;
 
+import java.io.ByteArrayInputStream;
+import java.io.IOException;
+import java.io.InputStream;
+import java.nio.charset.StandardCharsets;
 import java.sql.Connection;
 import java.sql.PreparedStatement;
 import java.sql.ResultSet;
@@ -10,6 +14,7 @@ import java.sql.SQLException;
 import java.util.ArrayList;
 import java.util.List;
 import java.util.Optional;
+import java.util.zip.InflaterInputStream;
 
 @Repository
 public class ResultRepository {
@@ -22,7 +27,7 @@ public class ResultRepository {
     public List<ResultItem> findByRunId(String runId, boolean includeHidden) {
         StringBuilder sql = new StringBuilder("""
             SELECT id, run_id, query_id, query_text, search_query, domain, title, snippet,
-                   raw_url, final_url, created_at, raw_html_path, visible_text,
+                   raw_url, final_url, created_at, raw_html_path,
                    cache_key, cached_at, last_seen_at, normalized_url,
                    canonical_id, is_duplicate, is_hidden, duplicate_count,
                    relevance_score, scored_at, score_version
@@ -42,7 +47,7 @@ public class ResultRepository {
             statement.setString(1, runId);
             ResultSet resultSet = statement.executeQuery();
             while (resultSet.next()) {
-                results.add(map(resultSet));
+                results.add(map(resultSet, false));
             }
         } catch (SQLException exception) {
             throw new IllegalStateException("Failed to load results for run: " + runId, exception);
@@ -53,11 +58,13 @@ public class ResultRepository {
     public Optional<ResultItem> findById(Integer id) {
         String sql = """
             SELECT id, run_id, query_id, query_text, search_query, domain, title, snippet,
-                   raw_url, final_url, created_at, raw_html_path, visible_text,
+                   raw_url, final_url, created_at, raw_html_path,
+                   t.codec AS text_codec, t.visible_text AS text_payload,
                    cache_key, cached_at, last_seen_at, normalized_url,
                    canonical_id, is_duplicate, is_hidden, duplicate_count,
                    relevance_score, scored_at, score_version
             FROM run_items
+            LEFT JOIN run_item_texts t ON t.item_id = run_items.id
             WHERE id = ?
             """;
         try (Connection connection = activeRunDatabase.openConnection();
@@ -65,7 +72,7 @@ public class ResultRepository {
             statement.setInt(1, id);
             ResultSet resultSet = statement.executeQuery();
             if (resultSet.next()) {
-                return Optional.of(map(resultSet));
+                return Optional.of(map(resultSet, true));
             }
         } catch (SQLException exception) {
             throw new IllegalStateException("Failed to load result by id: " + id, exception);
@@ -76,7 +83,7 @@ public class ResultRepository {
     public List<ResultItem> findByRunIdAndQueryId(String runId, String queryId, boolean includeHidden) {
         StringBuilder sql = new StringBuilder("""
             SELECT id, run_id, query_id, query_text, search_query, domain, title, snippet,
-                   raw_url, final_url, created_at, raw_html_path, visible_text,
+                   raw_url, final_url, created_at, raw_html_path,
                    cache_key, cached_at, last_seen_at, normalized_url,
                    canonical_id, is_duplicate, is_hidden, duplicate_count,
                    relevance_score, scored_at, score_version
@@ -97,7 +104,7 @@ public class ResultRepository {
             statement.setString(2, queryId);
             ResultSet resultSet = statement.executeQuery();
             while (resultSet.next()) {
-                results.add(map(resultSet));
+                results.add(map(resultSet, false));
             }
         } catch (SQLException exception) {
             throw new IllegalStateException("Failed to load results for run and query", exception);
@@ -116,7 +123,7 @@ public class ResultRepository {
     public List<ResultItem> findAll(boolean includeHidden) {
         StringBuilder sql = new StringBuilder("""
             SELECT id, run_id, query_id, query_text, search_query, domain, title, snippet,
-                   raw_url, final_url, created_at, raw_html_path, visible_text,
+                   raw_url, final_url, created_at, raw_html_path,
                    cache_key, cached_at, last_seen_at, normalized_url,
                    canonical_id, is_duplicate, is_hidden, duplicate_count,
                    relevance_score, scored_at, score_version
@@ -134,7 +141,7 @@ public class ResultRepository {
              PreparedStatement statement = connection.prepareStatement(sql.toString())) {
             ResultSet resultSet = statement.executeQuery();
             while (resultSet.next()) {
-                results.add(map(resultSet));
+                results.add(map(resultSet, false));
             }
         } catch (SQLException exception) {
             throw new IllegalStateException("Failed to load all results", exception);
@@ -177,7 +184,8 @@ public class ResultRepository {
         return 0;
     }
 
-    private ResultItem map(ResultSet resultSet) throws SQLException {
+    // Listings leave visibleText null; only findById joins and inflates the page text
+    private ResultItem map(ResultSet resultSet, boolean withText) throws SQLException {
         Integer id = resultSet.getInt("id");
         String runId = resultSet.getString("run_id");
         String queryId = resultSet.getString("query_id");
@@ -190,7 +198,9 @@ public class ResultRepository {
         String finalUrl = resultSet.getString("final_url");
         String createdAt = resultSet.getString("created_at");
         String rawHtmlPath = resultSet.getString("raw_html_path");
-        String visibleText = resultSet.getString("visible_text");
+        String visibleText = withText
+            ? decodePageText(resultSet.getString("text_codec"), resultSet.getBytes("text_payload"))
+            : null;
         String cacheKey = resultSet.getString("cache_key");
         String cachedAt = resultSet.getString("cached_at");
         String lastSeenAt = resultSet.getString("last_seen_at");
@@ -220,4 +230,22 @@ public class ResultRepository {
             relevanceScore, scoredAt, scoreVersion
         );
     }
+
+    // Page text is stored compressed in run_item_texts by the ML service (see app/db/page_text.py)
+    private static String decodePageText(String codec, byte[] payload) throws SQLException {
+        if (payload == null) {
+            return null;
+        }
+        if ("identity".equals(codec)) {
+            return new String(payload, StandardCharsets.UTF_8);
+        }
+        if (!"zlib".equals(codec)) {
+            throw new SQLException("Unsupported page text codec: " + codec);
+        }
+        try (InputStream inflater = new InflaterInputStream(new ByteArrayInputStream(payload))) {
+            return new String(inflater.readAllBytes(), StandardCharsets.UTF_8);
+        } catch (IOException exception) {
+            throw new SQLException("Failed to decompress page text", exception);
+        }
+    }
 }
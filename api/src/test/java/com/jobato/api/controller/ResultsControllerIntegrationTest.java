@@ -66,7 +66,6 @@ class ResultsControllerIntegrationTest {
                   final_url TEXT,
                   created_at TEXT,
                   raw_html_path TEXT,
-                  visible_text TEXT,
                   cache_key TEXT,
                   cached_at TEXT,
                   last_seen_at TEXT,
@@ -80,6 +79,13 @@ class ResultsControllerIntegrationTest {
                   score_version TEXT
                 )
                 """);
+            statement.execute("""
+                CREATE TABLE IF NOT EXISTS run_item_texts (
+                  item_id INTEGER PRIMARY KEY,
+                  codec TEXT NOT NULL,
+                  visible_text BLOB NOT NULL
+                )
+                """);
         }
     }
 
@@ -180,12 +186,12 @@ class ResultsControllerIntegrationTest {
              PreparedStatement statement = connection.prepareStatement("""
                  INSERT INTO run_items (
                    run_id, query_id, query_text, search_query, domain, title, snippet,
-                   raw_url, final_url, created_at, raw_html_path, visible_text,
+                   raw_url, final_url, created_at, raw_html_path,
                    cache_key, cached_at, last_seen_at, normalized_url,
                    canonical_id, is_duplicate, is_hidden, duplicate_count,
                    relevance_score, scored_at, score_version
                  ) VALUES (?, 'query-1', 'Query text', 'search terms', 'example.com', ?, 'Snippet',
-                           'https://example.com/raw', 'https://example.com/final', ?, null, null,
+                           'https://example.com/raw', 'https://example.com/final', ?, null,
                            ?, null, null, 'norm',
                            null, 0, ?, 0,
                            0.5, ?, 'baseline')
@@ -5,15 +5,19 @@ import org.junit.jupiter.api.BeforeEach;
 import org.junit.jupiter.api.Test;
 import org.junit.jupiter.api.io.TempDir;
 
+import java.nio.charset.StandardCharsets;
 import java.nio.file.Files;
 import java.nio.file.Path;
 import java.sql.Connection;
 import java.sql.PreparedStatement;
 import java.sql.Statement;
+import java.util.Arrays;
 import java.util.List;
 import java.util.UUID;
+import java.util.zip.Deflater;
 
 import static org.junit.jupiter.api.Assertions.assertEquals;
+import static org.junit.jupiter.api.Assertions.assertNull;
 
 class ResultRepositoryOrderingTest {
     @TempDir
@@ -51,7 +55,6 @@ class ResultRepositoryOrderingTest {
                   final_url TEXT,
                   created_at TEXT,
                   raw_html_path TEXT,
-                  visible_text TEXT,
                   cache_key TEXT,
                   cached_at TEXT,
                   last_seen_at TEXT,
@@ -65,6 +68,13 @@ class ResultRepositoryOrderingTest {
                   score_version TEXT
                 )
                 """);
+            statement.execute("""
+                CREATE TABLE IF NOT EXISTS run_item_texts (
+                  item_id INTEGER PRIMARY KEY,
+                  codec TEXT NOT NULL,
+                  visible_text BLOB NOT NULL
+                )
+                """);
         }
     }
 
@@ -96,17 +106,42 @@ class ResultRepositoryOrderingTest {
         assertEquals(List.of(visibleTie, visibleOld), visibleOnly.stream().map(ResultItem::getId).toList());
     }
 
+    @Test
+    void findById_inflatesCompressedPageText() throws Exception {
+        int id = insertRunItem("run-3", "query-1", "With text", "2026-02-14T09:00:00Z", false);
+        int withoutText = insertRunItem("run-3", "query-1", "Without text", "2026-02-14T10:00:00Z", false);
+        byte[] text = "Senior backend engineer, remote".getBytes(StandardCharsets.UTF_8);
+        Deflater deflater = new Deflater();
+        deflater.setInput(text);
+        deflater.finish();
+        byte[] buffer = new byte[256];
+        int length = deflater.deflate(buffer);
+        deflater.end();
+
+        try (Connection connection = activeRunDatabase.openConnection();
+             PreparedStatement statement = connection.prepareStatement(
+                 "INSERT INTO run_item_texts (item_id, codec, visible_text) VALUES (?, 'zlib', ?)")) {
+            statement.setInt(1, id);
+            statement.setBytes(2, Arrays.copyOf(buffer, length));
+            statement.executeUpdate();
+        }
+
+        assertEquals("Senior backend engineer, remote", repository.findById(id).orElseThrow().getVisibleText());
+        assertNull(repository.findById(withoutText).orElseThrow().getVisibleText());
+        assertNull(repository.findByRunId("run-3", true).get(1).getVisibleText());
+    }
+
     private int insertRunItem(String runId, String queryId, String title, String createdAt, boolean isHidden) throws Exception {
         try (Connection connection = activeRunDatabase.openConnection();
              PreparedStatement statement = connection.prepareStatement("""
                  INSERT INTO run_items (
                    run_id, query_id, query_text, search_query, domain, title, snippet,
-                   raw_url, final_url, created_at, raw_html_path, visible_text,
+                   raw_url, final_url, created_at, raw_html_path,
                    cache_key, cached_at, last_seen_at, normalized_url,
                    canonical_id, is_duplicate, is_hidden, duplicate_count,
                    relevance_score, scored_at, score_version
                  ) VALUES (?, ?, 'Query text', 'search terms', 'example.com', ?, 'Snippet',
-                           'https://example.com/raw', 'https://example.com/final', ?, null, null,
+                           'https://example.com/raw', 'https://example.com/final', ?, null,
                            ?, null, null, 'norm',
                            null, 0, ?, 0,
                            0.5, ?, 'baseline')
@@ -0,0 +1,51 @@
+"""Add persistent cross-run dedupe index tables
+
+Revision ID: a7b8c9d0e1f2
+Revises: f6a7b8c9d0e1
+Create Date: 2026-10-18 03:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a7b8c9d0e1f2"
+down_revision: Union[str, None] = "f6a7b8c9d0e1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "dedupe_url_index",
+        sa.Column("normalized_url", sa.String(), primary_key=True),
+        sa.Column("canonical_id", sa.Integer(), nullable=False),
+    )
+    op.create_table(
+        "dedupe_signatures",
+        sa.Column("item_id", sa.Integer(), primary_key=True),
+        sa.Column("minhash", sa.LargeBinary(), nullable=False),
+    )
+    op.create_table(
+        "dedupe_lsh_buckets",
+        sa.Column("bucket", sa.Integer(), primary_key=True),
+        sa.Column("item_id", sa.Integer(), primary_key=True),
+    )
+    op.create_index("idx_dedupe_lsh_buckets__item_id", "dedupe_lsh_buckets", ["item_id"])
+    op.create_table(
+        "dedupe_index_state",
+        sa.Column("key", sa.String(), primary_key=True),
+        sa.Column("value", sa.String(), nullable=False),
+    )
+    # Existing canonical rows are indexed lazily by the next dedupe pass
+
+
+def downgrade() -> None:
+    op.drop_table("dedupe_index_state")
+    op.drop_index("idx_dedupe_lsh_buckets__item_id", table_name="dedupe_lsh_buckets")
+    op.drop_table("dedupe_lsh_buckets")
+    op.drop_table("dedupe_signatures")
+    op.drop_table("dedupe_url_index")
@@ -0,0 +1,40 @@
+"""Add run_item_shingles side table with packed shingle hashes
+
+Revision ID: b8c9d0e1f2a3
+Revises: a7b8c9d0e1f2
+Create Date: 2026-10-18 04:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b8c9d0e1f2a3"
+down_revision: Union[str, None] = "a7b8c9d0e1f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "run_item_shingles",
+        sa.Column("item_id", sa.Integer(), sa.ForeignKey("run_items.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("hashes", sa.LargeBinary(), nullable=False),
+    )
+    op.execute(
+        """
+        CREATE TRIGGER run_item_shingles__delete AFTER DELETE ON run_items
+        BEGIN
+            DELETE FROM run_item_shingles WHERE item_id = old.id;
+        END
+        """
+    )
+    # Existing rows are hashed and stored the first time dedupe reads them
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS run_item_shingles__delete")
+    op.drop_table("run_item_shingles")
@@ -0,0 +1,41 @@
+"""Add run_item_features side table with versioned hashed token counts
+
+Revision ID: c9d0e1f2a3b4
+Revises: b8c9d0e1f2a3
+Create Date: 2026-10-18 05:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c9d0e1f2a3b4"
+down_revision: Union[str, None] = "b8c9d0e1f2a3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "run_item_features",
+        sa.Column("item_id", sa.Integer(), sa.ForeignKey("run_items.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("version", sa.String(), nullable=False),
+        sa.Column("features", sa.LargeBinary(), nullable=False),
+    )
+    op.execute(
+        """
+        CREATE TRIGGER run_item_features__delete AFTER DELETE ON run_items
+        BEGIN
+            DELETE FROM run_item_features WHERE item_id = old.id;
+        END
+        """
+    )
+    # Existing rows are featurized when scoring next reads them
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS run_item_features__delete")
+    op.drop_table("run_item_features")
@@ -0,0 +1,28 @@
+"""Add score_model_id to run_items
+
+Revision ID: d0e1f2a3b4c5
+Revises: c9d0e1f2a3b4
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d0e1f2a3b4c5"
+down_revision: Union[str, None] = "c9d0e1f2a3b4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Model that produced relevance_score; versions alone repeat across models.
+    # Rows scored before this column are NULL and re-scored once by the next job.
+    op.add_column("run_items", sa.Column("score_model_id", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("run_items", "score_model_id")
@@ -0,0 +1,43 @@
+"""Add composite indexes for cache, revisit throttle and results read paths
+
+Revision ID: d4e5f6a7b8c9
+Revises: c3d4e5f6a7b8
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d4e5f6a7b8c9"
+down_revision: Union[str, None] = "c3d4e5f6a7b8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CacheService: latest cache window per key (ORDER BY cached_at DESC, id DESC LIMIT 1)
+    op.create_index("idx_run_items__cache_key_cached_at", "run_items", ["cache_key", "cached_at"])
+    # CacheService: cached results of one run for one key (ORDER BY id)
+    op.create_index("idx_run_items__run_id_cache_key", "run_items", ["run_id", "cache_key"])
+    # CacheService: revisit throttle lookup (final_url = ? OR raw_url = ?)
+    op.create_index("idx_run_items__final_url_last_seen_at", "run_items", ["final_url", "last_seen_at"])
+    op.create_index("idx_run_items__raw_url_last_seen_at", "run_items", ["raw_url", "last_seen_at"])
+    # API ResultRepository: per-run listings ordered by created_at DESC, id DESC
+    op.create_index("idx_run_items__run_id_created_at", "run_items", ["run_id", "created_at"])
+    # Scoring: unscored rows of a run
+    op.create_index("idx_run_items__run_id_relevance_score", "run_items", ["run_id", "relevance_score"])
+    # Dedupe and API duplicate counts per run
+    op.create_index("idx_run_items__run_id_is_duplicate", "run_items", ["run_id", "is_duplicate"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_run_items__run_id_is_duplicate", table_name="run_items")
+    op.drop_index("idx_run_items__run_id_relevance_score", table_name="run_items")
+    op.drop_index("idx_run_items__run_id_created_at", table_name="run_items")
+    op.drop_index("idx_run_items__raw_url_last_seen_at", table_name="run_items")
+    op.drop_index("idx_run_items__final_url_last_seen_at", table_name="run_items")
+    op.drop_index("idx_run_items__run_id_cache_key", table_name="run_items")
+    op.drop_index("idx_run_items__cache_key_cached_at", table_name="run_items")
@@ -0,0 +1,51 @@
+"""Add FTS5 full-text index over run_items title, snippet and visible_text
+
+Revision ID: e5f6a7b8c9d0
+Revises: d4e5f6a7b8c9
+Create Date: 2026-10-18 01:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e5f6a7b8c9d0"
+down_revision: Union[str, None] = "d4e5f6a7b8c9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # rowid mirrors run_items.id; rows are indexed by the ingestion pipeline
+    op.execute(
+        """
+        CREATE VIRTUAL TABLE run_items_fts USING fts5(
+            title,
+            snippet,
+            visible_text,
+            tokenize = 'unicode61 remove_diacritics 2'
+        )
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER run_items_fts__delete AFTER DELETE ON run_items
+        BEGIN
+            DELETE FROM run_items_fts WHERE rowid = old.id;
+        END
+        """
+    )
+    # Backfill rows persisted before the index existed
+    op.execute(
+        """
+        INSERT INTO run_items_fts (rowid, title, snippet, visible_text)
+        SELECT id, title, snippet, visible_text FROM run_items
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS run_items_fts__delete")
+    op.execute("DROP TABLE IF EXISTS run_items_fts")
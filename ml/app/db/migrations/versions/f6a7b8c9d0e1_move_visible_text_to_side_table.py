@@ -0,0 +1,78 @@
+"""Move run_items.visible_text into compressed run_item_texts side table
+
+Revision ID: f6a7b8c9d0e1
+Revises: e5f6a7b8c9d0
+Create Date: 2026-10-18 02:00:00.000000
+"""
+
+from typing import Sequence, Union
+import zlib
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f6a7b8c9d0e1"
+down_revision: Union[str, None] = "e5f6a7b8c9d0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_BATCH_SIZE = 500
+
+
+def upgrade() -> None:
+    op.create_table(
+        "run_item_texts",
+        sa.Column("item_id", sa.Integer(), sa.ForeignKey("run_items.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("codec", sa.String(), nullable=False),
+        sa.Column("visible_text", sa.LargeBinary(), nullable=False),
+    )
+    # Foreign keys are not enforced on our SQLite connections, so cascade by trigger
+    op.execute(
+        """
+        CREATE TRIGGER run_item_texts__delete AFTER DELETE ON run_items
+        BEGIN
+            DELETE FROM run_item_texts WHERE item_id = old.id;
+        END
+        """
+    )
+
+    bind = op.get_bind()
+    rows = bind.execute(sa.text("SELECT id, visible_text FROM run_items WHERE visible_text IS NOT NULL"))
+    insert = sa.text("INSERT INTO run_item_texts (item_id, codec, visible_text) VALUES (:item_id, 'zlib', :payload)")
+    while True:
+        batch = rows.fetchmany(_BATCH_SIZE)
+        if not batch:
+            break
+        bind.execute(
+            insert,
+            [{"item_id": row[0], "payload": zlib.compress(row[1].encode("utf-8"), 6)} for row in batch],
+        )
+
+    op.drop_column("run_items", "visible_text")
+
+
+def downgrade() -> None:
+    op.add_column("run_items", sa.Column("visible_text", sa.Text(), nullable=True))
+
+    bind = op.get_bind()
+    rows = bind.execute(sa.text("SELECT item_id, codec, visible_text FROM run_item_texts"))
+    update = sa.text("UPDATE run_items SET visible_text = :visible_text WHERE id = :item_id")
+    while True:
+        batch = rows.fetchmany(_BATCH_SIZE)
+        if not batch:
+            break
+        bind.execute(
+            update,
+            [
+                {
+                    "item_id": row[0],
+                    "visible_text": (zlib.decompress(row[2]) if row[1] == "zlib" else bytes(row[2])).decode("utf-8"),
+                }
+                for row in batch
+            ],
+        )
+
+    op.execute("DROP TRIGGER IF EXISTS run_item_texts__delete")
+    op.drop_table("run_item_texts")
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
-from sqlalchemy import ForeignKey, Index, Integer, String, Text
+from sqlalchemy import ForeignKey, Index, Integer, LargeBinary, String, Text
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
+from app.db.page_text import DEFAULT_CODEC, decode_page_text, encode_page_text
+
 
 class Base(DeclarativeBase):
     pass
@@ -18,6 +20,13 @@ class RunResult(Base):
         Index("idx_run_items__is_hidden", "is_hidden"),
         Index("idx_run_items__relevance_score", "relevance_score"),
         Index("idx_run_items__scored_at", "scored_at"),
+        Index("idx_run_items__cache_key_cached_at", "cache_key", "cached_at"),
+        Index("idx_run_items__run_id_cache_key", "run_id", "cache_key"),
+        Index("idx_run_items__final_url_last_seen_at", "final_url", "last_seen_at"),
+        Index("idx_run_items__raw_url_last_seen_at", "raw_url", "last_seen_at"),
+        Index("idx_run_items__run_id_created_at", "run_id", "created_at"),
+        Index("idx_run_items__run_id_relevance_score", "run_id", "relevance_score"),
+        Index("idx_run_items__run_id_is_duplicate", "run_id", "is_duplicate"),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -33,7 +42,6 @@ class RunResult(Base):
     created_at: Mapped[str] = mapped_column(String, nullable=False)
     updated_at: Mapped[str] = mapped_column(String, nullable=False)
     raw_html_path: Mapped[str | None] = mapped_column(String, nullable=True)
-    visible_text: Mapped[str | None] = mapped_column(Text, nullable=True)
     fetch_error: Mapped[str | None] = mapped_column(Text, nullable=True)
     extract_error: Mapped[str | None] = mapped_column(Text, nullable=True)
     cache_key: Mapped[str | None] = mapped_column(String, nullable=True)
@@ -53,3 +61,109 @@ class RunResult(Base):
     relevance_score: Mapped[float | None] = mapped_column(nullable=True)
     scored_at: Mapped[str | None] = mapped_column(String, nullable=True)
     score_version: Mapped[str | None] = mapped_column(String, nullable=True)
+    score_model_id: Mapped[str | None] = mapped_column(String, nullable=True)
+    # Extracted page text lives in run_item_texts and is only loaded on access
+    page_text: Mapped[RunItemText | None] = relationship(
+        "RunItemText",
+        lazy="select",
+        cascade="all, delete-orphan",
+        single_parent=True,
+    )
+    # Packed trigram hashes for dedupe, computed once at ingestion
+    shingles: Mapped[RunItemShingles | None] = relationship(
+        "RunItemShingles",
+        lazy="select",
+        cascade="all, delete-orphan",
+        single_parent=True,
+    )
+    # Hashed token counts for models, computed once at ingestion
+    features: Mapped[RunItemFeatures | None] = relationship(
+        "RunItemFeatures",
+        lazy="select",
+        cascade="all, delete-orphan",
+        single_parent=True,
+    )
+
+    @property
+    def visible_text(self) -> str | None:
+        if self.page_text is None:
+            return None
+        return decode_page_text(self.page_text.codec, self.page_text.visible_text)
+
+    @visible_text.setter
+    def visible_text(self, value: str | None) -> None:
+        if value is None:
+            self.page_text = None
+            return
+        payload = encode_page_text(value)
+        if self.page_text is None:
+            self.page_text = RunItemText(codec=DEFAULT_CODEC, visible_text=payload)
+        else:
+            self.page_text.codec = DEFAULT_CODEC
+            self.page_text.visible_text = payload
+
+
+class RunItemText(Base):
+    __tablename__ = "run_item_texts"
+
+    item_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("run_items.id", ondelete="CASCADE"), primary_key=True
+    )
+    codec: Mapped[str] = mapped_column(String, nullable=False)
+    visible_text: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+
+class RunItemShingles(Base):
+    """Sorted unique 64-bit trigram hashes of a row's comparable text (uint64 little-endian)."""
+
+    __tablename__ = "run_item_shingles"
+
+    item_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("run_items.id", ondelete="CASCADE"), primary_key=True
+    )
+    hashes: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+
+class RunItemFeatures(Base):
+    """Hashed token counts (uint32 indices then uint16 counts, little-endian) of one featurizer version."""
+
+    __tablename__ = "run_item_features"
+
+    item_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("run_items.id", ondelete="CASCADE"), primary_key=True
+    )
+    version: Mapped[str] = mapped_column(String, nullable=False)
+    features: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+
+class DedupeUrlEntry(Base):
+    """Normalized URL hash -> canonical record, across all deduped runs."""
+
+    __tablename__ = "dedupe_url_index"
+
+    normalized_url: Mapped[str] = mapped_column(String, primary_key=True)
+    canonical_id: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
+class DedupeSignature(Base):
+    """MinHash signature of a canonical record (uint64 little-endian)."""
+
+    __tablename__ = "dedupe_signatures"
+
+    item_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    minhash: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+
+class DedupeLshBucket(Base):
+    __tablename__ = "dedupe_lsh_buckets"
+    __table_args__ = (Index("idx_dedupe_lsh_buckets__item_id", "item_id"),)
+
+    bucket: Mapped[int] = mapped_column(Integer, primary_key=True)
+    item_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+
+class DedupeIndexState(Base):
+    __tablename__ = "dedupe_index_state"
+
+    key: Mapped[str] = mapped_column(String, primary_key=True)
+    value: Mapped[str] = mapped_column(String, nullable=False)
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import zlib
+
+
+# Codec names are stored per row so payloads written today stay readable if
+# the default changes later.
+ZLIB_CODEC = "zlib"
+IDENTITY_CODEC = "identity"
+DEFAULT_CODEC = ZLIB_CODEC
+_ZLIB_LEVEL = 6
+
+
+def encode_page_text(value: str, codec: str = DEFAULT_CODEC) -> bytes:
+    raw = value.encode("utf-8")
+    if codec == ZLIB_CODEC:
+        return zlib.compress(raw, _ZLIB_LEVEL)
+    if codec == IDENTITY_CODEC:
+        return raw
+    raise ValueError(f"Unsupported page text codec: {codec}")
+
+
+def decode_page_text(codec: str, payload: bytes | None) -> str | None:
+    if payload is None:
+        return None
+    if codec == ZLIB_CODEC:
+        return zlib.decompress(payload).decode("utf-8")
+    if codec == IDENTITY_CODEC:
+        return bytes(payload).decode("utf-8")
+    raise ValueError(f"Unsupported page text codec: {codec}")
@@ -5,8 +5,11 @@ from typing import Iterable
 
 from sqlalchemy.orm import Session
 
-from app.db.models import RunResult
+from app.db.models import RunItemFeatures, RunItemShingles, RunResult
 from app.schemas.results import ResultMetadata
+from app.services.dedupe_index import item_shingles
+from app.services.feature_store import FEATURIZER_VERSION, encode_features, featurize
+from app.services.minhash import encode_shingles
 
 
 class ResultRepository:
@@ -53,6 +56,15 @@ class ResultRepository:
             relevance_score=result.relevance_score,
             scored_at=result.scored_at,
             score_version=result.score_version,
+            score_model_id=result.score_model_id,
+            # Tokenised once here so dedupe and scoring never re-tokenise
+            shingles=RunItemShingles(
+                hashes=encode_shingles(item_shingles(result.title, result.snippet, result.visible_text))
+            ),
+            features=RunItemFeatures(
+                version=FEATURIZER_VERSION,
+                features=encode_features(featurize(result.title, result.snippet, result.domain)),
+            ),
         )
 
 
@@ -9,6 +9,8 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import Session
 
 
+ACTIVE_DB_POINTER = "db/current-db.txt"
+DEFAULT_ACTIVE_DB = "db/runs/active.db"
 _MIGRATION_LOCK = Lock()
 _MIGRATED_DATABASES: set[Path] = set()
 
@@ -25,6 +27,22 @@ def open_session(db_path: Path) -> Session:
     return Session(engine)
 
 
+def resolve_active_db_path(data_dir: Path) -> Path | None:
+    """The run DB ``current-db.txt`` points at, else the default active DB, if it exists."""
+    pointer_path = data_dir / ACTIVE_DB_POINTER
+    if pointer_path.exists():
+        pointer_value = pointer_path.read_text(encoding="utf-8").strip()
+        if pointer_value:
+            resolved = Path(pointer_value)
+            db_path = resolved if resolved.is_absolute() else data_dir / resolved
+            if db_path.exists():
+                return db_path
+    default_path = data_dir / DEFAULT_ACTIVE_DB
+    if default_path.exists():
+        return default_path
+    return None
+
+
 def _ensure_migrations(db_path: Path) -> None:
     normalized_path = db_path.resolve()
     if normalized_path in _MIGRATED_DATABASES:
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+import sqlite3
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.db.page_text import decode_page_text
+
+
+FTS_TABLE = "run_items_fts"
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 200
+HIGHLIGHT_OPEN = "<mark>"
+HIGHLIGHT_CLOSE = "</mark>"
+_SNIPPET_TOKENS = 16
+# bm25 column weights: title, snippet, visible_text
+_RANK_EXPRESSION = f"bm25({FTS_TABLE}, 10.0, 4.0, 1.0)"
+
+
+@dataclass(frozen=True)
+class TextSearchHit:
+    id: int
+    run_id: str
+    title: str
+    domain: str
+    final_url: str
+    highlight: str
+    rank: float
+
+
+def index_run_results(session: Session, run_id: str) -> int:
+    """Add the run's rows that are not yet in the full-text index."""
+    rows = session.execute(
+        text(
+            f"""
+            SELECT ri.id, ri.title, ri.snippet, t.codec, t.visible_text
+            FROM run_items ri
+            LEFT JOIN run_item_texts t ON t.item_id = ri.id
+            WHERE ri.run_id = :run_id
+              AND ri.id NOT IN (SELECT rowid FROM {FTS_TABLE})
+            """
+        ),
+        {"run_id": run_id},
+    ).all()
+    if rows:
+        session.execute(
+            text(
+                f"""
+                INSERT INTO {FTS_TABLE} (rowid, title, snippet, visible_text)
+                VALUES (:id, :title, :snippet, :visible_text)
+                """
+            ),
+            [_index_params(row) for row in rows],
+        )
+    session.commit()
+    return len(rows)
+
+
+def _index_params(row) -> dict[str, object]:
+    # Page text is stored compressed, so FTS content is decoded here
+    return {
+        "id": row[0],
+        "title": row[1],
+        "snippet": row[2],
+        "visible_text": decode_page_text(row[3], row[4]),
+    }
+
+
+def search_results(
+    db_path: Path,
+    query: str,
+    *,
+    run_id: str | None = None,
+    include_hidden: bool = False,
+    limit: int = DEFAULT_SEARCH_LIMIT,
+    offset: int = 0,
+) -> list[TextSearchHit]:
+    """Rank results matching every term of ``query`` (bm25, title weighted highest).
+
+    Terms ending in ``*`` are prefix matches. The database is opened read-only.
+    """
+    match_expression = build_match_expression(query)
+    if match_expression is None or not db_path.exists():
+        return []
+
+    clauses = [f"{FTS_TABLE} MATCH ?"]
+    params: list[object] = [HIGHLIGHT_OPEN, HIGHLIGHT_CLOSE, _SNIPPET_TOKENS, match_expression]
+    if run_id is not None:
+        clauses.append("ri.run_id = ?")
+        params.append(run_id)
+    if not include_hidden:
+        clauses.append("(ri.is_hidden = 0 OR ri.is_hidden IS NULL)")
+    params.extend([max(1, min(MAX_SEARCH_LIMIT, int(limit))), max(0, int(offset))])
+
+    sql = f"""
+        SELECT ri.id, ri.run_id, ri.title, ri.domain, ri.final_url,
+               snippet({FTS_TABLE}, -1, ?, ?, '...', ?) AS highlight,
+               {_RANK_EXPRESSION} AS rank
+        FROM {FTS_TABLE}
+        JOIN run_items ri ON ri.id = {FTS_TABLE}.rowid
+        WHERE {" AND ".join(clauses)}
+        ORDER BY rank ASC, ri.id DESC
+        LIMIT ? OFFSET ?
+    """
+    connection = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        rows = connection.execute(sql, params).fetchall()
+    finally:
+        connection.close()
+
+    return [
+        TextSearchHit(
+            id=int(row[0]),
+            run_id=str(row[1]),
+            title=str(row[2] or ""),
+            domain=str(row[3] or ""),
+            final_url=str(row[4] or ""),
+            highlight=str(row[5] or ""),
+            rank=float(row[6]),
+        )
+        for row in rows
+    ]
+
+
+def build_match_expression(query: str | None) -> str | None:
+    """Quote each whitespace-separated term so user input never hits FTS5 syntax."""
+    if not query:
+        return None
+    terms: list[str] = []
+    for raw_term in query.split():
+        prefix = raw_term.endswith("*")
+        term = raw_term.rstrip("*").replace('"', "")
+        if not term:
+            continue
+        quoted = f'"{term}"'
+        terms.append(f"{quoted}*" if prefix else quoted)
+    if not terms:
+        return None
+    return " ".join(terms)
@@ -4,13 +4,18 @@ from datetime import timezone
 from pathlib import Path
 
 import redis
-from fastapi import FastAPI, HTTPException, status
+from fastapi import FastAPI, HTTPException, Query, status
 from fastapi.responses import JSONResponse
 
-from app.runtime import RunEventsWorker
-from app.registry import initialize_registry, get_registry
+from app.runtime import RescoringWorker, RunEventsWorker
+from app.db.session import resolve_active_db_path
+from app.db.text_search import DEFAULT_SEARCH_LIMIT, MAX_SEARCH_LIMIT, search_results
+from app.registry import RegistryWatcher, initialize_registry, get_registry
+from app.pipelines.dedupe import shutdown_dedupe_pool
 from app.pipelines.evaluation import EvaluationPipeline, get_results, get_status
+from app.services.cross_validation import MAX_FOLDS
 from app.services.evaluation_store import EvaluationStore
+from app.services.inference_pool import shutdown_inference_pool, start_inference_pool
 from app.services.model_activation import ModelActivationError, ModelActivationService
 from app.services.model_selector import ModelSelector
 from app.pipelines.retrain import RetrainInProgressError, RetrainPipeline
@@ -22,6 +27,8 @@ logger = logging.getLogger(__name__)
 REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
 REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
 _run_events_worker: RunEventsWorker | None = None
+_rescoring_worker: RescoringWorker | None = None
+_registry_watcher: RegistryWatcher | None = None
 _evaluation_store: EvaluationStore | None = None
 _evaluation_pipeline: EvaluationPipeline | None = None
 _model_activation_service: ModelActivationService | None = None
@@ -77,8 +84,12 @@ def health() -> dict:
 @app.get("/ml/models")
 def list_models() -> dict:
     registry = get_registry()
+    models = registry.get_available_models()
+    for model in models:
+        model["trainedVersions"] = registry.get_trained_versions(model["identifier"])
     return {
-        "models": registry.get_available_models(),
+        "models": models,
+        "artifactCache": registry.artifact_cache_stats(),
         "errors": [
             {
                 "identifier": error.identifier,
@@ -90,11 +101,47 @@ def list_models() -> dict:
     }
 
 
+@app.get("/ml/results/search")
+def search_run_results(
+    q: str = Query(..., min_length=1),
+    run_id: str | None = Query(default=None, alias="runId"),
+    include_hidden: bool = Query(default=False, alias="includeHidden"),
+    limit: int = Query(default=DEFAULT_SEARCH_LIMIT, ge=1, le=MAX_SEARCH_LIMIT),
+    offset: int = Query(default=0, ge=0),
+) -> dict:
+    db_path = resolve_active_db_path(Path(os.getenv("DATA_DIR", "data")))
+    hits = []
+    if db_path is not None:
+        hits = search_results(
+            db_path,
+            q,
+            run_id=run_id,
+            include_hidden=include_hidden,
+            limit=limit,
+            offset=offset,
+        )
+    return {
+        "query": q,
+        "results": [
+            {
+                "id": hit.id,
+                "runId": hit.run_id,
+                "title": hit.title,
+                "domain": hit.domain,
+                "finalUrl": hit.final_url,
+                "highlight": hit.highlight,
+                "rank": hit.rank,
+            }
+            for hit in hits
+        ],
+    }
+
+
 @app.post("/ml/evaluations", status_code=status.HTTP_202_ACCEPTED)
-async def trigger_evaluation() -> dict:
+async def trigger_evaluation(folds: int | None = Query(default=None, ge=0, le=MAX_FOLDS)) -> dict:
     if _evaluation_pipeline is None:
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Evaluation service unavailable")
-    return _evaluation_pipeline.trigger_evaluation()
+    return _evaluation_pipeline.trigger_evaluation(folds=folds)
 
 
 @app.get("/ml/models/comparisons")
@@ -112,6 +159,7 @@ def activate_model(model_id: str) -> dict:
         activated = _model_activation_service.activate_model(model_id=model_id)
     except ModelActivationError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    _wake_rescoring()
     return {
         "modelId": activated.model_id,
         "modelVersion": activated.model_version,
@@ -129,6 +177,7 @@ def rollback_model(model_id: str) -> dict:
         activated = _model_activation_service.rollback_model(model_id=model_id)
     except ModelActivationError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    _wake_rescoring()
     return {
         "modelId": activated.model_id,
         "modelVersion": activated.model_version,
@@ -183,6 +232,7 @@ def trigger_retrain() -> dict:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    _wake_rescoring()
     return {"job": _retrain_pipeline.status_payload()["latest"]}
 
 
@@ -203,9 +253,22 @@ def retrain_history() -> dict:
     return _retrain_pipeline.history_payload()
 
 
+@app.get("/ml/rescoring/status")
+def rescoring_status() -> dict:
+    if _rescoring_worker is None:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Rescoring service unavailable")
+    return _rescoring_worker.status_payload()
+
+
+def _wake_rescoring() -> None:
+    # A new active version re-scores history; scheduled retrains are picked up by polling
+    if _rescoring_worker is not None:
+        _rescoring_worker.wake()
+
+
 @app.on_event("startup")
 def startup() -> None:
-    global _run_events_worker, _evaluation_store, _evaluation_pipeline, _model_activation_service, _model_selector, _retrain_pipeline, _retrain_scheduler
+    global _run_events_worker, _rescoring_worker, _registry_watcher, _evaluation_store, _evaluation_pipeline, _model_activation_service, _model_selector, _retrain_pipeline, _retrain_scheduler
 
     config_path = _registry_config_path()
     registry = initialize_registry(config_path)
@@ -215,6 +278,12 @@ def startup() -> None:
         [model["identifier"] for model in registry.get_available_models()],
         len(registry.load_errors),
     )
+    # models.yaml and new artifacts are picked up without a restart
+    _registry_watcher = RegistryWatcher(registry, config_path)
+    _registry_watcher.start()
+    inference_pool = start_inference_pool(config_path)
+    if inference_pool is not None:
+        logger.info("startup.inference_pool workers=%d", inference_pool.size)
 
     _evaluation_store = EvaluationStore(_evaluation_db_path())
     _evaluation_pipeline = EvaluationPipeline(store=_evaluation_store, registry=registry)
@@ -245,10 +314,23 @@ def startup() -> None:
     _run_events_worker = RunEventsWorker()
     _run_events_worker.start()
 
+    _rescoring_worker = RescoringWorker(
+        store=_evaluation_store,
+        registry=registry,
+        data_dir=Path(os.getenv("DATA_DIR", "data")),
+    )
+    _rescoring_worker.start()
+
 
 @app.on_event("shutdown")
 def shutdown() -> None:
     if _run_events_worker is not None:
         _run_events_worker.stop()
+    if _rescoring_worker is not None:
+        _rescoring_worker.stop()
     if _retrain_scheduler is not None:
         _retrain_scheduler.stop()
+    if _registry_watcher is not None:
+        _registry_watcher.stop()
+    shutdown_inference_pool()
+    shutdown_dedupe_pool()
@@ -1,5 +1,28 @@
-"""ML models package containing pluggable model implementations."""
+"""ML models package containing pluggable model implementations.
 
-from app.models.stub_model import BaselineModel
+Model modules are imported on first attribute access, so the registry can
+resolve ``app.models.<module>`` without importing every model's dependencies.
+"""
 
-__all__ = ["BaselineModel"]
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from app.models.linear_model import HashedLogisticModel
+    from app.models.stub_model import BaselineModel
+
+_EXPORTS = {
+    "BaselineModel": "app.models.stub_model",
+    "HashedLogisticModel": "app.models.linear_model",
+}
+
+__all__ = ["BaselineModel", "HashedLogisticModel"]
+
+
+def __getattr__(name: str) -> Any:
+    module_path = _EXPORTS.get(name)
+    if module_path is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module_path), name)
@@ -0,0 +1,145 @@
+"""Hashed-token logistic regression trained with mini-batch SGD.
+
+Rows are hashed into the feature store's token-count space (title, snippet
+and domain), log-scaled and L2-normalised, and scored by a single dense
+weight vector. Fitting, incremental updates and prediction all work on whole
+batches as NumPy arrays, so the stored feature vectors from scoring,
+evaluation and retraining are used without re-tokenising.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Sequence
+
+import numpy as np
+
+from app.registry.model_interface import ModelInterface
+from app.services.feature_store import FEATURIZER_VERSION, N_FEATURES, FeatureMatrix, featurize_rows
+
+
+DEFAULT_EPOCHS = 10
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_LEARNING_RATE = 4.0
+DEFAULT_L2 = 1e-6
+_SEED = 0x10615
+
+
+class HashedLogisticModel(ModelInterface):
+    """Logistic regression over hashed title/snippet/domain tokens.
+
+    ``predict`` maps the positive-class probability onto the [-1, 1] score
+    range; ``predict_proba`` returns the probability itself. Labels are
+    positive when greater than zero, so both 0/1 labels and relevance scores
+    can be passed to ``fit``.
+
+    Example:
+        model = HashedLogisticModel().fit(rows, labels)
+        scores = model.predict(rows)
+    """
+
+    featurizer_version = FEATURIZER_VERSION
+
+    def __init__(
+        self,
+        *,
+        epochs: int = DEFAULT_EPOCHS,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        learning_rate: float = DEFAULT_LEARNING_RATE,
+        l2: float = DEFAULT_L2,
+        seed: int = _SEED,
+    ) -> None:
+        self.epochs = epochs
+        self.batch_size = batch_size
+        self.learning_rate = learning_rate
+        self.l2 = l2
+        self.seed = seed
+        self.weights = np.zeros(N_FEATURES, dtype=np.float64)
+        self.bias = 0.0
+        self.samples_seen = 0
+
+    def fit(self, X: Any, y: Any) -> "HashedLogisticModel":
+        """Train from scratch for ``epochs`` shuffled passes."""
+        matrix = _prepare(X)
+        labels = _labels(y, len(matrix))
+        self.weights = np.zeros(N_FEATURES, dtype=np.float64)
+        self.bias = 0.0
+        self.samples_seen = 0
+        rng = np.random.default_rng(self.seed)
+        for _ in range(self.epochs):
+            self._sgd_pass(matrix, labels, rng.permutation(len(matrix)))
+        return self
+
+    def partial_fit(self, X: Any, y: Any) -> "HashedLogisticModel":
+        """One in-order pass over a new batch, keeping the current weights."""
+        matrix = _prepare(X)
+        self._sgd_pass(matrix, _labels(y, len(matrix)), np.arange(len(matrix)))
+        return self
+
+    def predict(self, X: Any) -> list[float]:
+        return (2.0 * self.predict_proba(X) - 1.0).tolist()
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        """Positive-class probability per row."""
+        matrix = _prepare(X)
+        return _sigmoid(matrix.dot(self.weights) + self.bias)
+
+    # Feature-store entry points (stored vectors arrive as a FeatureMatrix)
+    fit_features = fit
+    predict_features = predict
+
+    @property
+    def version(self) -> str:
+        return "1.0.0"
+
+    @property
+    def name(self) -> str:
+        return "Hashed Logistic Regression"
+
+    @property
+    def description(self) -> str:
+        return "Logistic regression (mini-batch SGD) over hashed title, snippet and domain tokens."
+
+    def _sgd_pass(self, matrix: FeatureMatrix, labels: np.ndarray, order: np.ndarray) -> None:
+        for start in range(0, len(order), self.batch_size):
+            rows = order[start : start + self.batch_size]
+            batch = matrix.take(rows)
+            row_ids = batch.row_ids()
+            error = _sigmoid(batch.dot(self.weights) + self.bias) - labels[rows]
+            step = self.learning_rate / len(rows)
+            # Gradient only touches the features present in the batch
+            touched, inverse = np.unique(batch.indices, return_inverse=True)
+            gradient = np.bincount(inverse, weights=batch.values * error[row_ids], minlength=touched.size)
+            self.weights[touched] -= step * (gradient + self.l2 * len(rows) * self.weights[touched])
+            self.bias -= step * float(error.sum())
+            self.samples_seen += len(rows)
+
+
+def _prepare(X: Any) -> FeatureMatrix:
+    """Log-scaled, L2-normalised rows from a FeatureMatrix or feature dicts."""
+    matrix = X if isinstance(X, FeatureMatrix) else featurize_rows(_rows(X))
+    values = np.log1p(matrix.values.astype(np.float64))
+    norms = np.sqrt(np.bincount(matrix.row_ids(), weights=values * values, minlength=len(matrix)))
+    norms[norms == 0] = 1.0
+    return FeatureMatrix(
+        indptr=matrix.indptr,
+        indices=matrix.indices,
+        values=values / np.repeat(norms, np.diff(matrix.indptr)),
+        n_features=matrix.n_features,
+    )
+
+
+def _rows(X: Any) -> Sequence[dict[str, Any]]:
+    if hasattr(X, "to_dict"):
+        return X.to_dict("records")
+    return list(X)
+
+
+def _labels(y: Any, expected: int) -> np.ndarray:
+    labels = (np.asarray(y, dtype=np.float64).reshape(-1) > 0).astype(np.float64)
+    if labels.size != expected:
+        raise ValueError(f"Got {labels.size} labels for {expected} rows")
+    return labels
+
+
+def _sigmoid(values: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-np.clip(values, -35.0, 35.0)))
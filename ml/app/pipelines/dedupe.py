@@ -3,15 +3,26 @@
 from __future__ import annotations
 
 import logging
-import re
+import math
+import multiprocessing
+import threading
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
-from sqlalchemy import select
+import numpy as np
+from sqlalchemy import text
 
-from app.db.models import RunResult
-from app.services.url_normalizer import normalize_url
+from app.services.dedupe_index import SHINGLE_COLUMNS, SHINGLE_JOINS, DedupeIndex, resolve_shingles
+from app.services.minhash import (
+    DEFAULT_NUM_PERM,
+    LshIndex,
+    MinHasher,
+    jaccard,
+    optimal_bands,
+)
+from app.services.ml_config import int_setting
 
 if TYPE_CHECKING:
     from sqlalchemy.orm import Session
@@ -20,228 +31,448 @@ logger = logging.getLogger(__name__)
 
 # Default similarity threshold for text-based deduplication
 DEFAULT_SIMILARITY_THRESHOLD = 0.90
+DEFAULT_DEDUPE_WORKERS = 1
+MAX_DEDUPE_WORKERS = 32
+# Below this many rows shipping hashes to the pool costs more than it saves
+PARALLEL_MIN_ITEMS = 10_000
+_TASKS_PER_WORKER = 4
+
+# Long-lived signature pool shared by every dedupe pass; see ``_signature_pool``
+_pool: ProcessPoolExecutor | None = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
 
 
 def dedupe_run_results(
     session: Session,
     run_id: str,
     similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+    *,
+    num_perm: int = DEFAULT_NUM_PERM,
+    bands: int | None = None,
+    cross_run: bool = True,
+    workers: int | None = None,
 ) -> DedupeOutcome:
     """Run deduplication on all results for a given run.
     
     Two-phase approach:
-    1. Exact URL matching using normalized_url
-    2. Text similarity matching for near-duplicates
+    1. Exact URL matching using normalized_url (a SQL ``GROUP BY``; no rows loaded)
+    2. Text similarity matching for near-duplicates (MinHash/LSH candidates,
+       exact Jaccard verification)
     
-    First occurrence is always the canonical record.
+    First occurrence is always the canonical record. With ``cross_run``,
+    canonical records of earlier runs (kept in the persistent dedupe index)
+    count as earlier occurrences in both phases, and the pass is incremental:
+    only rows inserted after the previous pass are loaded and compared, so
+    dedupe can run after every flushed batch. Without it the whole run is
+    re-examined on its own.
+
+    Every phase records (duplicate id, canonical id) decisions in a temporary
+    table; the flags and counts are then applied with two set-based UPDATEs.
     
     Args:
         session: Database session
         run_id: The run ID to dedupe
         similarity_threshold: Threshold for text similarity (0.0 to 1.0)
+        num_perm: MinHash permutations per signature
+        bands: LSH bands (must divide num_perm); derived from the threshold when None
+        cross_run: Match against the persistent index of earlier passes and runs
+        workers: Processes computing MinHash signatures for runs of at least
+            ``PARALLEL_MIN_ITEMS`` rows; ``dedupeWorkers`` from ml-config.yaml
+            when None (default 1, serial)
         
     Returns:
         DedupeOutcome with statistics about deduplication
     """
-    # Fetch all non-duplicate results for this run
+    index = DedupeIndex(session) if cross_run else None
+    workers = _resolve_dedupe_workers(workers)
+    session.flush()
+
+    # The non-duplicate results for this run that no earlier pass has seen
     # Include both False (0) and NULL values since new records have is_duplicate=NULL
-    results = session.execute(
-        select(RunResult).where(
-            RunResult.run_id == run_id,
-            (RunResult.is_duplicate == False) | (RunResult.is_duplicate.is_(None)),
-        )
-    ).scalars().all()
+    scope = _Scope(run_id=run_id, after_id=index.watermark if index is not None else 0)
+    count, first_id, last_id = session.execute(
+        text(f"SELECT COUNT(*), MIN(ri.id), MAX(ri.id) FROM run_items ri WHERE {scope.sql}"), scope.params
+    ).one()
     
-    if not results:
+    if not count:
         logger.info("dedupe.no_results run_id=%s", run_id)
         return DedupeOutcome(duplicates_found=0, canonical_count=0)
     
-    logger.info("dedupe.start run_id=%s count=%d", run_id, len(results))
-    
+    logger.info("dedupe.start run_id=%s count=%d", run_id, count)
+    _reset_decisions(session)
+
+    if index is not None:
+        # Canonicals of earlier passes (other runs and earlier batches of this run)
+        # are already indexed; this only picks up rows never deduped with the index
+        index.catch_up(before_id=first_id)
+        # Phase 1a: URLs already owned by a canonical record of an earlier pass
+        _decide_history_url_duplicates(session, scope, before_id=first_id)
+
     # Phase 1: Exact URL matching by normalized_url
-    url_groups = _group_by_normalized_url(results)
-    exact_duplicates = _process_url_groups(session, url_groups)
-    
-    # Refresh results list to exclude already-marked duplicates
-    remaining_results = [
-        r for r in results 
-        if r.id not in {d.id for d in exact_duplicates}
-    ]
+    _decide_url_duplicates(session, scope)
+
+    # Only rows still undecided need their shingles
+    rows = _load_undecided_shingles(session, scope)
+    shingles = {item_id: hashes for item_id, _, hashes in rows}
+
+    decisions: list[tuple[int, int, str]] = []
+    remaining = [item_id for item_id, _, _ in rows]
+    if index is not None:
+        # Phase 2a: near-duplicates of an earlier pass's canonical record
+        still_remaining: list[int] = []
+        for item_id in remaining:
+            canonical_id = index.find_similar_canonical(
+                shingles[item_id], similarity_threshold, before_id=first_id
+            )
+            if canonical_id is None:
+                still_remaining.append(item_id)
+            else:
+                decisions.append((item_id, canonical_id, _HISTORY_TEXT))
+        remaining = still_remaining
     
     # Phase 2: Text similarity matching
-    similar_duplicates = _find_similar_duplicates(
-        session, remaining_results, similarity_threshold
+    decisions.extend(
+        (duplicate_id, canonical_id, _TEXT)
+        for duplicate_id, canonical_id in _find_similar_duplicates(
+            [(item_id, shingles[item_id]) for item_id in remaining],
+            similarity_threshold,
+            num_perm=num_perm,
+            bands=bands,
+            workers=workers,
+        )
     )
+    _record_decisions(session, decisions)
+
+    phase_counts = _apply_decisions(session, first_id=first_id)
+
+    if index is not None:
+        text_duplicates = {item_id for item_id, _, _ in decisions}
+        index.add(
+            [
+                (item_id, normalized_url, shingles[item_id])
+                for item_id, normalized_url, _ in rows
+                if item_id not in text_duplicates
+            ]
+        )
+        index.advance_watermark(last_id)
     
+    session.execute(text(f"DROP TABLE IF EXISTS {_DECISIONS_TABLE}"))
     # Commit all changes
     session.commit()
     
-    total_duplicates = len(exact_duplicates) + len(similar_duplicates)
-    canonical_count = len(results) - total_duplicates
+    exact_count = phase_counts[_URL] + phase_counts[_HISTORY_URL]
+    similar_count = phase_counts[_TEXT] + phase_counts[_HISTORY_TEXT]
+    history_count = phase_counts[_HISTORY_URL] + phase_counts[_HISTORY_TEXT]
+    total_duplicates = exact_count + similar_count
+    canonical_count = count - total_duplicates
     
     logger.info(
-        "dedupe.complete run_id=%s exact=%d similar=%d canonical=%d",
-        run_id, len(exact_duplicates), len(similar_duplicates), canonical_count
+        "dedupe.complete run_id=%s exact=%d similar=%d history=%d canonical=%d",
+        run_id, exact_count, similar_count, history_count, canonical_count
     )
     
     return DedupeOutcome(
         duplicates_found=total_duplicates,
         canonical_count=canonical_count,
-        exact_duplicates=len(exact_duplicates),
-        similar_duplicates=len(similar_duplicates),
+        exact_duplicates=exact_count,
+        similar_duplicates=similar_count,
+        history_duplicates=history_count,
     )
 
 
-def _group_by_normalized_url(results: list[RunResult]) -> dict[str, list[RunResult]]:
-    """Group results by their normalized URL."""
-    groups: dict[str, list[RunResult]] = defaultdict(list)
-    for result in results:
-        if result.normalized_url:
-            groups[result.normalized_url].append(result)
-    return groups
+# Decision phases recorded next to each (duplicate, canonical) pair
+_URL = "url"
+_TEXT = "text"
+_HISTORY_URL = "history_url"
+_HISTORY_TEXT = "history_text"
+_DECISIONS_TABLE = "temp.dedupe_decisions"
 
 
-def _process_url_groups(
-    session: Session,
-    url_groups: dict[str, list[RunResult]],
-) -> list[RunResult]:
-    """Process URL groups and mark duplicates."""
-    duplicates: list[RunResult] = []
-    
-    for normalized_url, group in url_groups.items():
-        if len(group) <= 1:
-            continue
-        
-        # First occurrence is canonical
-        canonical = min(group, key=lambda r: r.id)
-        group_duplicates = [r for r in group if r.id != canonical.id]
-        
-        # Update canonical record
-        canonical.duplicate_count = len(group_duplicates)
-        canonical.is_duplicate = False
-        canonical.is_hidden = False
-        
-        # Mark duplicates
-        for dup in group_duplicates:
-            dup.canonical_id = canonical.id
-            dup.is_duplicate = True
-            dup.is_hidden = True
-            duplicates.append(dup)
-        
-        logger.debug(
-            "dedupe.url_match normalized_url=%s canonical_id=%d duplicates=%d",
-            normalized_url, canonical.id, len(group_duplicates)
+@dataclass(frozen=True)
+class _Scope:
+    """Rows a pass examines: undecided rows of the run above ``after_id``."""
+    run_id: str
+    after_id: int
+
+    @property
+    def sql(self) -> str:
+        return (
+            "ri.run_id = :run_id AND ri.id > :after_id "
+            "AND (ri.is_duplicate = 0 OR ri.is_duplicate IS NULL)"
         )
-    
-    return duplicates
+
+    @property
+    def params(self) -> dict[str, object]:
+        return {"run_id": self.run_id, "after_id": self.after_id}
+
+
+def _reset_decisions(session: Session) -> None:
+    session.execute(
+        text(
+            "CREATE TEMP TABLE IF NOT EXISTS dedupe_decisions ("
+            "item_id INTEGER PRIMARY KEY, canonical_id INTEGER NOT NULL, phase TEXT NOT NULL)"
+        )
+    )
+    session.execute(text(f"DELETE FROM {_DECISIONS_TABLE}"))
+
+
+def _decide_history_url_duplicates(session: Session, scope: _Scope, *, before_id: int) -> None:
+    session.execute(
+        text(
+            f"""
+            INSERT INTO {_DECISIONS_TABLE} (item_id, canonical_id, phase)
+            SELECT ri.id, u.canonical_id, :phase
+            FROM run_items ri
+            JOIN dedupe_url_index u ON u.normalized_url = ri.normalized_url
+            WHERE {scope.sql} AND u.canonical_id < :before_id
+            """
+        ),
+        {**scope.params, "before_id": before_id, "phase": _HISTORY_URL},
+    )
+
+
+def _decide_url_duplicates(session: Session, scope: _Scope) -> None:
+    """Group undecided rows by normalized_url; the lowest id of each group is canonical."""
+    undecided = f"{scope.sql} AND ri.id NOT IN (SELECT item_id FROM {_DECISIONS_TABLE})"
+    session.execute(
+        text(
+            f"""
+            INSERT INTO {_DECISIONS_TABLE} (item_id, canonical_id, phase)
+            SELECT ri.id, groups.canonical_id, :phase
+            FROM run_items ri
+            JOIN (
+                SELECT ri.normalized_url, MIN(ri.id) AS canonical_id
+                FROM run_items ri
+                WHERE {undecided} AND ri.normalized_url IS NOT NULL AND ri.normalized_url != ''
+                GROUP BY ri.normalized_url
+                HAVING COUNT(*) > 1
+            ) AS groups ON groups.normalized_url = ri.normalized_url
+            WHERE {undecided} AND ri.id != groups.canonical_id
+            """
+        ),
+        {**scope.params, "phase": _URL},
+    )
+
+
+def _load_undecided_shingles(session: Session, scope: _Scope) -> list[tuple[int, str | None, np.ndarray]]:
+    """(id, normalized_url, shingle hashes) of the rows no URL phase has claimed."""
+    rows = session.execute(
+        text(
+            f"""
+            SELECT ri.normalized_url, {SHINGLE_COLUMNS}
+            FROM run_items ri
+            {SHINGLE_JOINS}
+            WHERE {scope.sql} AND ri.id NOT IN (SELECT item_id FROM {_DECISIONS_TABLE})
+            ORDER BY ri.id
+            """
+        ),
+        scope.params,
+    ).all()
+    hashes = resolve_shingles(session, [row[1:] for row in rows])
+    return [(int(row[1]), row[0], row_hashes) for row, row_hashes in zip(rows, hashes)]
+
+
+def _record_decisions(session: Session, decisions: list[tuple[int, int, str]]) -> None:
+    if not decisions:
+        return
+    session.execute(
+        text(
+            f"INSERT INTO {_DECISIONS_TABLE} (item_id, canonical_id, phase) "
+            "VALUES (:item_id, :canonical_id, :phase)"
+        ),
+        [
+            {"item_id": item_id, "canonical_id": canonical_id, "phase": phase}
+            for item_id, canonical_id, phase in decisions
+        ],
+    )
+
+
+def _apply_decisions(session: Session, *, first_id: int) -> dict[str, int]:
+    """Write every recorded decision in two statements; returns duplicates per phase.
+
+    Canonical records gain their new duplicates on top of any earlier count.
+    Canonicals from this pass (``id >= first_id``) are also flagged visible;
+    records of earlier passes keep their flags. Duplicate flags are written
+    last, so a canonical that was itself claimed in a later phase stays a
+    duplicate.
+    """
+    session.execute(
+        text(
+            f"""
+            UPDATE run_items
+            SET duplicate_count = COALESCE(run_items.duplicate_count, 0) + counts.added,
+                is_duplicate = CASE WHEN run_items.id >= :first_id THEN 0 ELSE run_items.is_duplicate END,
+                is_hidden = CASE WHEN run_items.id >= :first_id THEN 0 ELSE run_items.is_hidden END
+            FROM (
+                SELECT canonical_id, COUNT(*) AS added FROM {_DECISIONS_TABLE} GROUP BY canonical_id
+            ) AS counts
+            WHERE run_items.id = counts.canonical_id
+            """
+        ),
+        {"first_id": first_id},
+    )
+    session.execute(
+        text(
+            f"""
+            UPDATE run_items
+            SET canonical_id = decisions.canonical_id, is_duplicate = 1, is_hidden = 1
+            FROM {_DECISIONS_TABLE} AS decisions
+            WHERE run_items.id = decisions.item_id
+            """
+        )
+    )
+    phase_counts: dict[str, int] = defaultdict(int)
+    for phase, added in session.execute(
+        text(f"SELECT phase, COUNT(*) FROM {_DECISIONS_TABLE} GROUP BY phase")
+    ):
+        phase_counts[str(phase)] = int(added)
+    return phase_counts
 
 
 def _find_similar_duplicates(
-    session: Session,
-    results: list[RunResult],
+    items: list[tuple[int, np.ndarray]],
     threshold: float,
-) -> list[RunResult]:
-    """Find duplicates based on text similarity.
-    
-    Uses Jaccard similarity on n-grams for efficient comparison.
+    *,
+    num_perm: int = DEFAULT_NUM_PERM,
+    bands: int | None = None,
+    workers: int = 1,
+) -> list[tuple[int, int]]:
+    """Find duplicates based on text similarity, as (duplicate id, canonical id) pairs.
+
+    ``items`` are (id, shingle hashes) in id order. MinHash/LSH proposes
+    candidate pairs; each candidate is verified with the exact Jaccard
+    similarity of its word trigrams.
     """
-    if len(results) < 2:
+    if len(items) < 2:
         return []
-    
-    duplicates: list[RunResult] = []
-    processed: set[int] = set()
-    
-    # Pre-compute text signatures for all results
-    signatures = {}
-    for result in results:
-        text = _extract_comparable_text(result)
-        if text:
-            signatures[result.id] = _compute_ngram_signature(text)
-    
-    # Compare each result with others
-    for i, result1 in enumerate(results):
-        if result1.id in processed:
-            continue
-        
-        sig1 = signatures.get(result1.id)
-        if not sig1:
+
+    if workers > 1 and len(items) >= PARALLEL_MIN_ITEMS:
+        groups = _similar_groups_parallel(items, threshold, num_perm=num_perm, bands=bands, workers=workers)
+    else:
+        groups = _similar_groups(items, threshold, num_perm=num_perm, bands=bands)
+
+    decisions: list[tuple[int, int]] = []
+    for canonical_id, duplicate_ids in groups:
+        # The canonical record is the first one seen
+        decisions.extend((duplicate_id, canonical_id) for duplicate_id in duplicate_ids)
+        logger.debug(
+            "dedupe.similar_match canonical_id=%d duplicates=%d",
+            canonical_id, len(duplicate_ids)
+        )
+    return decisions
+
+
+def _similar_groups(
+    items: list[tuple[int, np.ndarray]],
+    threshold: float,
+    *,
+    num_perm: int = DEFAULT_NUM_PERM,
+    bands: int | None = None,
+) -> list[tuple[int, list[int]]]:
+    """Greedy near-duplicate grouping in input order using LSH candidates.
+
+    Matches the pairwise scan: each unclaimed item claims every later unclaimed
+    item whose shingle Jaccard is at least ``threshold``.
+    """
+    hasher = MinHasher(num_perm)
+    signatures = [hasher.signature(hashes) for _, hashes in items]
+    return _claim_groups(items, signatures, threshold, num_perm=num_perm, bands=bands)
+
+
+def _similar_groups_parallel(
+    items: list[tuple[int, np.ndarray]],
+    threshold: float,
+    *,
+    num_perm: int = DEFAULT_NUM_PERM,
+    bands: int | None = None,
+    workers: int = 2,
+) -> list[tuple[int, list[int]]]:
+    """``_similar_groups`` with the MinHash signatures computed on a process pool.
+
+    Signatures are the per-row cost that grows with text length, so they are
+    spread over the shared pool in contiguous position ranges. The claim pass
+    stays in this process: like the serial scan it skips rows already claimed,
+    so a bucket of k near-identical rows costs about k Jaccard checks rather
+    than every pair in the bucket, and the groups are identical.
+    """
+    chunk_size = max(1, math.ceil(len(items) / (workers * _TASKS_PER_WORKER)))
+    tasks = [
+        (num_perm, [hashes for _, hashes in items[start : start + chunk_size]])
+        for start in range(0, len(items), chunk_size)
+    ]
+    signatures: list[np.ndarray | None] = []
+    for chunk in _signature_pool(workers).map(_signature_chunk, tasks):
+        signatures.extend(chunk)
+    return _claim_groups(items, signatures, threshold, num_perm=num_perm, bands=bands)
+
+
+def _claim_groups(
+    items: list[tuple[int, np.ndarray]],
+    signatures: list[np.ndarray | None],
+    threshold: float,
+    *,
+    num_perm: int,
+    bands: int | None,
+) -> list[tuple[int, list[int]]]:
+    index = LshIndex(num_perm, bands or optimal_bands(threshold, num_perm))
+    for position, signature in enumerate(signatures):
+        if signature is not None:
+            index.insert(position, signature)
+
+    groups: list[tuple[int, list[int]]] = []
+    claimed: set[int] = set()
+    for position, signature in enumerate(signatures):
+        if signature is None or position in claimed:
             continue
-        
-        similar_results: list[RunResult] = []
-        
-        for result2 in results[i + 1:]:
-            if result2.id in processed:
-                continue
-            
-            sig2 = signatures.get(result2.id)
-            if not sig2:
-                continue
-            
-            similarity = _compute_jaccard_similarity(sig1, sig2)
-            
-            if similarity >= threshold:
-                similar_results.append(result2)
-                processed.add(result2.id)
-        
-        if similar_results:
-            # result1 is the canonical record (first seen)
-            result1.duplicate_count = len(similar_results)
-            result1.is_duplicate = False
-            result1.is_hidden = False
-            
-            # Mark similar results as duplicates
-            for dup in similar_results:
-                dup.canonical_id = result1.id
-                dup.is_duplicate = True
-                dup.is_hidden = True
-                duplicates.append(dup)
-            
-            logger.debug(
-                "dedupe.similar_match canonical_id=%d duplicates=%d",
-                result1.id, len(similar_results)
-            )
-    
-    return duplicates
+        hashes = items[position][1]
+        matches = [
+            candidate
+            for candidate in sorted(index.query(signature))
+            if candidate > position
+            and candidate not in claimed
+            and jaccard(hashes, items[candidate][1]) >= threshold
+        ]
+        if matches:
+            claimed.update(matches)
+            groups.append((items[position][0], [items[candidate][0] for candidate in matches]))
+    return groups
 
 
-def _extract_comparable_text(result: RunResult) -> str:
-    """Extract text for similarity comparison."""
-    parts = []
-    if result.title:
-        parts.append(result.title)
-    if result.snippet:
-        parts.append(result.snippet)
-    if result.visible_text:
-        parts.append(result.visible_text)
-    return " ".join(parts)
+def _signature_chunk(task: tuple[int, list[np.ndarray]]) -> list[np.ndarray | None]:
+    num_perm, hashes = task
+    hasher = MinHasher(num_perm)
+    return [hasher.signature(row_hashes) for row_hashes in hashes]
 
 
-def _compute_ngram_signature(text: str, n: int = 3) -> set[str]:
-    """Compute n-gram signature for text."""
-    # Normalize text: lowercase, remove extra whitespace
-    normalized = re.sub(r'\s+', ' ', text.lower().strip())
-    
-    # Generate n-grams
-    ngrams = set()
-    words = normalized.split()
-    for i in range(len(words) - n + 1):
-        ngram = ' '.join(words[i:i + n])
-        ngrams.add(ngram)
-    
-    return ngrams
+def _signature_pool(workers: int) -> ProcessPoolExecutor:
+    """The shared signature pool, started on first use and resized when ``workers`` changes."""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False, cancel_futures=True)
+            # Spawned, not forked: the API process runs threads that a fork would copy mid-flight
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _pool_workers = workers
+            logger.info("dedupe.pool_started workers=%d", workers)
+        return _pool
 
 
-def _compute_jaccard_similarity(set1: set, set2: set) -> float:
-    """Compute Jaccard similarity between two sets."""
-    if not set1 and not set2:
-        return 1.0
-    if not set1 or not set2:
-        return 0.0
-    
-    intersection = len(set1 & set2)
-    union = len(set1 | set2)
-    
-    return intersection / union if union > 0 else 0.0
+def shutdown_dedupe_pool() -> None:
+    global _pool, _pool_workers
+    with _pool_lock:
+        pool, _pool, _pool_workers = _pool, None, 0
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _resolve_dedupe_workers(explicit: int | None) -> int:
+    if explicit is not None:
+        return max(1, min(MAX_DEDUPE_WORKERS, int(explicit)))
+    return int_setting(
+        "dedupeWorkers", DEFAULT_DEDUPE_WORKERS, minimum=1, maximum=MAX_DEDUPE_WORKERS
+    )
 
 
 @dataclass(frozen=True)
@@ -251,3 +482,5 @@ class DedupeOutcome:
     canonical_count: int
     exact_duplicates: int = 0
     similar_duplicates: int = 0
+    # Matched a canonical record from an earlier pass (earlier batch or run)
+    history_duplicates: int = 0
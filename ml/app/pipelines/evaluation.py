@@ -1,21 +1,28 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import logging
 import os
-import sqlite3
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Awaitable, Callable, Sequence
 from uuid import uuid4
 
-import yaml
+import numpy as np
 
+from app.db.session import resolve_active_db_path
 from app.registry import ModelRegistry, get_registry
+from app.services.cross_validation import MAX_FOLDS, FoldPool, stratified_folds, summarize_folds
+from app.services.evaluation_dataset import DatasetColumns, EvaluationDatasetCache
 from app.services.evaluation_store import EvaluationResultRow, EvaluationStore
 from app.services.evaluation_worker import run_worker_pool
-from app.services.metrics import calculate_metrics
+from app.services.feature_store import FeatureMatrix, featurize_rows, supports_feature_matrix
+from app.services.inference_pool import run_fit_predict
+from app.services.metrics import calculate_metrics, predicted_labels, ranking_summary
+from app.services.ml_config import int_setting, load_ml_config
+from app.services.run_item_export import export_root_for, has_exports
 
 
 logger = logging.getLogger(__name__)
@@ -26,8 +33,13 @@ MAX_EVAL_WORKERS = 10
 @dataclass(frozen=True)
 class EvaluationDataset:
     dataset_id: str
-    features: list[dict[str, Any]]
+    features: Sequence[dict[str, Any]]
     labels: list[int]
+    # Stored feature-store vectors of ``features``, row for row
+    matrix: FeatureMatrix | None = None
+
+    def feature_matrix(self) -> FeatureMatrix:
+        return self.matrix if self.matrix is not None else featurize_rows(self.features)
 
 
 @dataclass(frozen=True)
@@ -37,37 +49,50 @@ class EvaluationJob:
     model: Any
 
 
+@dataclass(frozen=True)
+class _Scored:
+    metrics: dict[str, float]
+    ranking: dict[str, Any] | None = None
+    # k-fold runs only
+    cross_validation: dict[str, Any] | None = None
+
+
+_Scorer = Callable[[EvaluationJob, EvaluationDataset], Awaitable[_Scored]]
+
+
 class EvaluationDatasetProvider:
-    def __init__(self, *, data_dir: Path | None = None) -> None:
+    """Active dataset for evaluations, kept in an ``EvaluationDatasetCache`` between calls."""
+
+    def __init__(self, *, data_dir: Path | None = None, cache: EvaluationDatasetCache | None = None) -> None:
         self._data_dir = data_dir or Path(os.getenv("DATA_DIR", "data"))
+        self._cache = cache or EvaluationDatasetCache()
+        self._dataset: tuple[DatasetColumns, EvaluationDataset] | None = None
 
     def load_dataset(self) -> EvaluationDataset:
-        db_path = self._resolve_active_db_path()
-        if db_path is None or not db_path.exists():
+        db_path = resolve_active_db_path(self._data_dir)
+        if db_path is None:
             return _default_dataset()
 
-        rows = _load_rows_from_run_items(db_path)
-        if not rows:
+        export_root = export_root_for(self._data_dir)
+        if has_exports(export_root):
+            columns, source = self._cache.load_exports(export_root, db_path)
+        else:
+            columns, source = self._cache.load_run_db(db_path), db_path.name
+        if not len(columns):
             return _default_dataset()
 
-        features: list[dict[str, Any]] = []
-        labels: list[int] = []
-        for title, snippet, domain, relevance_score in rows:
-            features.append({"title": title, "snippet": snippet, "domain": domain})
-            labels.append(1 if float(relevance_score) > 0 else 0)
-
-        dataset_id = f"{db_path.name}:{len(rows)}"
-        return EvaluationDataset(dataset_id=dataset_id, features=features, labels=labels)
-
-    def _resolve_active_db_path(self) -> Path | None:
-        pointer_path = self._data_dir / "db" / "current-db.txt"
-        if not pointer_path.exists():
-            return None
-        value = pointer_path.read_text(encoding="utf-8").strip()
-        if not value:
-            return None
-        path = Path(value)
-        return path if path.is_absolute() else self._data_dir / value
+        dataset_id = f"{source}:{len(columns)}"
+        cached = self._dataset
+        if cached is not None and cached[0] is columns and cached[1].dataset_id == dataset_id:
+            return cached[1]
+        dataset = EvaluationDataset(
+            dataset_id=dataset_id,
+            features=columns.feature_rows(),
+            labels=columns.labels.tolist(),
+            matrix=columns.matrix,
+        )
+        self._dataset = (columns, dataset)
+        return dataset
 
 
 class EvaluationPipeline:
@@ -78,19 +103,26 @@ class EvaluationPipeline:
         registry: ModelRegistry | None = None,
         dataset_provider: EvaluationDatasetProvider | None = None,
         eval_workers: int | None = None,
+        folds: int | None = None,
     ) -> None:
         self._store = store
         self._registry = registry or get_registry()
         self._dataset_provider = dataset_provider or EvaluationDatasetProvider()
         self._eval_workers = _resolve_eval_workers(eval_workers)
+        self._folds = _resolve_folds(folds)
 
     @property
     def eval_workers(self) -> int:
         return self._eval_workers
 
-    def trigger_evaluation(self) -> dict[str, Any]:
+    def trigger_evaluation(self, *, folds: int | None = None) -> dict[str, Any]:
+        """Start an evaluation; ``folds`` >= 2 cross-validates, 0 fits and scores the full dataset."""
         dataset = self._dataset_provider.load_dataset()
         jobs = self._build_jobs()
+        # Never more folds than rows; fewer than two leaves nothing to hold out
+        fold_count = min(self._folds if folds is None else _resolve_folds(folds), len(dataset.labels))
+        if fold_count < 2:
+            fold_count = 0
         evaluation_id = str(uuid4())
         self._store.create_run(
             evaluation_id=evaluation_id,
@@ -98,13 +130,16 @@ class EvaluationPipeline:
             eval_workers=self._eval_workers,
             total_models=len(jobs),
         )
-        asyncio.create_task(self._run_evaluation(evaluation_id=evaluation_id, dataset=dataset, jobs=jobs))
+        asyncio.create_task(
+            self._run_evaluation(evaluation_id=evaluation_id, dataset=dataset, jobs=jobs, folds=fold_count)
+        )
         return {
             "evaluationId": evaluation_id,
             "status": "running",
             "datasetId": dataset.dataset_id,
             "totalModels": len(jobs),
             "evalWorkers": self._eval_workers,
+            "folds": fold_count,
         }
 
     async def _run_evaluation(
@@ -113,43 +148,76 @@ class EvaluationPipeline:
         evaluation_id: str,
         dataset: EvaluationDataset,
         jobs: list[EvaluationJob],
+        folds: int = 0,
     ) -> None:
-        async def evaluate_job(job: EvaluationJob) -> None:
-            started = time.perf_counter()
-            try:
-                await asyncio.to_thread(job.model.fit, dataset.features, dataset.labels)
-                predictions = await asyncio.to_thread(job.model.predict, dataset.features)
-                binary_predictions = [_to_binary_prediction(value) for value in predictions]
-                metrics = calculate_metrics(dataset.labels, binary_predictions)
-                status = "completed"
-                error = None
-                failed_increment = 0
-            except Exception as exc:
-                logger.warning("evaluation.model_failed evaluation_id=%s model=%s error=%s", evaluation_id, job.model_id, exc)
-                metrics = {}
-                status = "failed"
-                error = str(exc)
-                failed_increment = 1
-
-            duration_ms = int((time.perf_counter() - started) * 1000)
-            self._store.store_result(
-                EvaluationResultRow(
-                    evaluation_id=evaluation_id,
-                    model_id=job.model_id,
-                    model_version=job.model_version,
-                    dataset_id=dataset.dataset_id,
-                    status=status,
-                    metrics=metrics,
-                    error=error,
-                    duration_ms=duration_ms,
-                    created_at=_timestamp_now(),
-                )
+        pool: FoldPool | None = None
+        if folds:
+            assignment = stratified_folds(dataset.labels, folds)
+            # Spawning the workers ships them the dataset; keep that off the event loop
+            pool = await asyncio.to_thread(
+                FoldPool,
+                min(self._eval_workers, max(1, len(jobs) * folds)),
+                features=dataset.features,
+                labels=dataset.labels,
+                matrix=dataset.matrix,
+                assignment=assignment,
             )
-            self._store.update_progress(evaluation_id=evaluation_id, failed_increment=failed_increment)
+            await asyncio.to_thread(pool.warm)
+            score: _Scorer = functools.partial(_cross_validate, pool=pool, assignment=assignment, folds=folds)
+            # Every model's folds are queued at once; the process pool bounds the parallelism
+            worker_count = max(1, len(jobs))
+        else:
+            score = _fit_and_score
+            worker_count = self._eval_workers
+
+        async def evaluate_job(job: EvaluationJob) -> None:
+            await self._evaluate_job(evaluation_id, dataset, job, score)
 
-        await run_worker_pool(jobs, worker_count=self._eval_workers, worker_fn=evaluate_job)
+        try:
+            await run_worker_pool(jobs, worker_count=worker_count, worker_fn=evaluate_job)
+        finally:
+            if pool is not None:
+                await asyncio.to_thread(pool.close)
         self._store.complete_run(evaluation_id=evaluation_id)
 
+    async def _evaluate_job(
+        self,
+        evaluation_id: str,
+        dataset: EvaluationDataset,
+        job: EvaluationJob,
+        score: _Scorer,
+    ) -> None:
+        started = time.perf_counter()
+        try:
+            scored = await score(job, dataset)
+            status = "completed"
+            error = None
+            failed_increment = 0
+        except Exception as exc:
+            logger.warning("evaluation.model_failed evaluation_id=%s model=%s error=%s", evaluation_id, job.model_id, exc)
+            scored = _Scored(metrics={})
+            status = "failed"
+            error = str(exc)
+            failed_increment = 1
+
+        duration_ms = int((time.perf_counter() - started) * 1000)
+        self._store.store_result(
+            EvaluationResultRow(
+                evaluation_id=evaluation_id,
+                model_id=job.model_id,
+                model_version=job.model_version,
+                dataset_id=dataset.dataset_id,
+                status=status,
+                metrics=scored.metrics,
+                error=error,
+                duration_ms=duration_ms,
+                created_at=_timestamp_now(),
+                cross_validation=scored.cross_validation,
+                ranking=scored.ranking,
+            )
+        )
+        self._store.update_progress(evaluation_id=evaluation_id, failed_increment=failed_increment)
+
     def _build_jobs(self) -> list[EvaluationJob]:
         jobs: list[EvaluationJob] = []
         for model_entry in self._registry.get_available_models():
@@ -193,12 +261,61 @@ def get_results(store: EvaluationStore, evaluation_id: str) -> dict[str, Any]:
                 "error": row.error,
                 "durationMs": row.duration_ms,
                 "createdAt": row.created_at,
+                "crossValidation": row.cross_validation,
+                "ranking": row.ranking,
             }
             for row in rows
         ],
     }
 
 
+async def _fit_and_score(job: EvaluationJob, dataset: EvaluationDataset) -> _Scored:
+    use_features = supports_feature_matrix(job.model)
+    predictions, _ = await asyncio.to_thread(
+        run_fit_predict,
+        job.model_id,
+        job.model,
+        dataset.feature_matrix() if use_features else dataset.features,
+        dataset.labels,
+        use_features=use_features,
+    )
+    scores = _prediction_scores(predictions)
+    return _Scored(
+        metrics=calculate_metrics(dataset.labels, predicted_labels(scores)),
+        ranking=ranking_summary(dataset.labels, scores),
+    )
+
+
+async def _cross_validate(
+    job: EvaluationJob,
+    dataset: EvaluationDataset,
+    *,
+    pool: FoldPool,
+    assignment: np.ndarray,
+    folds: int,
+) -> _Scored:
+    """Mean fold metrics with the per-fold metrics and their variance; ranking over out-of-fold scores."""
+    use_features = supports_feature_matrix(job.model)
+    fold_predictions = await asyncio.gather(
+        *(asyncio.wrap_future(pool.submit(job.model, fold, use_features=use_features)) for fold in range(folds))
+    )
+    labels = np.asarray(dataset.labels)
+    out_of_fold = np.zeros(labels.size, dtype=np.float64)
+    per_fold: list[dict[str, Any]] = []
+    for fold, predictions in enumerate(fold_predictions):
+        held_out = assignment == fold
+        scores = _prediction_scores(predictions)
+        out_of_fold[held_out] = scores
+        metrics = calculate_metrics(labels[held_out], predicted_labels(scores))
+        per_fold.append({"fold": fold, "rows": int(held_out.sum()), "metrics": metrics})
+    mean, variance = summarize_folds([entry["metrics"] for entry in per_fold])
+    return _Scored(
+        metrics=mean,
+        ranking=ranking_summary(labels, out_of_fold),
+        cross_validation={"folds": folds, "mean": mean, "variance": variance, "perFold": per_fold},
+    )
+
+
 def _resolve_eval_workers(explicit: int | None) -> int:
     if explicit is not None:
         return _sanitize_workers(explicit)
@@ -207,44 +324,29 @@ def _resolve_eval_workers(explicit: int | None) -> int:
 
 
 def _load_eval_workers_from_config() -> int:
-    config_dir = Path(os.getenv("CONFIG_DIR", "config"))
-    config_path = config_dir / "ml" / "ml-config.yaml"
-    if not config_path.exists():
-        return DEFAULT_EVAL_WORKERS
-    try:
-        payload = yaml.safe_load(config_path.read_text(encoding="utf-8"))
-    except Exception:
-        return DEFAULT_EVAL_WORKERS
-    if not isinstance(payload, dict):
-        return DEFAULT_EVAL_WORKERS
-    value = payload.get("evalWorkers", DEFAULT_EVAL_WORKERS)
+    value = load_ml_config().get("evalWorkers", DEFAULT_EVAL_WORKERS)
     if isinstance(value, int):
         return value
     return DEFAULT_EVAL_WORKERS
 
 
+def _resolve_folds(explicit: int | None) -> int:
+    if explicit is None:
+        return int_setting("evalFolds", 0, minimum=0, maximum=MAX_FOLDS)
+    return max(0, min(MAX_FOLDS, int(explicit)))
+
+
 def _sanitize_workers(value: int) -> int:
     return max(1, min(MAX_EVAL_WORKERS, int(value)))
 
 
-def _to_binary_prediction(value: Any) -> int:
-    if isinstance(value, bool):
-        return int(value)
-    if isinstance(value, (int, float)):
-        return 1 if float(value) >= 0.5 else 0
-    return 0
-
-
-def _load_rows_from_run_items(db_path: Path) -> list[tuple[str, str, str, float]]:
-    with sqlite3.connect(db_path) as conn:
-        rows = conn.execute(
-            """
-            SELECT title, snippet, domain, relevance_score
-            FROM run_items
-            WHERE relevance_score IS NOT NULL AND (is_duplicate = 0 OR is_duplicate IS NULL)
-            """
-        ).fetchall()
-    return [(str(row[0] or ""), str(row[1] or ""), str(row[2] or ""), float(row[3])) for row in rows]
+def _prediction_scores(predictions: Sequence[Any]) -> np.ndarray:
+    """Predictions as float scores; non-numeric values score 0."""
+    try:
+        scores = np.asarray(predictions, dtype=np.float64).reshape(-1)
+    except (TypeError, ValueError):
+        scores = np.array([float(value) if isinstance(value, (int, float)) else 0.0 for value in predictions])
+    return np.nan_to_num(scores, nan=0.0)
 
 
 def _default_dataset() -> EvaluationDataset:
@@ -12,12 +12,13 @@ import yaml
 from app.schemas.results import ResultMetadata, SearchResultItem
 from app.db.results_repository import ResultRepository
 from app.db.session import open_session
+from app.db.text_search import index_run_results
 from app.services.cache import CachePolicy, CacheService, load_cache_policy
 from app.services.html_fetcher import HtmlFetcher
 from app.services.html_extractor import HtmlExtractor
-from app.services.url_normalizer import normalize_url
+from app.services.url_normalizer import normalize_urls
 from app.pipelines.dedupe import dedupe_run_results, DedupeOutcome
-from app.pipelines.scoring import score_run_results, ScoringOutcome
+from app.pipelines.scoring import propagate_canonical_scores, score_run_results, ScoringOutcome
 
 
 @dataclass(frozen=True)
@@ -207,7 +208,12 @@ def ingest_run(
                     )
                 )
 
-        for resolved_result in resolved_results:
+        # Dedupe keys for the whole page of results; repeated URLs hit the memo
+        normalized_urls = normalize_urls(
+            resolved_result.final_url or resolved_result.raw_url for resolved_result in resolved_results
+        )
+
+        for resolved_result, normalized_url in zip(resolved_results, normalized_urls):
             lookup_url = resolved_result.final_url or resolved_result.raw_url
             prior_last_seen_at = effective_cache_service.find_latest_last_seen(url=lookup_url)
 
@@ -264,14 +270,11 @@ def ingest_run(
                 if not resolved_result.from_cache:
                     new_jobs_count += 1
 
-            # Normalize URL for dedupe key generation
-            url_to_normalize = resolved_result.final_url or resolved_result.raw_url
-            normalized_url = normalize_url(url_to_normalize)
             if normalized_url is None:
                 logger.warning(
                     "ingestion.url_normalization_failed run_id=%s url=%s",
                     run_id,
-                    url_to_normalize,
+                    lookup_url,
                 )
 
             pending_results.append(
@@ -320,6 +323,12 @@ def ingest_run(
     scoring_outcome = None
     try:
         persisted = writer.write_all(pending_results)
+
+        if session is not None and persisted > 0:
+            try:
+                index_run_results(session, run_id)
+            except Exception as e:
+                logger.warning("text_index.failed run_id=%s error=%s", run_id, e)
         
         # Run deduplication if enabled and we have a session
         if dedupe_enabled and session is not None and persisted > 0:
@@ -332,6 +341,8 @@ def ingest_run(
         if scoring_enabled and session is not None and persisted > 0:
             try:
                 scoring_outcome = score_run_results(session, run_id, now=timestamp)
+                # Duplicates (including cross-run ones) inherit in one statement
+                propagate_canonical_scores(session, run_id)
             except Exception as e:
                 logger.warning("scoring.failed run_id=%s error=%s", run_id, e)
         
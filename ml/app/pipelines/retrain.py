@@ -1,18 +1,44 @@
 from __future__ import annotations
 
-import pickle
+import json
 import sqlite3
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 from threading import Lock
-from typing import Any
+from typing import Any, Iterable
 from uuid import uuid4
 
+import numpy as np
+
+from app.db.session import resolve_active_db_path
 from app.registry import ModelRegistry, get_registry
+from app.services.active_model_cache import invalidate_active_model
 from app.services.evaluation_store import EvaluationStore, RetrainJobRow
-from app.services.metrics import calculate_metrics
+from app.services.feature_store import (
+    FeatureMatrix,
+    FeatureVector,
+    feature_sql,
+    featurize,
+    supports_feature_matrix,
+    vectors_from_rows,
+)
+from app.services.inference_pool import run_fit_predict
+from app.services.metrics import calculate_metrics, predicted_labels
+from app.services.model_artifacts import DEFAULT_ARTIFACT_DIR, validate_artifact, write_artifact
 from app.services.model_versioning import generate_retrain_version
+from app.services.run_item_export import (
+    FEATURE_SOURCE_COLUMNS,
+    LABELED_ROWS_SQL,
+    column_to_numpy,
+    current_partitions,
+    export_root_for,
+    feature_dicts,
+    feature_source_rows,
+    has_exports,
+    labeled_rows_filter,
+    load_run_items,
+)
 
 
 class RetrainInProgressError(RuntimeError):
@@ -23,6 +49,8 @@ class RetrainInProgressError(RuntimeError):
 class RetrainSample:
     features: dict[str, Any]
     label: int
+    # Stored feature-store vector of ``features``, when one was read
+    vector: FeatureVector | None = None
 
 
 class RetrainPipeline:
@@ -37,7 +65,7 @@ class RetrainPipeline:
         self._store = store
         self._registry = registry or get_registry()
         self._data_dir = data_dir or Path("data")
-        self._artifact_dir = artifact_dir or Path("ml/app/models/trained")
+        self._artifact_dir = artifact_dir or DEFAULT_ARTIFACT_DIR
         self._run_lock = Lock()
 
     def run_once(self, *, triggered_by: str) -> RetrainJobRow:
@@ -68,17 +96,24 @@ class RetrainPipeline:
                 )
                 return self._store.get_retrain_job(job_id)
 
-            model = self._registry.get_model(active.model_id)
+            model = self._registry.get_model_version(active.model_id, active.model_version)
             if model is None:
-                raise ValueError(f"Active model '{active.model_id}' is not registered")
+                raise ValueError(
+                    f"Active model '{active.model_id}' version '{active.model_version}' is not registered or loadable"
+                )
 
-            features = [sample.features for sample in samples]
             labels = [sample.label for sample in samples]
-
-            model.fit(features, labels)
-            predictions = model.predict(features)
-            binary_predictions = [1 if float(value) >= 0.5 else 0 for value in predictions]
-            metrics = calculate_metrics(labels, binary_predictions)
+            use_features = supports_feature_matrix(model)
+            predictions, model = run_fit_predict(
+                active.model_id,
+                model,
+                _samples_matrix(samples) if use_features else [sample.features for sample in samples],
+                labels,
+                use_features=use_features,
+                return_model=True,
+                version=active.model_version,
+            )
+            metrics = calculate_metrics(labels, predicted_labels(predictions))
 
             new_version = generate_retrain_version(active.model_version)
             artifact_path = self._write_artifact(
@@ -95,6 +130,7 @@ class RetrainPipeline:
                 activated_by="retrain",
                 action="activated",
             )
+            invalidate_active_model()
             self._store.complete_retrain_job(
                 job_id=job_id,
                 status="completed",
@@ -129,28 +165,38 @@ class RetrainPipeline:
         }
 
     def _load_new_labels(self, *, since: str | None) -> list[RetrainSample]:
-        db_path = self._resolve_active_db_path()
-        if db_path is None or not db_path.exists():
+        db_path = resolve_active_db_path(self._data_dir)
+        if db_path is None:
             return []
 
-        where_clause = "WHERE relevance_score IS NOT NULL AND (is_duplicate = 0 OR is_duplicate IS NULL)"
+        where_clause = f"WHERE {LABELED_ROWS_SQL}"
         params: list[str] = []
         if since is not None:
-            where_clause += " AND scored_at IS NOT NULL AND scored_at > ?"
+            where_clause += " AND ri.scored_at IS NOT NULL AND ri.scored_at > ?"
             params.append(since)
 
+        samples: list[RetrainSample] = []
+        export_root = export_root_for(self._data_dir)
         with sqlite3.connect(db_path) as conn:
+            # Runs whose partition is current come from the export; the rest from the DB
+            current = current_partitions(conn, export_root) if has_exports(export_root) else {}
+            if current:
+                samples.extend(_load_labels_from_exports(export_root, run_ids=current, since=since))
+                where_clause += " AND ri.run_id NOT IN (SELECT value FROM json_each(?))"
+                params.append(json.dumps(sorted(current)))
+            feature_columns, feature_join = feature_sql(conn)
             rows = conn.execute(
                 f"""
-                SELECT title, snippet, domain, relevance_score
-                FROM run_items
+                SELECT ri.title, ri.snippet, ri.domain, ri.relevance_score, {feature_columns}
+                FROM run_items ri
+                {feature_join}
                 {where_clause}
                 """,
                 params,
             ).fetchall()
 
-        samples: list[RetrainSample] = []
-        for row in rows:
+        vectors, _ = vectors_from_rows([(row[4], row[5], row[0], row[1], row[2]) for row in rows])
+        for row, vector in zip(rows, vectors):
             score = float(row[3])
             samples.append(
                 RetrainSample(
@@ -160,20 +206,11 @@ class RetrainPipeline:
                         "domain": str(row[2] or ""),
                     },
                     label=1 if score > 0 else 0,
+                    vector=vector,
                 )
             )
         return samples
 
-    def _resolve_active_db_path(self) -> Path | None:
-        pointer_path = self._data_dir / "db" / "current-db.txt"
-        if not pointer_path.exists():
-            return None
-        value = pointer_path.read_text(encoding="utf-8").strip()
-        if not value:
-            return None
-        path = Path(value)
-        return path if path.is_absolute() else self._data_dir / value
-
     def _write_artifact(
         self,
         *,
@@ -182,24 +219,44 @@ class RetrainPipeline:
         model: Any,
         metrics: dict[str, float],
     ) -> Path:
-        self._artifact_dir.mkdir(parents=True, exist_ok=True)
-        artifact_path = self._artifact_dir / f"{model_id}_{model_version}.pkl"
-        payload = {
-            "modelId": model_id,
-            "modelVersion": model_version,
-            "trainedAt": _timestamp_now(),
-            "metrics": metrics,
-            "model": model,
-        }
-        with artifact_path.open("wb") as handle:
-            pickle.dump(payload, handle)
-        return artifact_path
+        return write_artifact(
+            self._artifact_dir,
+            model_id=model_id,
+            model_version=model_version,
+            model=model,
+            metrics=metrics,
+            trained_at=_timestamp_now(),
+        )
 
     def _validate_artifact(self, artifact_path: Path, *, expected_version: str) -> None:
-        with artifact_path.open("rb") as handle:
-            payload = pickle.load(handle)
-        if payload.get("modelVersion") != expected_version:
-            raise ValueError("Saved retrain artifact version mismatch")
+        validate_artifact(artifact_path, expected_version=expected_version)
+
+
+def _load_labels_from_exports(export_root: Path, *, run_ids: Iterable[str], since: str | None) -> list[RetrainSample]:
+    table = load_run_items(
+        export_root,
+        ["relevance_score", *FEATURE_SOURCE_COLUMNS],
+        run_ids=run_ids,
+        filter=labeled_rows_filter(scored_after=since),
+    )
+    labels = (column_to_numpy(table, "relevance_score") > 0).astype(np.int8).tolist()
+    features = feature_dicts(table, ["title", "snippet", "domain"])
+    vectors, _ = vectors_from_rows(feature_source_rows(table))
+    return [
+        RetrainSample(features=row, label=label, vector=vector)
+        for row, label, vector in zip(features, labels, vectors)
+    ]
+
+
+def _samples_matrix(samples: list[RetrainSample]) -> FeatureMatrix:
+    return FeatureMatrix.from_vectors(
+        [
+            sample.vector
+            if sample.vector is not None
+            else featurize(sample.features.get("title"), sample.features.get("snippet"), sample.features.get("domain"))
+            for sample in samples
+        ]
+    )
 
 
 def _timestamp_now() -> str:
@@ -3,17 +3,31 @@
 from __future__ import annotations
 
 import logging
-import os
+import time
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import select, text
 
 from app.db.models import RunResult
 from app.registry import get_registry
-from app.services.evaluation_store import EvaluationStore
+from app.services.active_model_cache import (
+    ActiveModelReference,
+    evaluations_db_path,
+    get_active_model_reference,
+)
+from app.services.feature_store import (
+    FEATURE_COLUMNS,
+    FEATURE_JOIN,
+    FEATURIZER_VERSION,
+    FeatureMatrix,
+    encode_features,
+    supports_feature_matrix,
+    vectors_from_rows,
+)
+from app.services.inference_pool import run_predict
+from app.services.ml_config import int_setting
 
 if TYPE_CHECKING:
     from sqlalchemy.orm import Session
@@ -25,6 +39,9 @@ MIN_SCORE = -1.0
 MAX_SCORE = 1.0
 DEFAULT_SCORE = 0.0
 DEFAULT_SCORE_VERSION = "baseline"
+# Rows per predict call and per write-back batch
+DEFAULT_CHUNK_SIZE = 1_000
+MAX_CHUNK_SIZE = 100_000
 
 
 @dataclass(frozen=True)
@@ -32,12 +49,7 @@ class ScoringOutcome:
     """Outcome of the scoring process."""
     scored_count: int
     skipped_count: int  # Duplicates inherit scores, not scored directly
-
-
-@dataclass(frozen=True)
-class ActiveModelReference:
-    model_id: str
-    model_version: str
+    rows_per_second: float = 0.0
 
 
 def score_run_results(
@@ -47,11 +59,18 @@ def score_run_results(
     model_identifier: str | None = None,
     active_model: ActiveModelReference | None = None,
     now: datetime | None = None,
+    chunk_size: int | None = None,
 ) -> ScoringOutcome:
     """Assign relevance scores to all non-duplicate results for a run.
     
     Baseline scoring assigns a default score of 0 to all non-duplicate results.
     Duplicates inherit scores from their canonical records and are not scored directly.
+
+    Unscored rows are streamed in id order, ``chunk_size`` at a time: only the
+    feature columns are read, the model predicts once per chunk and the scores
+    are written back with one executemany UPDATE per chunk. Models that
+    consume the feature store get each chunk as a ``FeatureMatrix`` of the
+    stored vectors; missing or stale vectors are recomputed and stored.
     
     Args:
         session: Database session
@@ -59,26 +78,33 @@ def score_run_results(
         score_version: Model version identifier override
         model_identifier: Optional model identifier to score with
         now: Optional timestamp for scoring (defaults to UTC now)
+        chunk_size: Rows per predict call; ``scoringChunkSize`` from ml-config.yaml when None
         
     Returns:
         ScoringOutcome with counts of scored and skipped items
     """
     timestamp = now or datetime.now(timezone.utc)
     scored_at = _format_timestamp(timestamp)
+    chunk_size = _resolve_chunk_size(chunk_size)
     
-    # Fetch all results for this run that haven't been scored yet
-    results = session.execute(
-        select(RunResult).where(
-            RunResult.run_id == run_id,
-            RunResult.relevance_score.is_(None),
-        )
-    ).scalars().all()
+    # Count the results for this run that haven't been scored yet
+    pending_count, skipped_count = session.execute(
+        text(
+            """
+            SELECT COUNT(*), COALESCE(SUM(CASE WHEN is_duplicate THEN 1 ELSE 0 END), 0)
+            FROM run_items
+            WHERE run_id = :run_id AND relevance_score IS NULL
+            """
+        ),
+        {"run_id": run_id},
+    ).one()
     
-    if not results:
+    if not pending_count:
         logger.info("scoring.no_results run_id=%s", run_id)
         return ScoringOutcome(scored_count=0, skipped_count=0)
     
-    logger.info("scoring.start run_id=%s count=%d", run_id, len(results))
+    logger.info("scoring.start run_id=%s count=%d chunk_size=%d", run_id, pending_count, chunk_size)
+    started = time.perf_counter()
 
     selected_model = None
     resolved_version = score_version or DEFAULT_SCORE_VERSION
@@ -94,11 +120,16 @@ def score_run_results(
     if resolved_model_identifier:
         registry = get_registry()
         if registry.is_initialized:
-            selected_model = registry.get_model(resolved_model_identifier)
+            selected_model = (
+                registry.get_model_version(resolved_model_identifier, resolved_version)
+                if resolved_from_active
+                else registry.get_model(resolved_model_identifier)
+            )
             if selected_model is None:
                 logger.warning(
-                    "scoring.model_not_found model=%s fallback=%s",
+                    "scoring.model_not_found model=%s version=%s fallback=%s",
                     resolved_model_identifier,
+                    resolved_version,
                     DEFAULT_SCORE_VERSION,
                 )
                 if score_version is None:
@@ -106,68 +137,209 @@ def score_run_results(
             elif score_version is None and not resolved_from_active:
                 resolved_version = selected_model.version
 
-    predictions: list[float] | None = None
-    if selected_model is not None:
-        features = [
-            {
-                "title": result.title,
-                "snippet": result.snippet,
-                "domain": result.domain,
-            }
-            for result in results
-            if not result.is_duplicate
-        ]
-        try:
-            raw_predictions = selected_model.predict(features)
-            predictions = [validate_score(float(value)) for value in raw_predictions]
-        except Exception as exc:
-            logger.warning(
-                "scoring.model_failed model=%s error=%s fallback=%s",
-                resolved_model_identifier,
-                exc,
-                DEFAULT_SCORE_VERSION,
-            )
-            predictions = None
-            if score_version is None:
-                resolved_version = DEFAULT_SCORE_VERSION
-
+    use_matrix = selected_model is not None and supports_feature_matrix(selected_model)
     scored_count = 0
-    skipped_count = 0
-    prediction_index = 0
-    
-    for result in results:
-        if result.is_duplicate:
-            # Duplicates inherit score from canonical - don't score directly
-            skipped_count += 1
-            logger.debug(
-                "scoring.skip_duplicate id=%d canonical_id=%d",
-                result.id, result.canonical_id
-            )
-            continue
-        
-        if predictions is not None and prediction_index < len(predictions):
-            result.relevance_score = predictions[prediction_index]
-            prediction_index += 1
-        else:
-            result.relevance_score = DEFAULT_SCORE
-        result.scored_at = scored_at
-        result.score_version = resolved_version
-        scored_count += 1
-        
-        logger.debug(
-            "scoring.assigned id=%d score=%f version=%s",
-            result.id, result.relevance_score, resolved_version
+    last_id = 0
+    # Duplicates inherit score from canonical - never read or scored here
+    while True:
+        rows = session.execute(_UNSCORED_CHUNK, {"run_id": run_id, "after_id": last_id, "limit": chunk_size}).all()
+        if not rows:
+            break
+        last_id = int(rows[-1][0])
+
+        matrix = _chunk_matrix(session, rows) if use_matrix else None
+        scores, chunk_version, chunk_model_id = _predict_chunk(
+            selected_model,
+            rows,
+            matrix=matrix,
+            version=resolved_version,
+            model_identifier=resolved_model_identifier,
+            fallback_version=DEFAULT_SCORE_VERSION if score_version is None else score_version,
+            model_version=resolved_version if resolved_from_active else None,
         )
-    
-    # Commit all changes
-    session.commit()
+        session.execute(
+            _WRITE_SCORE,
+            [
+                {
+                    "id": row[0],
+                    "score": score,
+                    "scored_at": scored_at,
+                    "version": chunk_version,
+                    "model_id": chunk_model_id,
+                }
+                for row, score in zip(rows, scores)
+            ],
+        )
+        session.commit()
+        scored_count += len(rows)
+        logger.debug("scoring.chunk run_id=%s rows=%d through_id=%d", run_id, len(rows), last_id)
+
+    elapsed = time.perf_counter() - started
+    rows_per_second = scored_count / elapsed if elapsed > 0 else 0.0
     
     logger.info(
-        "scoring.complete run_id=%s scored=%d skipped=%d",
-        run_id, scored_count, skipped_count
+        "scoring.complete run_id=%s scored=%d skipped=%d rows_per_sec=%.0f",
+        run_id, scored_count, skipped_count, rows_per_second
     )
     
-    return ScoringOutcome(scored_count=scored_count, skipped_count=skipped_count)
+    return ScoringOutcome(
+        scored_count=scored_count,
+        skipped_count=int(skipped_count),
+        rows_per_second=rows_per_second,
+    )
+
+
+_UNSCORED_CHUNK = text(
+    f"""
+    SELECT ri.id, ri.title, ri.snippet, ri.domain, {FEATURE_COLUMNS}
+    FROM run_items ri
+    {FEATURE_JOIN}
+    WHERE ri.run_id = :run_id
+      AND ri.relevance_score IS NULL
+      AND (ri.is_duplicate = 0 OR ri.is_duplicate IS NULL)
+      AND ri.id > :after_id
+    ORDER BY ri.id
+    LIMIT :limit
+    """
+)
+_STALE_CHUNK = text(
+    f"""
+    SELECT ri.id, ri.title, ri.snippet, ri.domain, {FEATURE_COLUMNS}
+    FROM run_items ri
+    {FEATURE_JOIN}
+    WHERE (ri.is_duplicate = 0 OR ri.is_duplicate IS NULL)
+      AND (ri.score_version IS NOT :version OR ri.score_model_id IS NOT :model_id)
+      AND ri.id > :after_id
+    ORDER BY ri.id
+    LIMIT :limit
+    """
+)
+# Copy a canonical's score fields onto its duplicate rows ``d`` that differ
+_PROPAGATE_SET = (
+    "SET relevance_score = c.relevance_score, scored_at = c.scored_at, "
+    "score_version = c.score_version, score_model_id = c.score_model_id"
+)
+_PROPAGATE_CHANGED = """
+      AND c.relevance_score IS NOT NULL
+      AND (
+          d.relevance_score IS NOT c.relevance_score
+          OR d.scored_at IS NOT c.scored_at
+          OR d.score_version IS NOT c.score_version
+          OR d.score_model_id IS NOT c.score_model_id
+      )
+"""
+_PROPAGATE_ALL = text(
+    f"""
+    UPDATE run_items AS d
+    {_PROPAGATE_SET}
+    FROM run_items AS c
+    WHERE d.canonical_id = c.id
+      AND d.is_duplicate = 1
+      {_PROPAGATE_CHANGED}
+    """
+)
+# The run's duplicates, found through (run_id, is_duplicate)
+_PROPAGATE_RUN_DUPLICATES = text(
+    f"""
+    UPDATE run_items AS d
+    {_PROPAGATE_SET}
+    FROM run_items AS c
+    WHERE d.run_id = :run_id
+      AND d.is_duplicate = 1
+      AND c.id = d.canonical_id
+      {_PROPAGATE_CHANGED}
+    """
+)
+# Duplicates in any run of the canonicals this run scored, found through
+# canonical_id; the unary + keeps SQLite off the low-selectivity is_duplicate index
+_PROPAGATE_RUN_CANONICALS = text(
+    f"""
+    UPDATE run_items AS d
+    {_PROPAGATE_SET}
+    FROM run_items AS c
+    WHERE c.run_id = :run_id
+      AND d.canonical_id = c.id
+      AND +d.is_duplicate = 1
+      {_PROPAGATE_CHANGED}
+    """
+)
+_WRITE_FEATURES = text(
+    "INSERT OR REPLACE INTO run_item_features (item_id, version, features) VALUES (:id, :version, :features)"
+)
+_WRITE_SCORE = text(
+    "UPDATE run_items SET relevance_score = :score, scored_at = :scored_at, score_version = :version, "
+    "score_model_id = :model_id WHERE id = :id"
+)
+
+
+def _chunk_matrix(session: Session, rows: Sequence[Sequence[Any]]) -> FeatureMatrix:
+    """Stored feature vectors of a chunk; missing or stale ones are recomputed and stored."""
+    vectors, recomputed = vectors_from_rows([(row[4], row[5], row[1], row[2], row[3]) for row in rows])
+    if recomputed:
+        session.execute(
+            _WRITE_FEATURES,
+            [
+                {"id": rows[position][0], "version": FEATURIZER_VERSION, "features": encode_features(vectors[position])}
+                for position in recomputed
+            ],
+        )
+        logger.debug("scoring.features_recomputed rows=%d", len(recomputed))
+    return FeatureMatrix.from_vectors(vectors)
+
+
+def _predict_chunk(
+    model: Any,
+    rows: Sequence[Sequence[Any]],
+    *,
+    matrix: FeatureMatrix | None = None,
+    version: str,
+    model_identifier: str | None,
+    fallback_version: str,
+    model_version: str | None = None,
+) -> tuple[list[float], str, str | None]:
+    """Scores for one chunk with the version and model id to record; baseline scores if the model fails."""
+    if model is None:
+        return [DEFAULT_SCORE] * len(rows), version, None
+    try:
+        return (
+            _model_scores(model, rows, matrix, model_identifier=model_identifier, model_version=model_version),
+            version,
+            model_identifier,
+        )
+    except Exception as exc:
+        logger.warning(
+            "scoring.model_failed model=%s error=%s fallback=%s",
+            model_identifier,
+            exc,
+            DEFAULT_SCORE_VERSION,
+        )
+        return [DEFAULT_SCORE] * len(rows), fallback_version, None
+
+
+def _model_scores(
+    model: Any,
+    rows: Sequence[Sequence[Any]],
+    matrix: FeatureMatrix | None,
+    *,
+    model_identifier: str | None = None,
+    model_version: str | None = None,
+) -> list[float]:
+    # Served by the inference workers when they are enabled and hold the model
+    if matrix is not None:
+        raw_predictions = run_predict(model_identifier, model, matrix, use_features=True, version=model_version)
+    else:
+        features = [{"title": row[1], "snippet": row[2], "domain": row[3]} for row in rows]
+        raw_predictions = run_predict(model_identifier, model, features, use_features=False, version=model_version)
+    scores = [validate_score(float(value)) for value in raw_predictions[: len(rows)]]
+    # A short prediction list leaves the remaining rows at the default score
+    scores.extend([DEFAULT_SCORE] * (len(rows) - len(scores)))
+    return scores
+
+
+def _resolve_chunk_size(explicit: int | None) -> int:
+    if explicit is not None:
+        return max(1, min(MAX_CHUNK_SIZE, int(explicit)))
+    return int_setting("scoringChunkSize", DEFAULT_CHUNK_SIZE, minimum=1, maximum=MAX_CHUNK_SIZE)
 
 
 def validate_score(score: float) -> float:
@@ -182,6 +354,80 @@ def validate_score(score: float) -> float:
     return max(MIN_SCORE, min(MAX_SCORE, score))
 
 
+def propagate_canonical_scores(session: Session, run_id: str | None) -> int:
+    """Copy canonical scores onto their duplicates with set-based UPDATEs.
+
+    Covers the run's duplicates (whose canonical may be in an earlier run) and
+    duplicates in any run whose canonical belongs to this run, so a re-scored
+    canonical refreshes every copy. Each of the two is one indexed UPDATE, so
+    the cost follows the run rather than every historical duplicate. Rows
+    already in sync are left untouched.
+
+    Args:
+        session: Database session
+        run_id: The run whose duplicates and canonicals are propagated; every run when None
+
+    Returns:
+        Number of duplicate rows updated
+    """
+    if run_id is None:
+        updated = int(session.execute(_PROPAGATE_ALL).rowcount or 0)
+    else:
+        updated = sum(
+            int(session.execute(statement, {"run_id": run_id}).rowcount or 0)
+            for statement in (_PROPAGATE_RUN_DUPLICATES, _PROPAGATE_RUN_CANONICALS)
+        )
+    session.commit()
+    logger.info("scoring.propagated run_id=%s duplicates=%d", run_id or "*", updated)
+    return updated
+
+
+def rescore_stale_chunk(
+    session: Session,
+    model: Any,
+    *,
+    score_version: str,
+    scored_at: str,
+    after_id: int,
+    limit: int,
+    model_identifier: str,
+) -> tuple[int, int]:
+    """Re-score the next ``limit`` canonical rows (id > ``after_id``) not scored by this model and version.
+
+    Rows are stale when ``score_model_id`` or ``score_version`` differs:
+    versions repeat across models (every configured model starts at 1.0.0).
+
+    Unlike run scoring, a failing model raises instead of writing baseline
+    scores, so a historical re-score never overwrites good scores with zeros.
+
+    Returns:
+        (rows re-scored, last id read); (0, after_id) once nothing is left
+    """
+    rows = session.execute(
+        _STALE_CHUNK,
+        {"version": score_version, "model_id": model_identifier, "after_id": after_id, "limit": limit},
+    ).all()
+    if not rows:
+        return 0, after_id
+    matrix = _chunk_matrix(session, rows) if supports_feature_matrix(model) else None
+    scores = _model_scores(model, rows, matrix, model_identifier=model_identifier, model_version=score_version)
+    session.execute(
+        _WRITE_SCORE,
+        [
+            {
+                "id": row[0],
+                "score": score,
+                "scored_at": scored_at,
+                "version": score_version,
+                "model_id": model_identifier,
+            }
+            for row, score in zip(rows, scores)
+        ],
+    )
+    session.commit()
+    return len(rows), int(rows[-1][0])
+
+
 def get_canonical_score(session: Session, canonical_id: int) -> float | None:
     """Get the score from a canonical record for duplicate inheritance.
     
@@ -206,12 +452,5 @@ def _format_timestamp(value: datetime) -> str:
 
 
 def _load_active_model_reference() -> ActiveModelReference | None:
-    data_dir = Path(os.getenv("DATA_DIR", "data"))
-    db_path = data_dir / "db" / "evaluations.db"
-    if not db_path.exists():
-        return None
-    store = EvaluationStore(db_path)
-    active = store.get_active_model()
-    if active is None:
-        return None
-    return ActiveModelReference(model_id=active.model_id, model_version=active.model_version)
+    # Cached per process; refreshed when evaluations.db changes or a model is activated
+    return get_active_model_reference(evaluations_db_path())
@@ -3,6 +3,7 @@
 from app.registry.model_interface import ModelInterface, ModelValidationError, validate_model_interface
 from app.registry.model_registry import ModelRegistry, initialize_registry, get_registry
 from app.registry.config_loader import load_registry_config, ModelRegistryEntry, RegistryConfig
+from app.registry.registry_watcher import RegistryWatcher
 
 __all__ = [
     "ModelInterface",
@@ -14,4 +15,5 @@ __all__ = [
     "load_registry_config",
     "ModelRegistryEntry",
     "RegistryConfig",
+    "RegistryWatcher",
 ]
\ No newline at end of file
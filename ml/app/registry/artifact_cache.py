@@ -0,0 +1,150 @@
+"""LRU of trained model versions loaded from artifacts, bounded by a memory budget.
+
+Each entry is charged the byte size of its arrays as recorded in the artifact
+header. When the total exceeds the budget the least recently used versions
+are dropped (the newest entry always stays, even if it alone is larger).
+Arrays are memory-mapped, so an evicted version costs only a header read and
+an ``mmap`` to bring back.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+import logging
+from pathlib import Path
+import threading
+from typing import Any
+
+import numpy as np
+
+from app.services.model_artifacts import (
+    HEADER_NAME,
+    ArtifactError,
+    ArtifactHeader,
+    artifact_path,
+    legacy_artifact_path,
+    load_artifact,
+    read_header,
+)
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUDGET_MB = 1_024
+MAX_BUDGET_MB = 65_536
+
+
+@dataclass(frozen=True)
+class CachedVersion:
+    model_id: str
+    model_version: str
+    model: Any
+    header: ArtifactHeader
+    nbytes: int
+
+
+class ArtifactCache:
+    def __init__(self, artifact_dir: Path | str, *, budget_bytes: int) -> None:
+        self._artifact_dir = Path(artifact_dir)
+        self._budget_bytes = max(0, int(budget_bytes))
+        self._entries: OrderedDict[tuple[str, str], CachedVersion] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def artifact_dir(self) -> Path:
+        return self._artifact_dir
+
+    def has_artifact(self, model_id: str, model_version: str) -> bool:
+        return (artifact_path(self._artifact_dir, model_id, model_version) / HEADER_NAME).is_file()
+
+    def has_legacy_artifact(self, model_id: str, model_version: str) -> bool:
+        """True when only a pre-artifact pickle of this version exists; it is never loaded."""
+        return legacy_artifact_path(self._artifact_dir, model_id, model_version).is_file()
+
+    def versions(self, model_id: str) -> list[str]:
+        """Versions of ``model_id`` with an artifact on disk, oldest training first."""
+        if not self._artifact_dir.is_dir():
+            return []
+        headers = []
+        for path in self._artifact_dir.glob(f"{model_id}_*/{HEADER_NAME}"):
+            try:
+                header = read_header(path.parent)
+            except ValueError:
+                continue
+            if header.model_id == model_id:
+                headers.append(header)
+        return [header.model_version for header in sorted(headers, key=lambda header: header.trained_at)]
+
+    def get(self, model_id: str, model_version: str) -> Any | None:
+        """The model for (model_id, version), loading its artifact on a miss; None when there is none."""
+        key = (model_id, model_version)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return cached.model
+            if not self.has_artifact(model_id, model_version):
+                return None
+            # Loading under the lock: mmap makes it a header read, and callers never load twice
+            header, model = load_artifact(artifact_path(self._artifact_dir, model_id, model_version))
+            if header.model_id != model_id or header.model_version != model_version:
+                raise ArtifactError(
+                    f"Artifact for {model_id} {model_version} has header {header.model_id} {header.model_version}"
+                )
+            self._misses += 1
+            self._entries[key] = CachedVersion(
+                model_id=model_id,
+                model_version=model_version,
+                model=model,
+                header=header,
+                nbytes=_header_nbytes(header),
+            )
+            self._evict()
+            return model
+
+    def discard(self, model_id: str, model_version: str | None = None) -> None:
+        """Drop one version, or every version of ``model_id``."""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == model_id and model_version in (None, key[1])]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "budgetBytes": self._budget_bytes,
+                "residentBytes": sum(entry.nbytes for entry in self._entries.values()),
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "resident": [
+                    {"modelId": entry.model_id, "modelVersion": entry.model_version, "bytes": entry.nbytes}
+                    for entry in self._entries.values()
+                ],
+            }
+
+    def _evict(self) -> None:
+        resident = sum(entry.nbytes for entry in self._entries.values())
+        while resident > self._budget_bytes and len(self._entries) > 1:
+            key, evicted = self._entries.popitem(last=False)
+            resident -= evicted.nbytes
+            self._evictions += 1
+            logger.info("artifact_cache.evicted model=%s version=%s bytes=%d", key[0], key[1], evicted.nbytes)
+
+
+def _header_nbytes(header: ArtifactHeader) -> int:
+    total = 0
+    for entry in header.arrays.values():
+        count = 1
+        for dimension in entry["shape"]:
+            count *= int(dimension)
+        total += count * np.dtype(entry["dtype"]).itemsize
+    return total
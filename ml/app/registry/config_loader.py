@@ -24,6 +24,7 @@ class ModelRegistryEntry:
         name: Human-readable name
         description: Optional description
         enabled: Whether this model is enabled
+        preload: Whether to load the model at startup instead of on first use
     """
     identifier: str
     module_path: str
@@ -32,6 +33,7 @@ class ModelRegistryEntry:
     name: str
     description: str
     enabled: bool
+    preload: bool = False
 
 
 @dataclass(frozen=True)
@@ -184,6 +186,10 @@ def _parse_model_entry(data: dict[str, Any]) -> ModelRegistryEntry:
     if not isinstance(enabled, bool):
         raise RegistryConfigError("enabled must be a boolean")
     
+    preload = data.get("preload", False)
+    if not isinstance(preload, bool):
+        raise RegistryConfigError("preload must be a boolean")
+    
     return ModelRegistryEntry(
         identifier=identifier,
         module_path=module_path,
@@ -192,4 +198,5 @@ def _parse_model_entry(data: dict[str, Any]) -> ModelRegistryEntry:
         name=name,
         description=description,
         enabled=enabled,
+        preload=preload,
     )
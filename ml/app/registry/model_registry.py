@@ -1,24 +1,38 @@
 """Model registry implementation for loading and managing pluggable models.
 
 Handles model discovery, instantiation, and error isolation during loading.
+Models are imported and constructed on first use; entries marked
+``preload: true`` are loaded in parallel when the configuration is read.
+Trained versions are resolved from retrain artifacts by (model_id, version)
+and kept in an LRU bounded by ``modelCacheMb`` from ml-config.yaml.
 """
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 import importlib
+import importlib.util
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
+import threading
+import time
 from typing import TYPE_CHECKING
 
+from app.registry.artifact_cache import DEFAULT_BUDGET_MB, MAX_BUDGET_MB, ArtifactCache
 from app.registry.config_loader import load_registry_config, RegistryConfig, ModelRegistryEntry
 from app.registry.model_interface import ModelInterface, validate_model_interface, ModelValidationError
+from app.services.model_artifacts import DEFAULT_ARTIFACT_DIR
+from app.services.ml_config import int_setting
 
 if TYPE_CHECKING:
     pass
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on threads importing ``preload: true`` models at startup
+MAX_PRELOAD_THREADS = 8
+
 
 @dataclass(frozen=True)
 class LoadedModel:
@@ -28,10 +42,12 @@ class LoadedModel:
         identifier: Model identifier from config
         instance: Model instance
         entry: Original registry entry
+        load_time_ms: Time spent importing and constructing the model
     """
     identifier: str
     instance: ModelInterface
     entry: ModelRegistryEntry
+    load_time_ms: float = 0.0
 
 
 @dataclass(frozen=True)
@@ -48,6 +64,24 @@ class ModelLoadError:
     error_message: str
 
 
+@dataclass(frozen=True)
+class RegistryReload:
+    """Outcome of ``reload_from_config``.
+    
+    Attributes:
+        added: Identifiers enabled by the new configuration
+        changed: Identifiers whose entry changed (rebuilt only if the module or class did)
+        removed: Identifiers no longer enabled
+        kept: Identifiers whose entry is unchanged
+        config_error: Why the configuration could not be read; nothing was swapped
+    """
+    added: tuple[str, ...] = ()
+    changed: tuple[str, ...] = ()
+    removed: tuple[str, ...] = ()
+    kept: tuple[str, ...] = ()
+    config_error: str | None = None
+
+
 class ModelRegistry:
     """Registry for managing pluggable ML models.
     
@@ -64,14 +98,26 @@ class ModelRegistry:
         
         # Get specific model
         model = registry.get_model("baseline")
+        
+        # Get a retrained version (None when its artifact is missing)
+        model = registry.get_model_version("baseline", "1.0.0-20260214080000")
     """
     
-    def __init__(self) -> None:
-        """Initialize an empty registry."""
-        self._models: dict[str, LoadedModel] = {}
-        self._errors: list[ModelLoadError] = []
-        self._config: RegistryConfig | None = None
+    def __init__(self, *, artifact_dir: Path | str | None = None) -> None:
+        """Initialize an empty registry.
+        
+        Args:
+            artifact_dir: Directory of trained artifacts. If None, uses the retrain default.
+        """
+        budget_mb = int_setting("modelCacheMb", DEFAULT_BUDGET_MB, minimum=0, maximum=MAX_BUDGET_MB)
+        self._artifacts = ArtifactCache(artifact_dir or DEFAULT_ARTIFACT_DIR, budget_bytes=budget_mb * 1024 * 1024)
+        # Replaced as a whole on (re)load, so readers always see one consistent configuration
+        self._state = _RegistryState(config=None)
+        self._config_path: Path | str | None = None
         self._initialized = False
+        self._state_lock = threading.Lock()
+        # Legacy (pickled) versions already warned about, so repeated lookups log once
+        self._legacy_warned: set[tuple[str, str]] = set()
     
     @property
     def is_initialized(self) -> bool:
@@ -81,11 +127,21 @@ class ModelRegistry:
     @property
     def load_errors(self) -> list[ModelLoadError]:
         """Get list of models that failed to load."""
-        return self._errors.copy()
+        state = self._state
+        with self._state_lock:
+            return state.errors.copy()
+    
+    @property
+    def artifact_dir(self) -> Path:
+        """Directory searched for trained artifacts."""
+        return self._artifacts.artifact_dir
     
     def load_from_config(self, config_path: Path | str | None = None) -> None:
         """Load models from registry configuration.
         
+        Enabled entries are discovered (their module must exist) but only
+        imported and constructed on first use, except ``preload: true`` ones.
+        
         Args:
             config_path: Path to config file. If None, uses default.
             
@@ -96,48 +152,176 @@ class ModelRegistry:
         logger.info("registry.loading config_path=%s", config_path or "default")
         
         try:
-            self._config = load_registry_config(config_path)
+            config = load_registry_config(config_path)
         except Exception as e:
             logger.error("registry.config_failed error=%s", e)
-            self._config = RegistryConfig(models=[], default_model=None)
+            config = RegistryConfig(models=[], default_model=None)
+        
+        self._config_path = config_path
+        state, _ = self._build_state(config, previous=None)
+        self._artifacts.clear()
+        with self._state_lock:
+            self._state = state
+        self._initialized = True
         
-        # Clear previous state
-        self._models = {}
-        self._errors = []
+        logger.info(
+            "registry.complete discovered=%d preloaded=%d errors=%d",
+            len(state.entries), len(state.models), len(state.errors)
+        )
+    
+    def reload_from_config(self, config_path: Path | str | None = None) -> RegistryReload:
+        """Re-read the configuration and swap in the result without disturbing unchanged models.
         
-        # Load each enabled model
-        loaded_count = 0
-        for entry in self._config.models:
+        The new state is built off to the side: models whose module and class
+        are unchanged keep their loaded instance, new or changed entries are
+        discovered (and preloaded) before the swap, and ``load_errors`` is
+        rebuilt for the new configuration. An unreadable config leaves the
+        current registry in place.
+        
+        Args:
+            config_path: Path to config file. If None, the path of the last load.
+            
+        Returns:
+            Summary of the added, changed, removed and kept identifiers
+        """
+        path = config_path if config_path is not None else self._config_path
+        try:
+            config = load_registry_config(path)
+        except Exception as e:
+            logger.error("registry.reload_failed error=%s", e)
+            return RegistryReload(config_error=str(e))
+        
+        state, reload = self._build_state(config, previous=self._state)
+        with self._state_lock:
+            self._state = state
+        self._config_path = path
+        self._initialized = True
+        for identifier in reload.removed:
+            self._artifacts.discard(identifier)
+        
+        logger.info(
+            "registry.reloaded added=%s changed=%s removed=%s kept=%d errors=%d",
+            list(reload.added), list(reload.changed), list(reload.removed), len(reload.kept), len(state.errors)
+        )
+        return reload
+    
+    def forget_artifact(self, identifier: str, version: str) -> None:
+        """Drop a cached trained version so its artifact is re-read on next use."""
+        self._artifacts.discard(identifier, version)
+    
+    def _build_state(
+        self, config: RegistryConfig, *, previous: _RegistryState | None
+    ) -> tuple[_RegistryState, RegistryReload]:
+        state = _RegistryState(config=config)
+        added: list[str] = []
+        changed: list[str] = []
+        kept: list[str] = []
+        
+        prior_entries = _enabled_entries(previous.config) if previous is not None else {}
+        
+        # Discover each enabled model; importing it is deferred to first use
+        for entry in config.models:
             if not entry.enabled:
                 logger.debug("registry.skip_disabled identifier=%s", entry.identifier)
                 continue
             
-            try:
-                loaded = self._load_model(entry)
-                self._models[entry.identifier] = loaded
-                loaded_count += 1
-                logger.info(
-                    "registry.loaded identifier=%s name=%s version=%s",
-                    entry.identifier, entry.name, entry.version
-                )
-            except Exception as e:
-                error_type = type(e).__name__
-                error_msg = str(e)
-                self._errors.append(ModelLoadError(
+            prior = prior_entries.get(entry.identifier)
+            if previous is None:
+                pass
+            elif prior is None:
+                added.append(entry.identifier)
+            elif prior == entry:
+                kept.append(entry.identifier)
+            else:
+                changed.append(entry.identifier)
+            
+            loaded = previous.models.get(entry.identifier) if previous is not None else None
+            if loaded is not None and _same_class(loaded.entry, entry):
+                # Same implementation: keep the instance, refresh its metadata
+                state.models[entry.identifier] = LoadedModel(
                     identifier=entry.identifier,
-                    error_type=error_type,
-                    error_message=error_msg,
-                ))
-                logger.error(
-                    "registry.load_failed identifier=%s error_type=%s error=%s",
-                    entry.identifier, error_type, error_msg
+                    instance=loaded.instance,
+                    entry=entry,
+                    load_time_ms=loaded.load_time_ms,
                 )
+                state.entries[entry.identifier] = entry
+                state.load_locks[entry.identifier] = threading.Lock()
+                continue
+            
+            try:
+                _find_module(entry)
+            except Exception as e:
+                self._record_error(state, entry, e)
+                continue
+            state.entries[entry.identifier] = entry
+            state.load_locks[entry.identifier] = threading.Lock()
         
-        self._initialized = True
+        preload = [
+            identifier
+            for identifier, entry in state.entries.items()
+            if entry.preload and identifier not in state.models
+        ]
+        if preload:
+            with ThreadPoolExecutor(
+                max_workers=min(MAX_PRELOAD_THREADS, len(preload)), thread_name_prefix="registry-preload"
+            ) as executor:
+                list(executor.map(lambda identifier: self._ensure_loaded(identifier, state), preload))
         
+        configured = _enabled_entries(config)
+        removed = [identifier for identifier in prior_entries if identifier not in configured]
+        return state, RegistryReload(
+            added=tuple(added), changed=tuple(changed), removed=tuple(removed), kept=tuple(kept)
+        )
+    
+    def _ensure_loaded(self, identifier: str, state: _RegistryState | None = None) -> LoadedModel | None:
+        """Import and construct ``identifier`` once; None if unknown or its load failed."""
+        state = state or self._state
+        loaded = state.models.get(identifier)
+        if loaded is not None:
+            return loaded
+        lock = state.load_locks.get(identifier)
+        if lock is None:
+            return None
+        with lock:
+            loaded = state.models.get(identifier)
+            if loaded is not None:
+                return loaded
+            entry = state.entries.get(identifier)
+            if entry is None:
+                return None
+            started = time.perf_counter()
+            try:
+                loaded = self._load_model(entry)
+            except Exception as e:
+                with self._state_lock:
+                    state.entries.pop(identifier, None)
+                self._record_error(state, entry, e)
+                return None
+            loaded = LoadedModel(
+                identifier=loaded.identifier,
+                instance=loaded.instance,
+                entry=loaded.entry,
+                load_time_ms=(time.perf_counter() - started) * 1000,
+            )
+            state.models[identifier] = loaded
         logger.info(
-            "registry.complete loaded=%d errors=%d",
-            loaded_count, len(self._errors)
+            "registry.loaded identifier=%s name=%s version=%s load_ms=%.1f",
+            entry.identifier, entry.name, entry.version, loaded.load_time_ms
+        )
+        return loaded
+    
+    def _record_error(self, state: _RegistryState, entry: ModelRegistryEntry, error: Exception) -> None:
+        error_type = type(error).__name__
+        error_msg = str(error)
+        with self._state_lock:
+            state.errors.append(ModelLoadError(
+                identifier=entry.identifier,
+                error_type=error_type,
+                error_message=error_msg,
+            ))
+        logger.error(
+            "registry.load_failed identifier=%s error_type=%s error=%s",
+            entry.identifier, error_type, error_msg
         )
     
     def _load_model(self, entry: ModelRegistryEntry) -> LoadedModel:
@@ -193,7 +377,7 @@ class ModelRegistry:
         )
     
     def get_model(self, identifier: str) -> ModelInterface | None:
-        """Get a model by its identifier.
+        """Get a model by its identifier, loading it on first use.
         
         Args:
             identifier: Model identifier
@@ -201,35 +385,104 @@ class ModelRegistry:
         Returns:
             Model instance or None if not found
         """
-        loaded = self._models.get(identifier)
+        loaded = self._ensure_loaded(identifier)
         return loaded.instance if loaded else None
     
+    def get_model_version(self, identifier: str, version: str | None) -> ModelInterface | None:
+        """Get a specific version of a model.
+        
+        The trained artifact ``<identifier>_<version>`` is loaded on first
+        use and kept in the LRU; without one, only the configured version (or
+        no version) resolves to the configured model, as for ``get_model``.
+        Callers record the version they asked for, so a missing or broken
+        artifact is never served as the configured model.
+        
+        A version retrained before the artifact format has only a pickle,
+        ``<identifier>_<version>.pkl``. It was always served by the configured
+        model, so it still is, with a one-time warning; the pickle is never
+        loaded.
+        
+        Args:
+            identifier: Model identifier
+            version: Model version, e.g. the active version
+            
+        Returns:
+            Model instance, or None if the identifier is not registered or
+            the version has no loadable artifact
+        """
+        entry = self._state.entries.get(identifier)
+        if entry is None:
+            return None
+        if not version:
+            return self.get_model(identifier)
+        try:
+            model = self._artifacts.get(identifier, version)
+        except Exception as e:
+            logger.warning(
+                "registry.artifact_failed identifier=%s version=%s error=%s", identifier, version, e
+            )
+            return None
+        if model is not None:
+            return model
+        if version == entry.version:
+            return self.get_model(identifier)
+        if self._artifacts.has_legacy_artifact(identifier, version):
+            if (identifier, version) not in self._legacy_warned:
+                self._legacy_warned.add((identifier, version))
+                logger.warning(
+                    "registry.legacy_artifact identifier=%s version=%s serving=configured",
+                    identifier,
+                    version,
+                )
+            return self.get_model(identifier)
+        logger.warning(
+            "registry.version_missing identifier=%s version=%s configured=%s", identifier, version, entry.version
+        )
+        return None
+    
+    def get_trained_versions(self, identifier: str) -> list[str]:
+        """Versions of a model with a trained artifact on disk, oldest first."""
+        return self._artifacts.versions(identifier)
+    
+    def artifact_cache_stats(self) -> dict:
+        """Budget, residency and hit/miss/eviction counts of the trained-version LRU."""
+        return self._artifacts.stats()
+    
     def has_model(self, identifier: str) -> bool:
-        """Check if a model is available.
+        """Check if a model is available, loading it on first use.
         
         Args:
             identifier: Model identifier
             
         Returns:
-            True if model exists and is loaded
+            True if model exists and loads
         """
-        return identifier in self._models
+        return self._ensure_loaded(identifier) is not None
     
     def get_available_models(self) -> list[dict]:
         """Get list of available models with metadata.
         
+        Models that are not loaded yet are listed with ``loaded`` False and
+        no load time; models whose load failed are reported in ``load_errors``.
+        
         Returns:
             List of model info dictionaries
         """
-        return [
-            {
-                "identifier": loaded.identifier,
-                "name": loaded.entry.name,
-                "version": loaded.entry.version,
-                "description": loaded.entry.description,
-            }
-            for loaded in self._models.values()
-        ]
+        state = self._state
+        with self._state_lock:
+            entries = list(state.entries.values())
+        models = []
+        for entry in entries:
+            loaded = state.models.get(entry.identifier)
+            models.append({
+                "identifier": entry.identifier,
+                "name": entry.name,
+                "version": entry.version,
+                "description": entry.description,
+                "loaded": loaded is not None,
+                "loadTimeMs": round(loaded.load_time_ms, 1) if loaded is not None else None,
+            })
+        return models
     
     def get_default_model(self) -> ModelInterface | None:
         """Get the default model as configured.
@@ -237,9 +490,10 @@ class ModelRegistry:
         Returns:
             Default model instance or None if not configured/available
         """
-        if self._config is None or self._config.default_model is None:
+        config = self._state.config
+        if config is None or config.default_model is None:
             return None
-        return self.get_model(self._config.default_model)
+        return self.get_model(config.default_model)
     
     def get_default_model_identifier(self) -> str | None:
         """Get the default model identifier.
@@ -247,9 +501,40 @@ class ModelRegistry:
         Returns:
             Default model identifier or None
         """
-        if self._config is None:
+        config = self._state.config
+        if config is None:
             return None
-        return self._config.default_model
+        return config.default_model
+
+
+@dataclass
+class _RegistryState:
+    """Everything one configuration load produced; swapped in as a unit."""
+    config: RegistryConfig | None
+    entries: dict[str, ModelRegistryEntry] = field(default_factory=dict)
+    models: dict[str, LoadedModel] = field(default_factory=dict)
+    errors: list[ModelLoadError] = field(default_factory=list)
+    load_locks: dict[str, threading.Lock] = field(default_factory=dict)
+
+
+def _same_class(left: ModelRegistryEntry, right: ModelRegistryEntry) -> bool:
+    return (left.module_path, left.class_name) == (right.module_path, right.class_name)
+
+
+def _enabled_entries(config: RegistryConfig | None) -> dict[str, ModelRegistryEntry]:
+    if config is None:
+        return {}
+    return {entry.identifier: entry for entry in config.models if entry.enabled}
+
+
+def _find_module(entry: ModelRegistryEntry) -> None:
+    """Check that the entry's module exists without importing it."""
+    try:
+        spec = importlib.util.find_spec(entry.module_path)
+    except (ImportError, ValueError) as e:
+        raise ImportError(f"Failed to import module '{entry.module_path}': {e}") from e
+    if spec is None:
+        raise ImportError(f"Failed to import module '{entry.module_path}': module not found")
 
 
 # Singleton registry instance
@@ -0,0 +1,122 @@
+"""Hot reload of models.yaml and trained artifacts by mtime polling.
+
+A changed config triggers ``ModelRegistry.reload_from_config``, which builds
+the new registry state off to the side and swaps it in, keeping models whose
+implementation did not change. A replaced or removed artifact drops its
+cached version so the next use re-reads it; new artifacts need nothing, since
+versions are resolved from disk on demand.
+"""
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+import threading
+
+from app.registry.model_registry import ModelRegistry
+from app.services.model_artifacts import HEADER_NAME, ArtifactError, read_header
+from app.services.ml_config import int_setting
+
+
+DEFAULT_POLL_SECONDS = 5
+MAX_POLL_SECONDS = 3_600
+
+# (mtime_ns, size) of a file, or None when it does not exist
+_Signature = tuple[int, int] | None
+
+
+class RegistryWatcher:
+    def __init__(
+        self,
+        registry: ModelRegistry,
+        config_path: Path | str,
+        *,
+        poll_interval_seconds: float | None = None,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        self._registry = registry
+        self._config_path = Path(config_path)
+        self._poll_interval_seconds = (
+            poll_interval_seconds
+            if poll_interval_seconds is not None
+            else int_setting("registryPollSeconds", DEFAULT_POLL_SECONDS, minimum=1, maximum=MAX_POLL_SECONDS)
+        )
+        self._logger = logger or logging.getLogger(__name__)
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        # Baseline is the state the registry was just loaded from
+        self._config_signature = _signature(self._config_path)
+        self._artifacts = self._scan_artifacts({})
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run_loop, name="registry-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+
+    def check_once(self) -> bool:
+        """Apply config and artifact changes since the last check; True if anything changed."""
+        changed = False
+        config_signature = _signature(self._config_path)
+        if config_signature != self._config_signature:
+            reload = self._registry.reload_from_config(self._config_path)
+            if reload.config_error is None:
+                self._config_signature = config_signature
+                changed = True
+
+        artifacts = self._scan_artifacts(self._artifacts)
+        for name, (signature, identity) in self._artifacts.items():
+            current = artifacts.get(name)
+            if current is None or current[0] != signature:
+                self._registry.forget_artifact(*identity)
+                self._logger.info("registry_watcher.artifact_changed artifact=%s removed=%s", name, current is None)
+                changed = True
+        added = artifacts.keys() - self._artifacts.keys()
+        if added:
+            self._logger.info("registry_watcher.artifacts_added artifacts=%s", sorted(added))
+            changed = True
+        self._artifacts = artifacts
+        return changed
+
+    def _scan_artifacts(
+        self, previous: dict[str, tuple[_Signature, tuple[str, str]]]
+    ) -> dict[str, tuple[_Signature, tuple[str, str]]]:
+        artifact_dir = self._registry.artifact_dir
+        if not artifact_dir.is_dir():
+            return {}
+        artifacts: dict[str, tuple[_Signature, tuple[str, str]]] = {}
+        for header_path in artifact_dir.glob(f"*/{HEADER_NAME}"):
+            name = header_path.parent.name
+            signature = _signature(header_path)
+            known = previous.get(name)
+            if known is not None and known[0] == signature:
+                artifacts[name] = known
+                continue
+            # Headers are only parsed for new or rewritten artifacts
+            try:
+                header = read_header(header_path.parent)
+            except ArtifactError:
+                continue
+            artifacts[name] = (signature, (header.model_id, header.model_version))
+        return artifacts
+
+    def _run_loop(self) -> None:
+        while not self._stop_event.wait(self._poll_interval_seconds):
+            try:
+                self.check_once()
+            except Exception as exc:
+                self._logger.warning("registry_watcher.check_failed error=%s", exc)
+
+
+def _signature(path: Path) -> _Signature:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
@@ -1,3 +1,4 @@
+from app.runtime.rescoring_worker import RescoringWorker
 from app.runtime.run_events_worker import RunEventsWorker
 
-__all__ = ["RunEventsWorker"]
+__all__ = ["RescoringWorker", "RunEventsWorker"]
@@ -0,0 +1,271 @@
+"""Background re-scoring of historical rows after the active model changes.
+
+A job re-scores the active run DB in place: canonical rows whose
+``score_model_id`` or ``score_version`` differs from the active model (versions
+repeat across models) are re-scored in id-ordered chunks, each committed on
+its own, and duplicates inherit in one statement at the end. Tables the API
+writes to the active DB (manual feedback, runs, run summaries) are never
+copied, so nothing the API writes during a job is lost.
+
+Every chunk holds ``ACTIVE_DB_LOCK`` and resolves the active DB afresh. A run
+holds that lock from copying the active DB until its pointer swap, so a chunk
+lands either before the copy (and is carried into the run's DB) or after the
+swap (and goes to the new DB). Run DBs are copies, so ids are stable and the
+last id, checkpointed in evaluations.db after every chunk, stays valid across
+swaps and lets an interrupted job resume where it stopped.
+
+Chunks run at a bounded duty cycle and wait while a run holds the lock, so
+re-scoring never starves ingestion.
+"""
+
+from __future__ import annotations
+
+from contextlib import closing
+import logging
+import os
+from pathlib import Path
+import sqlite3
+import threading
+import time
+from typing import Any
+from uuid import uuid4
+
+from app.db.session import open_session, resolve_active_db_path
+from app.pipelines.scoring import propagate_canonical_scores, rescore_stale_chunk
+from app.registry import ModelRegistry, get_registry
+from app.runtime.run_events_worker import ACTIVE_DB_LOCK
+from app.services.evaluation_store import EvaluationStore, RescoreJobRow
+from app.services.ml_config import int_setting
+from app.services.run_item_export import export_root_for, export_run
+
+
+DEFAULT_CHUNK_SIZE = 2_000
+MAX_CHUNK_SIZE = 100_000
+# Share of wall time spent scoring; the rest is spent sleeping between chunks
+DEFAULT_DUTY_PERCENT = 50
+_BUSY_WAIT_SECONDS = 1.0
+
+_STALE_COUNT_SQL = """
+    SELECT COUNT(*)
+    FROM run_items
+    WHERE (is_duplicate = 0 OR is_duplicate IS NULL) AND (score_version IS NOT ? OR score_model_id IS NOT ?)
+"""
+
+
+class RescoringWorker:
+    def __init__(
+        self,
+        *,
+        store: EvaluationStore,
+        registry: ModelRegistry | None = None,
+        data_dir: Path | str | None = None,
+        chunk_size: int | None = None,
+        duty_percent: int | None = None,
+        poll_interval_seconds: float = 30.0,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        self._store = store
+        self._registry = registry or get_registry()
+        self._data_dir = Path(data_dir or os.getenv("DATA_DIR", "data"))
+        self._chunk_size = (
+            max(1, min(MAX_CHUNK_SIZE, int(chunk_size)))
+            if chunk_size is not None
+            else int_setting("rescoreChunkSize", DEFAULT_CHUNK_SIZE, minimum=1, maximum=MAX_CHUNK_SIZE)
+        )
+        self._duty_percent = (
+            max(1, min(100, int(duty_percent)))
+            if duty_percent is not None
+            else int_setting("rescoreDutyPercent", DEFAULT_DUTY_PERCENT, minimum=1, maximum=100)
+        )
+        self._poll_interval_seconds = poll_interval_seconds
+        self._logger = logger or logging.getLogger(__name__)
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._run_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run_loop, name="rescoring-worker", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self._wake_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+
+    def wake(self) -> None:
+        """Check for a changed active model now instead of at the next poll."""
+        self._wake_event.set()
+
+    def status_payload(self) -> dict[str, Any]:
+        latest = self._store.get_latest_rescore_job()
+        return {
+            "latest": _job_to_payload(latest),
+            "running": latest is not None and latest.status == "running",
+        }
+
+    def run_pending(self) -> RescoreJobRow | None:
+        """Start or resume the job for the active model; returns it, or None when nothing is stale."""
+        with self._run_lock:
+            active = self._store.get_active_model()
+            if active is None:
+                return None
+            job = self._store.get_running_rescore_job()
+            if job is not None and (job.model_id, job.model_version) != (active.model_id, active.model_version):
+                self._store.complete_rescore_job(job_id=job.job_id, status="superseded")
+                self._logger.info("rescore.superseded job_id=%s version=%s", job.job_id, job.model_version)
+                job = None
+            if job is None:
+                job = self._create_job(active.model_id, active.model_version)
+                if job is None:
+                    return None
+
+            model = self._registry.get_model_version(job.model_id, job.model_version)
+            if model is None:
+                self._fail(
+                    job, f"Active model '{job.model_id}' version '{job.model_version}' is not registered or loadable"
+                )
+                return self._store.get_rescore_job(job.job_id)
+            try:
+                self._run_job(job, model)
+            except Exception as exc:
+                self._fail(job, str(exc))
+            return self._store.get_rescore_job(job.job_id)
+
+    def _create_job(self, model_id: str, model_version: str) -> RescoreJobRow | None:
+        source = resolve_active_db_path(self._data_dir)
+        if source is None:
+            return None
+        stale = _count_stale(source, model_id, model_version)
+        if not stale:
+            return None
+        job_id = str(uuid4())
+        job = self._store.create_rescore_job(
+            job_id=job_id,
+            model_id=model_id,
+            model_version=model_version,
+            source_db=str(source),
+            total_count=stale,
+        )
+        self._logger.info("rescore.started job_id=%s version=%s stale=%d", job_id, model_version, stale)
+        return job
+
+    def _run_job(self, job: RescoreJobRow, model: Any) -> None:
+        rescored = job.rescored_count
+        last_id = job.last_id
+        source = job.source_db
+        resumed_from = rescored
+        started = time.perf_counter()
+
+        while True:
+            if self._stop_event.is_set():
+                # Left 'running': the next run_pending resumes from the checkpoint
+                return
+            if not ACTIVE_DB_LOCK.acquire(blocking=False):
+                self._stop_event.wait(_BUSY_WAIT_SECONDS)
+                continue
+            chunk_started = time.perf_counter()
+            try:
+                active = resolve_active_db_path(self._data_dir)
+                if active is None:
+                    raise ValueError("No active run database to re-score")
+                session = open_session(active)
+                try:
+                    count, last_id = rescore_stale_chunk(
+                        session,
+                        model,
+                        score_version=job.model_version,
+                        scored_at=job.scored_at,
+                        after_id=last_id,
+                        limit=self._chunk_size,
+                        model_identifier=job.model_id,
+                    )
+                    if not count:
+                        propagate_canonical_scores(session, None)
+                finally:
+                    session.close()
+                    session.get_bind().dispose()
+            finally:
+                ACTIVE_DB_LOCK.release()
+            if not count:
+                break
+            rescored += count
+            elapsed = time.perf_counter() - started
+            self._store.update_rescore_progress(
+                job_id=job.job_id,
+                last_id=last_id,
+                rescored_count=rescored,
+                rows_per_second=(rescored - resumed_from) / elapsed if elapsed > 0 else 0.0,
+                source_db=None if str(active) == source else str(active),
+            )
+            source = str(active)
+            self._throttle(time.perf_counter() - chunk_started)
+
+        self._store.complete_rescore_job(job_id=job.job_id, status="completed")
+        self._logger.info("rescore.completed job_id=%s version=%s rescored=%d", job.job_id, job.model_version, rescored)
+        self._export(job, active)
+
+    def _export(self, job: RescoreJobRow, db_path: Path) -> None:
+        # Parquet partitions carry scores too; refresh the runs this job touched
+        export_root = export_root_for(self._data_dir)
+        try:
+            with closing(sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)) as conn:
+                run_ids = [
+                    str(row[0])
+                    for row in conn.execute(
+                        "SELECT DISTINCT run_id FROM run_items WHERE scored_at = ? AND score_version = ?",
+                        (job.scored_at, job.model_version),
+                    )
+                ]
+            for run_id in run_ids:
+                export_run(db_path, run_id, export_root)
+        except Exception as exc:
+            self._logger.warning("rescore.export_failed job_id=%s error=%s", job.job_id, str(exc)[:100])
+
+    def _throttle(self, chunk_seconds: float) -> None:
+        if self._duty_percent < 100:
+            self._stop_event.wait(chunk_seconds * (100 - self._duty_percent) / self._duty_percent)
+
+    def _fail(self, job: RescoreJobRow, error: str) -> None:
+        self._logger.warning("rescore.failed job_id=%s error=%s", job.job_id, error)
+        self._store.complete_rescore_job(job_id=job.job_id, status="failed", error_message=error)
+
+    def _run_loop(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                self.run_pending()
+            except Exception as exc:
+                self._logger.warning("rescore.loop_failed error=%s", exc)
+            self._wake_event.wait(self._poll_interval_seconds)
+            self._wake_event.clear()
+
+
+def _count_stale(db_path: Path, model_id: str, model_version: str) -> int:
+    try:
+        with closing(sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)) as conn:
+            return int(conn.execute(_STALE_COUNT_SQL, (model_version, model_id)).fetchone()[0])
+    except sqlite3.Error:
+        return 0
+
+
+def _job_to_payload(job: RescoreJobRow | None) -> dict[str, Any] | None:
+    if job is None:
+        return None
+    return {
+        "jobId": job.job_id,
+        "modelId": job.model_id,
+        "modelVersion": job.model_version,
+        "status": job.status,
+        "totalCount": job.total_count,
+        "rescoredCount": job.rescored_count,
+        "progress": min(1.0, job.rescored_count / job.total_count) if job.total_count else 1.0,
+        "rowsPerSecond": round(job.rows_per_second, 1),
+        "startedAt": job.started_at,
+        "updatedAt": job.updated_at,
+        "completedAt": job.completed_at,
+        "error": job.error_message,
+    }
@@ -14,8 +14,10 @@ from typing import Any, Mapping
 import redis
 from redis.exceptions import RedisError
 
+from app.db.session import ACTIVE_DB_POINTER, resolve_active_db_path
 from app.pipelines.ingestion import RunInput, ingest_run
 from app.schemas.events import build_run_event
+from app.services.run_item_export import export_root_for, export_run, sync_exports
 from app.services.fetcher import DeterministicMockUrlResolver, FetcherError, UrlResolver
 from app.services.brave_search import (
     BraveSearchClient,
@@ -37,22 +39,9 @@ REQUIRED_EVENT_FIELDS = (
     "runId",
     "payload",
 )
-DEFAULT_ACTIVE_DB = "db/runs/active.db"
-
-
-def _resolve_active_db_path(data_dir: Path) -> Path | None:
-    pointer_path = data_dir / "db" / "current-db.txt"
-    if pointer_path.exists():
-        pointer_value = pointer_path.read_text(encoding="utf-8").strip()
-        if pointer_value:
-            resolved = Path(pointer_value)
-            db_path = resolved if resolved.is_absolute() else data_dir / resolved
-            if db_path.exists():
-                return db_path
-    default_path = data_dir / DEFAULT_ACTIVE_DB
-    if default_path.exists():
-        return default_path
-    return None
+# Held from copying the active DB until the pointer swap, so in-place writers
+# (historical re-scoring) never write to a DB a run has already copied
+ACTIVE_DB_LOCK = threading.Lock()
 
 
 def _prepare_run_database(run_id: str, data_dir: Path, logger: logging.Logger) -> Path:
@@ -60,7 +49,7 @@ def _prepare_run_database(run_id: str, data_dir: Path, logger: logging.Logger) -
     runs_dir.mkdir(parents=True, exist_ok=True)
     new_db_path = runs_dir / f"{run_id}.db"
 
-    source_db = _resolve_active_db_path(data_dir)
+    source_db = resolve_active_db_path(data_dir)
     if source_db is not None:
         source_size = source_db.stat().st_size if source_db.exists() else 0
         logger.info(
@@ -77,7 +66,7 @@ def _prepare_run_database(run_id: str, data_dir: Path, logger: logging.Logger) -
 
 
 def _update_db_pointer(new_db_path: Path, data_dir: Path, logger: logging.Logger) -> None:
-    pointer_path = data_dir / "db" / "current-db.txt"
+    pointer_path = data_dir / ACTIVE_DB_POINTER
     relative_path = new_db_path.relative_to(data_dir)
     pointer_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -183,17 +172,19 @@ class RunEventsWorker:
 
         try:
             search_client, url_resolver = _build_clients(self._search_provider, self._logger)
-            _prepare_run_database(event.run_id, self._data_dir, self._logger)
-            outcome = ingest_run(
-                run_id=event.run_id,
-                run_inputs=run_inputs,
-                search_client=search_client,
-                url_resolver=url_resolver,
-                data_dir=self._data_dir,
-                capture_html=True,
-            )
-            new_db_path = self._data_dir / "db" / "runs" / f"{event.run_id}.db"
-            _update_db_pointer(new_db_path, self._data_dir, self._logger)
+            with ACTIVE_DB_LOCK:
+                _prepare_run_database(event.run_id, self._data_dir, self._logger)
+                outcome = ingest_run(
+                    run_id=event.run_id,
+                    run_inputs=run_inputs,
+                    search_client=search_client,
+                    url_resolver=url_resolver,
+                    data_dir=self._data_dir,
+                    capture_html=True,
+                )
+                new_db_path = self._data_dir / "db" / "runs" / f"{event.run_id}.db"
+                _update_db_pointer(new_db_path, self._data_dir, self._logger)
+            self._export_run(event.run_id, new_db_path)
             
             duration_ms = int((time.perf_counter() - start_time) * 1000)
             self._logger.info(
@@ -256,6 +247,18 @@ class RunEventsWorker:
                 },
             )
 
+    def _export_run(self, run_id: str, db_path: Path) -> None:
+        # Columnar export feeds training/evaluation loaders; it never blocks run completion
+        export_root = export_root_for(self._data_dir)
+        try:
+            export_run(db_path, run_id, export_root)
+            backfilled = sync_exports(db_path, export_root)
+        except Exception as error:
+            self._logger.warning("run_worker.export_failed run_id=%s error=%s", run_id[:8], str(error)[:100])
+            return
+        if backfilled:
+            self._logger.info("run_worker.export_backfilled run_id=%s runs=%d", run_id[:8], len(backfilled))
+
     def _publish_event(self, event_type: str, run_id: str, payload: dict[str, Any]) -> None:
         event = build_run_event(event_type=event_type, run_id=run_id, payload=payload)
         fields = {
@@ -44,3 +44,4 @@ class ResultMetadata:
     relevance_score: float | None = None
     scored_at: str | None = None
     score_version: str | None = None
+    score_model_id: str | None = None
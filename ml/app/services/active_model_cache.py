@@ -0,0 +1,98 @@
+"""In-process cache of the active model reference read from evaluations.db.
+
+Scoring resolves the active model on every run; this keeps the answer until
+either the evaluations DB file changes on disk (another process activated a
+model) or an in-process activation calls ``invalidate_active_model``.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ActiveModelReference:
+    model_id: str
+    model_version: str
+
+
+_lock = threading.Lock()
+# Bumped on every in-process activation so cached entries are never reused
+_generation = 0
+_entries: dict[Path, tuple[tuple[object, ...], ActiveModelReference | None]] = {}
+
+
+def evaluations_db_path(data_dir: Path | None = None) -> Path:
+    return Path(data_dir or os.getenv("DATA_DIR", "data")) / "db" / "evaluations.db"
+
+
+def get_active_model_reference(db_path: Path) -> ActiveModelReference | None:
+    """The active model recorded in ``db_path``, re-read only when it may have changed."""
+    stamp = _db_stamp(db_path)
+    if stamp is None:
+        return None
+    with _lock:
+        key = (_generation, *stamp)
+        cached = _entries.get(db_path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+    reference = _read_active_model(db_path)
+    with _lock:
+        # A concurrent activation may have bumped the generation; cache under the key read before
+        _entries[db_path] = (key, reference)
+    return reference
+
+
+def invalidate_active_model() -> None:
+    global _generation
+    with _lock:
+        _generation += 1
+        _entries.clear()
+    logger.info("active_model_cache.invalidated generation=%d", _generation)
+
+
+def _db_stamp(db_path: Path) -> tuple[object, ...] | None:
+    # Writes land in the -wal file first when the DB is in WAL mode
+    try:
+        stat = db_path.stat()
+    except FileNotFoundError:
+        return None
+    stamp: tuple[object, ...] = (stat.st_mtime_ns, stat.st_size)
+    try:
+        wal = Path(f"{db_path}-wal").stat()
+    except FileNotFoundError:
+        return stamp
+    return (*stamp, wal.st_mtime_ns, wal.st_size)
+
+
+def _read_active_model(db_path: Path) -> ActiveModelReference | None:
+    # Read-only and without the store's schema DDL; a DB without the table has no active model
+    try:
+        connection = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    except sqlite3.Error:
+        return None
+    try:
+        row = connection.execute(
+            """
+            SELECT model_id, model_version
+            FROM active_models
+            WHERE is_active = 1
+            ORDER BY activated_at DESC
+            LIMIT 1
+            """
+        ).fetchone()
+    except sqlite3.OperationalError:
+        return None
+    finally:
+        connection.close()
+    if row is None:
+        return None
+    return ActiveModelReference(model_id=row[0], model_version=row[1])
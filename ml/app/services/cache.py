@@ -11,6 +11,28 @@ import sqlite3
 import yaml
 
 
+LATEST_CACHE_METADATA_SQL = (
+    "SELECT run_id, cached_at, cache_expires_at "
+    "FROM run_items "
+    "WHERE cache_key = ? AND cached_at IS NOT NULL AND cache_expires_at IS NOT NULL "
+    "ORDER BY cached_at DESC, id DESC "
+    "LIMIT 1"
+)
+CACHED_RESULTS_SQL = (
+    "SELECT title, snippet, raw_url, final_url, domain "
+    "FROM run_items "
+    "WHERE run_id = ? AND cache_key = ? "
+    "ORDER BY id ASC"
+)
+LATEST_LAST_SEEN_SQL = (
+    "SELECT last_seen_at "
+    "FROM run_items "
+    "WHERE (final_url = ? OR raw_url = ?) AND last_seen_at IS NOT NULL "
+    "ORDER BY last_seen_at DESC, id DESC "
+    "LIMIT 1"
+)
+
+
 @dataclass(frozen=True)
 class CachePolicy:
     ttl_hours: int
@@ -120,13 +142,7 @@ class CacheService:
         for db_path in self._iter_run_databases():
             row = self._query_one(
                 db_path=db_path,
-                sql=(
-                    "SELECT last_seen_at "
-                    "FROM run_items "
-                    "WHERE (final_url = ? OR raw_url = ?) AND last_seen_at IS NOT NULL "
-                    "ORDER BY last_seen_at DESC, id DESC "
-                    "LIMIT 1"
-                ),
+                sql=LATEST_LAST_SEEN_SQL,
                 params=(url, url),
             )
             if row is None:
@@ -154,13 +170,7 @@ class CacheService:
     def _fetch_latest_cache_metadata(self, *, db_path: Path, cache_key: str) -> tuple[str, str, str] | None:
         row = self._query_one(
             db_path=db_path,
-            sql=(
-                "SELECT run_id, cached_at, cache_expires_at "
-                "FROM run_items "
-                "WHERE cache_key = ? AND cached_at IS NOT NULL AND cache_expires_at IS NOT NULL "
-                "ORDER BY cached_at DESC, id DESC "
-                "LIMIT 1"
-            ),
+            sql=LATEST_CACHE_METADATA_SQL,
             params=(cache_key,),
         )
         if row is None:
@@ -170,12 +180,7 @@ class CacheService:
     def _fetch_cached_results(self, *, db_path: Path, run_id: str, cache_key: str) -> list[CachedSearchResult]:
         rows = self._query_all(
             db_path=db_path,
-            sql=(
-                "SELECT title, snippet, raw_url, final_url, domain "
-                "FROM run_items "
-                "WHERE run_id = ? AND cache_key = ? "
-                "ORDER BY id ASC"
-            ),
+            sql=CACHED_RESULTS_SQL,
             params=(run_id, cache_key),
         )
         results: list[CachedSearchResult] = []
@@ -0,0 +1,141 @@
+"""Stratified k-fold evaluation over a process pool.
+
+Rows are assigned to folds per class, so every fold keeps the dataset's
+label balance. ``FoldPool`` starts its worker processes with one copy of the
+dataset and the fold assignment each; spawning them and pickling the dataset
+is slow, so callers on an event loop create and ``warm`` the pool in a
+thread. A (model, fold) job then ships only the model: the worker fits a
+fresh copy on every other fold and returns its predictions for the held-out
+fold. Jobs of all models share the pool, so the wall-clock time of an
+evaluation shrinks with the number of workers.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+import multiprocessing
+from typing import Any, Sequence
+
+import numpy as np
+
+from app.services.feature_store import FeatureMatrix, featurize_rows
+
+
+MAX_FOLDS = 20
+DEFAULT_SEED = 0
+
+
+def stratified_folds(labels: Sequence[int] | np.ndarray, folds: int, *, seed: int = DEFAULT_SEED) -> np.ndarray:
+    """Fold number (``0..folds-1``) of every row, balanced per label value."""
+    if folds < 2:
+        raise ValueError("folds must be >= 2")
+    labels = np.asarray(labels)
+    assignment = np.empty(labels.size, dtype=np.int32)
+    rng = np.random.default_rng(seed)
+    offset = 0
+    for value in np.unique(labels):
+        members = np.flatnonzero(labels == value)
+        rng.shuffle(members)
+        # The round-robin continues across classes, so fold sizes differ by at most one
+        assignment[members] = (np.arange(members.size) + offset) % folds
+        offset += members.size
+    return assignment
+
+
+def summarize_folds(fold_metrics: Sequence[dict[str, float]]) -> tuple[dict[str, float], dict[str, float]]:
+    """Per-metric mean and sample variance across folds."""
+    names = sorted({name for metrics in fold_metrics for name in metrics})
+    if not names:
+        return {}, {}
+    values = np.array([[float(metrics.get(name, 0.0)) for name in names] for metrics in fold_metrics])
+    mean = values.mean(axis=0)
+    variance = values.var(axis=0, ddof=1) if len(values) > 1 else np.zeros(len(names))
+    return dict(zip(names, mean.tolist())), dict(zip(names, variance.tolist()))
+
+
+class FoldPool:
+    """Worker processes that fit and predict models on the folds of one dataset.
+
+    Example:
+        with FoldPool(4, features=rows, labels=labels, matrix=matrix, assignment=folds) as pool:
+            pool.warm()
+            predictions = pool.submit(model, 0, use_features=True).result()
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        *,
+        features: Sequence[dict[str, Any]],
+        labels: Sequence[int],
+        matrix: FeatureMatrix | None,
+        assignment: np.ndarray,
+    ) -> None:
+        self._workers = max(1, workers)
+        # Spawned, not forked: the API process runs threads that a fork would copy mid-flight
+        self._executor = ProcessPoolExecutor(
+            max_workers=self._workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(features, np.asarray(labels, dtype=np.int8), matrix, assignment),
+        )
+
+    def warm(self) -> None:
+        """Start the worker processes now instead of on the first submits.
+
+        Blocks until the workers are up. A pool that fails to start reports
+        it on every later ``submit``, as before.
+        """
+        wait([self._executor.submit(_ready) for _ in range(self._workers)])
+
+    def submit(self, model: Any, fold: int, *, use_features: bool) -> Future[list[float]]:
+        """Predictions for the rows of ``fold`` from a copy of ``model`` fitted on the other folds."""
+        return self._executor.submit(_fit_predict_fold, model, fold, use_features)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> FoldPool:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+# Per-process dataset, set once by ``_init_worker``
+_features: Sequence[dict[str, Any]] = ()
+_rows: list[dict[str, Any]] | None = None
+_labels = np.empty(0, dtype=np.int8)
+_matrix: FeatureMatrix | None = None
+_assignment = np.empty(0, dtype=np.int32)
+
+
+def _init_worker(
+    features: Sequence[dict[str, Any]],
+    labels: np.ndarray,
+    matrix: FeatureMatrix | None,
+    assignment: np.ndarray,
+) -> None:
+    global _features, _labels, _matrix, _assignment
+    _features, _labels, _matrix, _assignment = features, labels, matrix, assignment
+
+
+def _ready() -> None:
+    return None
+
+
+def _fit_predict_fold(model: Any, fold: int, use_features: bool) -> list[float]:
+    global _matrix, _rows
+    held_out = _assignment == fold
+    train, test = np.flatnonzero(~held_out), np.flatnonzero(held_out)
+    train_y = _labels[train].tolist()
+    # ``model`` was unpickled for this job, so fitting it never touches the caller's instance
+    if use_features:
+        if _matrix is None:
+            _matrix = featurize_rows(_features)
+        model.fit_features(_matrix.take(train), train_y)
+        return list(model.predict_features(_matrix.take(test)))
+    if _rows is None:
+        _rows = list(_features)
+    model.fit([_rows[position] for position in train], train_y)
+    return list(model.predict([_rows[position] for position in test]))
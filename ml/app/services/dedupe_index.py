@@ -0,0 +1,212 @@
+"""Persistent cross-run dedupe index stored next to run_items in the run DB.
+
+Holds, for every canonical record already deduplicated:
+- its normalized URL hash (``dedupe_url_index``)
+- a MinHash signature (``dedupe_signatures``) and its LSH band buckets
+  (``dedupe_lsh_buckets``)
+
+A new run is matched against history through these tables, so the cost of a
+pass grows with the new rows and their LSH candidates, not with history size.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from typing import TYPE_CHECKING, Iterable, Sequence
+
+import numpy as np
+from sqlalchemy import bindparam, text
+
+from app.db.page_text import decode_page_text
+from app.services.minhash import (
+    DEFAULT_NUM_PERM,
+    LshIndex,
+    MinHasher,
+    decode_shingles,
+    encode_shingles,
+    jaccard,
+    optimal_bands,
+    shingle_hashes,
+)
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Index parameters are fixed per database; they are tuned for the default 0.90 threshold
+INDEX_NUM_PERM = DEFAULT_NUM_PERM
+INDEX_BANDS = optimal_bands(0.90, INDEX_NUM_PERM)
+_WATERMARK_KEY = "indexed_through_id"
+_BATCH_SIZE = 500
+
+# Select/join fragments for ``resolve_shingles``: stored hashes first, and the
+# page text only for rows ingested before hashes were stored
+SHINGLE_COLUMNS = "ri.id, s.hashes, ri.title, ri.snippet, t.codec, CASE WHEN s.hashes IS NULL THEN t.visible_text END"
+SHINGLE_JOINS = (
+    "LEFT JOIN run_item_shingles s ON s.item_id = ri.id "
+    "LEFT JOIN run_item_texts t ON t.item_id = ri.id"
+)
+
+
+def comparable_text(title: str | None, snippet: str | None, visible_text: str | None) -> str:
+    """Text used for similarity comparison: title, snippet and page text."""
+    return " ".join(part for part in (title, snippet, visible_text) if part)
+
+
+def item_shingles(title: str | None, snippet: str | None, visible_text: str | None) -> np.ndarray:
+    return shingle_hashes(comparable_text(title, snippet, visible_text))
+
+
+def resolve_shingles(session: Session, rows: Sequence[Sequence]) -> list[np.ndarray]:
+    """Shingle hashes of rows selected with ``SHINGLE_COLUMNS`` (in that order).
+
+    Rows without stored hashes are tokenised once here and their hashes stored.
+    """
+    resolved: list[np.ndarray] = []
+    computed: list[dict[str, object]] = []
+    for item_id, payload, title, snippet, codec, page_text in rows:
+        if payload is not None:
+            resolved.append(decode_shingles(payload))
+            continue
+        hashes = item_shingles(title, snippet, decode_page_text(codec, page_text))
+        resolved.append(hashes)
+        computed.append({"id": item_id, "hashes": encode_shingles(hashes)})
+    if computed:
+        session.execute(
+            text("INSERT OR IGNORE INTO run_item_shingles (item_id, hashes) VALUES (:id, :hashes)"),
+            computed,
+        )
+    return resolved
+
+
+class DedupeIndex:
+    def __init__(self, session: Session) -> None:
+        self._session = session
+        self._hasher = MinHasher(INDEX_NUM_PERM)
+        self._bands = LshIndex(INDEX_NUM_PERM, INDEX_BANDS)
+        self._shingle_cache: dict[int, np.ndarray] = {}
+
+    @property
+    def watermark(self) -> int:
+        value = self._session.execute(
+            text("SELECT value FROM dedupe_index_state WHERE key = :key"), {"key": _WATERMARK_KEY}
+        ).scalar_one_or_none()
+        return int(value) if value is not None else 0
+
+    def catch_up(self, *, before_id: int) -> int:
+        """Index canonical rows with ``watermark < id < before_id`` (backfills legacy history)."""
+        start = self.watermark
+        indexed = 0
+        while True:
+            rows = self._session.execute(
+                text(
+                    f"""
+                    SELECT ri.normalized_url, {SHINGLE_COLUMNS}
+                    FROM run_items ri
+                    {SHINGLE_JOINS}
+                    WHERE ri.id > :start AND ri.id < :before_id
+                      AND (ri.is_duplicate = 0 OR ri.is_duplicate IS NULL)
+                    ORDER BY ri.id
+                    LIMIT :limit
+                    """
+                ),
+                {"start": start, "before_id": before_id, "limit": _BATCH_SIZE},
+            ).all()
+            if not rows:
+                break
+            hashes = resolve_shingles(self._session, [row[1:] for row in rows])
+            self.add([(row[1], row[0], row_hashes) for row, row_hashes in zip(rows, hashes)])
+            indexed += len(rows)
+            start = int(rows[-1][1])
+        if before_id - 1 > self.watermark:
+            self._set_watermark(before_id - 1)
+        if indexed:
+            logger.info("dedupe_index.caught_up rows=%d watermark=%d", indexed, before_id - 1)
+        return indexed
+
+    def find_similar_canonical(self, hashes: np.ndarray, threshold: float, *, before_id: int) -> int | None:
+        """Smallest indexed canonical id (< ``before_id``) whose trigram Jaccard reaches ``threshold``."""
+        signature = self._hasher.signature(hashes)
+        if signature is None:
+            return None
+        statement = text(
+            "SELECT DISTINCT item_id FROM dedupe_lsh_buckets "
+            "WHERE bucket IN :buckets AND item_id < :before_id ORDER BY item_id"
+        ).bindparams(bindparam("buckets", expanding=True))
+        candidates = [
+            int(row[0])
+            for row in self._session.execute(
+                statement, {"buckets": self._bucket_ids(signature), "before_id": before_id}
+            )
+        ]
+        if not candidates:
+            return None
+        self._load_shingles(candidates)
+        for candidate in candidates:
+            if jaccard(hashes, self._shingle_cache[candidate]) >= threshold:
+                return candidate
+        return None
+
+    def add(self, rows: Sequence[tuple[int, str | None, np.ndarray]]) -> None:
+        """Register canonical records as (id, normalized_url, shingle hashes)."""
+        url_entries = [{"url": url, "id": item_id} for item_id, url, _ in rows if url]
+        signatures: list[dict[str, object]] = []
+        buckets: list[dict[str, int]] = []
+        for item_id, _, hashes in rows:
+            self._shingle_cache[item_id] = hashes
+            signature = self._hasher.signature(hashes)
+            if signature is None:
+                continue
+            signatures.append({"id": item_id, "minhash": signature.astype("<u8").tobytes()})
+            buckets.extend({"bucket": bucket, "id": item_id} for bucket in self._bucket_ids(signature))
+
+        if url_entries:
+            self._session.execute(
+                text("INSERT OR IGNORE INTO dedupe_url_index (normalized_url, canonical_id) VALUES (:url, :id)"),
+                url_entries,
+            )
+        if signatures:
+            self._session.execute(
+                text("INSERT OR REPLACE INTO dedupe_signatures (item_id, minhash) VALUES (:id, :minhash)"),
+                signatures,
+            )
+        if buckets:
+            self._session.execute(
+                text("INSERT OR IGNORE INTO dedupe_lsh_buckets (bucket, item_id) VALUES (:bucket, :id)"),
+                buckets,
+            )
+
+    def advance_watermark(self, through_id: int) -> None:
+        if through_id > self.watermark:
+            self._set_watermark(through_id)
+
+    def _set_watermark(self, value: int) -> None:
+        self._session.execute(
+            text("INSERT OR REPLACE INTO dedupe_index_state (key, value) VALUES (:key, :value)"),
+            {"key": _WATERMARK_KEY, "value": str(value)},
+        )
+
+    def _bucket_ids(self, signature: np.ndarray) -> list[int]:
+        return [
+            int.from_bytes(hashlib.blake2b(band_key, digest_size=8).digest(), "little", signed=True)
+            for band_key in self._bands.band_keys(signature)
+        ]
+
+    def _load_shingles(self, item_ids: list[int]) -> None:
+        missing = [item_id for item_id in item_ids if item_id not in self._shingle_cache]
+        statement = text(
+            f"SELECT {SHINGLE_COLUMNS} FROM run_items ri {SHINGLE_JOINS} WHERE ri.id IN :ids"
+        ).bindparams(bindparam("ids", expanding=True))
+        for chunk in _chunks(missing, _BATCH_SIZE):
+            rows = self._session.execute(statement, {"ids": chunk}).all()
+            for row, hashes in zip(rows, resolve_shingles(self._session, rows)):
+                self._shingle_cache[int(row[0])] = hashes
+        for item_id in missing:
+            self._shingle_cache.setdefault(item_id, np.empty(0, dtype=np.uint64))
+
+
+def _chunks(values: Sequence, size: int) -> Iterable[Sequence]:
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
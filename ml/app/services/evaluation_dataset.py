@@ -0,0 +1,320 @@
+"""Evaluation rows cached across evaluations and extended incrementally.
+
+Every evaluation needs the scored canonical rows of the active run DB (or of
+the Parquet exports, when they exist). ``EvaluationDatasetCache`` keeps them
+in columnar form: Arrow string arrays for the text fields, an ``int8`` label
+array and the stored feature vectors as one ``FeatureMatrix``.
+
+Run DBs are copies of their predecessor, so run item ids are stable and new
+rows only ever get higher ids. Each build records a content fingerprint of
+the rows it holds (``label_fingerprint``: row count plus a sum of squared
+per-row terms of id and label, so opposite label flips do not cancel). On
+the next load an unchanged DB file is answered from memory; otherwise the
+fingerprint of rows up to the cached maximum id is recomputed inside SQLite,
+and when it still matches only rows above that id are read and appended. Any
+other change (a rescore flipping a label, rows marked duplicate) triggers a
+full rebuild. When exports exist, a run is read from its partition only while
+the partition still matches the run in the DB (see ``current_partitions``);
+stale and unexported runs are read from the DB. Partitions are cached per
+file and only new or rewritten ones are read.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import json
+import logging
+from pathlib import Path
+import sqlite3
+import threading
+from typing import Any, Iterator, Sequence, overload
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from app.services.feature_store import FeatureMatrix, feature_sql, vectors_from_rows
+from app.services.run_item_export import (
+    FEATURE_SOURCE_COLUMNS,
+    LABELED_ROWS_SQL,
+    RunFingerprint,
+    column_to_numpy,
+    feature_source_rows,
+    label_fingerprint,
+    labeled_rows_filter,
+    load_partition,
+    partition_files,
+    rows_fingerprint,
+    run_fingerprints,
+    table_fingerprint,
+)
+
+
+logger = logging.getLogger(__name__)
+
+TEXT_FIELDS = ("title", "snippet", "domain")
+
+# (mtime_ns, size) of a file and, for SQLite, of its -wal file
+_Stamp = tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class DatasetColumns:
+    """Evaluation rows in columnar form, row for row across every field."""
+
+    texts: dict[str, pa.Array]
+    labels: np.ndarray
+    matrix: FeatureMatrix
+
+    def __len__(self) -> int:
+        return int(self.labels.size)
+
+    @classmethod
+    def empty(cls) -> DatasetColumns:
+        return cls(
+            texts={name: pa.array([], type=pa.string()) for name in TEXT_FIELDS},
+            labels=np.empty(0, dtype=np.int8),
+            matrix=FeatureMatrix.from_vectors([]),
+        )
+
+    @classmethod
+    def concatenate(cls, parts: Sequence[DatasetColumns]) -> DatasetColumns:
+        parts = [part for part in parts if len(part)]
+        if not parts:
+            return cls.empty()
+        if len(parts) == 1:
+            return parts[0]
+        return cls(
+            texts={name: pa.concat_arrays([part.texts[name] for part in parts]) for name in TEXT_FIELDS},
+            labels=np.concatenate([part.labels for part in parts]),
+            matrix=FeatureMatrix.concatenate([part.matrix for part in parts]),
+        )
+
+    def feature_rows(self) -> FeatureRows:
+        return FeatureRows(self.texts)
+
+
+class FeatureRows(Sequence[dict[str, str]]):
+    """Read-only ``{"title", "snippet", "domain"}`` dicts over the Arrow text columns.
+
+    Models that take feature dicts get them on iteration; the columns stay
+    the only copy held between evaluations.
+    """
+
+    def __init__(self, texts: dict[str, pa.Array]) -> None:
+        self._texts = texts
+        self._length = len(texts[TEXT_FIELDS[0]])
+
+    def __len__(self) -> int:
+        return self._length
+
+    @overload
+    def __getitem__(self, index: int) -> dict[str, str]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[dict[str, str]]: ...
+
+    def __getitem__(self, index: int | slice) -> dict[str, str] | list[dict[str, str]]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            if step != 1:
+                return [self[position] for position in range(start, stop, step)]
+            return _dicts({name: column.slice(start, stop - start) for name, column in self._texts.items()})
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("feature row index out of range")
+        return {name: self._texts[name][index].as_py() or "" for name in TEXT_FIELDS}
+
+    def __iter__(self) -> Iterator[dict[str, str]]:
+        return iter(_dicts(self._texts))
+
+
+class EvaluationDatasetCache:
+    """Columns of the latest run DB or export set, reused while their content is unchanged."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # Run DB source: stamp of the DB file, fingerprint and highest id of the cached rows
+        self._db_stamp: tuple[Path, _Stamp] | None = None
+        self._db_fingerprint: tuple[int, int] | None = None
+        self._db_max_id = 0
+        self._db_columns: DatasetColumns | None = None
+        # Export source: fingerprint and columns of each partition file, keyed by path and stamp
+        self._partitions: dict[Path, tuple[_Stamp, RunFingerprint, DatasetColumns]] = {}
+        self._export_key: tuple[object, ...] | None = None
+        self._export_columns: tuple[DatasetColumns, str] | None = None
+
+    def load_run_db(self, db_path: Path) -> DatasetColumns:
+        """Scored canonical rows of ``db_path``; only rows added since the last build are read."""
+        with self._lock:
+            stamp = (db_path, _file_stamp(db_path, wal=True))
+            if self._db_columns is not None and stamp == self._db_stamp:
+                return self._db_columns
+            with sqlite3.connect(f"file:{db_path}?mode=ro", uri=True) as connection:
+                columns = self._extend_or_rebuild(connection)
+            self._db_stamp = stamp
+            self._db_columns = columns
+            return columns
+
+    def load_exports(self, export_root: Path, db_path: Path) -> tuple[DatasetColumns, str]:
+        """Scored canonical rows from current partitions plus the other runs of ``db_path``.
+
+        Returns the columns and a label of their source. Only new or
+        rewritten partitions are read.
+        """
+        with self._lock:
+            files = partition_files(export_root)
+            stamps = [_file_stamp(path) for _, path in files]
+            key = (db_path, _file_stamp(db_path, wal=True), *zip(files, stamps))
+            if self._export_columns is not None and key == self._export_key:
+                return self._export_columns
+            partitions: dict[Path, tuple[_Stamp, RunFingerprint, DatasetColumns]] = {}
+            current: list[DatasetColumns] = []
+            current_runs: set[str] = set()
+            read = 0
+            with sqlite3.connect(f"file:{db_path}?mode=ro", uri=True) as connection:
+                expected = run_fingerprints(connection)
+                for (run_id, path), stamp in zip(files, stamps):
+                    cached = self._partitions.get(path)
+                    if cached is None or cached[0] != stamp:
+                        cached = (stamp, *_partition_columns(path))
+                        read += 1
+                    partitions[path] = cached
+                    if expected.get(run_id) == cached[1]:
+                        current.append(cached[2])
+                        current_runs.add(run_id)
+                db_runs = sorted(set(expected) - current_runs)
+                _, from_db = _run_item_columns(connection, after_id=None, run_ids=db_runs)
+            columns = DatasetColumns.concatenate([*current, from_db])
+            source = f"exports[{len(current_runs)}]+{db_path.name}[{len(db_runs)}]"
+            self._partitions = partitions
+            self._export_key = key
+            self._export_columns = (columns, source)
+            logger.info(
+                "evaluation_dataset.exports_loaded partitions=%d current=%d read=%d db_runs=%d rows=%d",
+                len(partitions),
+                len(current_runs),
+                read,
+                len(db_runs),
+                len(columns),
+            )
+            return self._export_columns
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db_stamp = None
+            self._db_fingerprint = None
+            self._db_max_id = 0
+            self._db_columns = None
+            self._partitions = {}
+            self._export_key = None
+            self._export_columns = None
+
+    def _extend_or_rebuild(self, connection: sqlite3.Connection) -> DatasetColumns:
+        cached = self._db_columns
+        if cached is not None and rows_fingerprint(connection, max_id=self._db_max_id) == self._db_fingerprint:
+            ids, added = _run_item_columns(connection, after_id=self._db_max_id)
+            columns = DatasetColumns.concatenate([cached, added])
+            fingerprint = _add_fingerprints(self._db_fingerprint, label_fingerprint(ids, added.labels))
+            logger.info("evaluation_dataset.extended added=%d rows=%d", len(added), len(columns))
+        else:
+            ids, columns = _run_item_columns(connection, after_id=None)
+            fingerprint = label_fingerprint(ids, columns.labels)
+            self._db_max_id = 0
+            logger.info("evaluation_dataset.rebuilt rows=%d", len(columns))
+        if ids.size:
+            self._db_max_id = int(ids.max())
+        self._db_fingerprint = fingerprint
+        return columns
+
+
+def _run_item_columns(
+    connection: sqlite3.Connection,
+    *,
+    after_id: int | None,
+    run_ids: Sequence[str] | None = None,
+) -> tuple[np.ndarray, DatasetColumns]:
+    feature_columns, feature_join = feature_sql(connection)
+    where = LABELED_ROWS_SQL
+    params: list[object] = []
+    if after_id is not None:
+        where += " AND ri.id > ?"
+        params.append(after_id)
+    if run_ids is not None:
+        if not run_ids:
+            return np.empty(0, dtype=np.int64), DatasetColumns.empty()
+        # One JSON parameter instead of a variable per run id
+        where += " AND ri.run_id IN (SELECT value FROM json_each(?))"
+        params.append(json.dumps(list(run_ids)))
+    rows = connection.execute(
+        f"""
+        SELECT ri.id, ri.title, ri.snippet, ri.domain, ri.relevance_score, {feature_columns}
+        FROM run_items ri
+        {feature_join}
+        WHERE {where}
+        ORDER BY ri.id
+        """,
+        params,
+    ).fetchall()
+    if not rows:
+        return np.empty(0, dtype=np.int64), DatasetColumns.empty()
+    ids, titles, snippets, domains, scores, versions, payloads = zip(*rows)
+    # Stale vectors are recomputed in memory only
+    vectors, _ = vectors_from_rows(list(zip(versions, payloads, titles, snippets, domains)))
+    columns = DatasetColumns(
+        texts={
+            "title": _text_array(titles),
+            "snippet": _text_array(snippets),
+            "domain": _text_array(domains),
+        },
+        labels=(np.asarray(scores, dtype=np.float64) > 0).astype(np.int8),
+        matrix=FeatureMatrix.from_vectors(vectors),
+    )
+    return np.asarray(ids, dtype=np.int64), columns
+
+
+def _partition_columns(path: Path) -> tuple[RunFingerprint, DatasetColumns]:
+    table = load_partition(
+        path, ["id", "relevance_score", "scored_at", *FEATURE_SOURCE_COLUMNS], filter=labeled_rows_filter()
+    )
+    vectors, _ = vectors_from_rows(feature_source_rows(table))
+    return table_fingerprint(table), DatasetColumns(
+        texts={name: pc.fill_null(table.column(name), "").combine_chunks() for name in TEXT_FIELDS},
+        labels=(column_to_numpy(table, "relevance_score") > 0).astype(np.int8),
+        matrix=FeatureMatrix.from_vectors(vectors),
+    )
+
+
+def _add_fingerprints(left: tuple[int, int] | None, right: tuple[int, int]) -> tuple[int, int]:
+    if left is None:
+        return right
+    return left[0] + right[0], left[1] + right[1]
+
+
+def _text_array(values: Sequence[Any]) -> pa.Array:
+    return pa.array(["" if value is None else str(value) for value in values], type=pa.string())
+
+
+def _dicts(texts: dict[str, pa.Array]) -> list[dict[str, str]]:
+    values = [texts[name].to_pylist() for name in TEXT_FIELDS]
+    return [
+        {"title": title or "", "snippet": snippet or "", "domain": domain or ""}
+        for title, snippet, domain in zip(*values)
+    ]
+
+
+def _file_stamp(path: Path, *, wal: bool = False) -> _Stamp:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return ()
+    stamp: _Stamp = (stat.st_mtime_ns, stat.st_size)
+    if not wal:
+        return stamp
+    # Writes land in the -wal file first when the DB is in WAL mode
+    try:
+        wal_stat = Path(f"{path}-wal").stat()
+    except FileNotFoundError:
+        return stamp
+    return (*stamp, wal_stat.st_mtime_ns, wal_stat.st_size)
@@ -6,6 +6,7 @@ from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 from threading import Lock
+from typing import Any
 
 
 @dataclass(frozen=True)
@@ -32,6 +33,10 @@ class EvaluationResultRow:
     error: str | None
     duration_ms: int
     created_at: str
+    # k-fold runs: fold count, per-fold metrics, and the mean (also in ``metrics``) and variance
+    cross_validation: dict[str, Any] | None = None
+    # Areas, precision@k, downsampled ROC/PR curves and calibration bins (``metrics.ranking_summary``)
+    ranking: dict[str, Any] | None = None
 
 
 @dataclass(frozen=True)
@@ -70,6 +75,31 @@ class RetrainJobRow:
     triggered_by: str
 
 
+@dataclass(frozen=True)
+class RescoreJobRow:
+    job_id: str
+    model_id: str
+    model_version: str
+    status: str
+    source_db: str
+    scored_at: str
+    last_id: int
+    total_count: int
+    rescored_count: int
+    rows_per_second: float
+    started_at: str
+    updated_at: str
+    completed_at: str | None
+    error_message: str | None
+
+
+_RESCORE_JOB_COLUMNS = """
+    job_id, model_id, model_version, status, source_db, scored_at,
+    last_id, total_count, rescored_count, rows_per_second,
+    started_at, updated_at, completed_at, error_message
+"""
+
+
 class EvaluationStore:
     def __init__(self, db_path: Path) -> None:
         self._db_path = db_path
@@ -148,14 +178,18 @@ class EvaluationStore:
                     metrics_json,
                     error,
                     duration_ms,
-                    created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    created_at,
+                    cross_validation_json,
+                    ranking_json
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 ON CONFLICT(evaluation_id, model_id, model_version) DO UPDATE SET
                     status = excluded.status,
                     metrics_json = excluded.metrics_json,
                     error = excluded.error,
                     duration_ms = excluded.duration_ms,
-                    created_at = excluded.created_at
+                    created_at = excluded.created_at,
+                    cross_validation_json = excluded.cross_validation_json,
+                    ranking_json = excluded.ranking_json
                 """,
                 (
                     row.evaluation_id,
@@ -167,6 +201,8 @@ class EvaluationStore:
                     row.error,
                     row.duration_ms,
                     row.created_at,
+                    None if row.cross_validation is None else json.dumps(row.cross_validation),
+                    None if row.ranking is None else json.dumps(row.ranking, separators=(",", ":")),
                 ),
             )
             conn.commit()
@@ -202,27 +238,14 @@ class EvaluationStore:
             rows = conn.execute(
                 """
                 SELECT evaluation_id, model_id, model_version, dataset_id,
-                       status, metrics_json, error, duration_ms, created_at
+                       status, metrics_json, error, duration_ms, created_at, cross_validation_json, ranking_json
                 FROM evaluation_results
                 WHERE evaluation_id = ?
                 ORDER BY model_id ASC
                 """,
                 (evaluation_id,),
             ).fetchall()
-        return [
-            EvaluationResultRow(
-                evaluation_id=row[0],
-                model_id=row[1],
-                model_version=row[2],
-                dataset_id=row[3],
-                status=row[4],
-                metrics=json.loads(row[5]) if row[5] else {},
-                error=row[6],
-                duration_ms=row[7],
-                created_at=row[8],
-            )
-            for row in rows
-        ]
+        return [_to_result_row(row) for row in rows]
 
     def get_latest_results_per_model(self) -> list[EvaluationResultRow]:
         with self._connect() as conn:
@@ -236,7 +259,9 @@ class EvaluationStore:
                        er.metrics_json,
                        er.error,
                        er.duration_ms,
-                       er.created_at
+                       er.created_at,
+                       er.cross_validation_json,
+                       er.ranking_json
                 FROM evaluation_results er
                 INNER JOIN (
                     SELECT model_id, model_version, MAX(created_at) AS max_created_at
@@ -249,27 +274,14 @@ class EvaluationStore:
                 ORDER BY er.model_id ASC, er.model_version ASC
                 """
             ).fetchall()
-        return [
-            EvaluationResultRow(
-                evaluation_id=row[0],
-                model_id=row[1],
-                model_version=row[2],
-                dataset_id=row[3],
-                status=row[4],
-                metrics=json.loads(row[5]) if row[5] else {},
-                error=row[6],
-                duration_ms=row[7],
-                created_at=row[8],
-            )
-            for row in rows
-        ]
+        return [_to_result_row(row) for row in rows]
 
     def get_latest_result_for_model(self, model_id: str) -> EvaluationResultRow | None:
         with self._connect() as conn:
             row = conn.execute(
                 """
                 SELECT evaluation_id, model_id, model_version, dataset_id,
-                       status, metrics_json, error, duration_ms, created_at
+                       status, metrics_json, error, duration_ms, created_at, cross_validation_json, ranking_json
                 FROM evaluation_results
                 WHERE model_id = ?
                 ORDER BY created_at DESC
@@ -279,17 +291,7 @@ class EvaluationStore:
             ).fetchone()
         if row is None:
             return None
-        return EvaluationResultRow(
-            evaluation_id=row[0],
-            model_id=row[1],
-            model_version=row[2],
-            dataset_id=row[3],
-            status=row[4],
-            metrics=json.loads(row[5]) if row[5] else {},
-            error=row[6],
-            duration_ms=row[7],
-            created_at=row[8],
-        )
+        return _to_result_row(row)
 
     def get_active_model(self) -> ActiveModelRow | None:
         with self._connect() as conn:
@@ -589,6 +591,95 @@ class EvaluationStore:
             return None
         return row[0]
 
+    def create_rescore_job(
+        self,
+        *,
+        job_id: str,
+        model_id: str,
+        model_version: str,
+        source_db: str,
+        total_count: int,
+    ) -> RescoreJobRow:
+        started_at = _timestamp_now()
+        with self._lock:
+            with self._connect() as conn:
+                conn.execute(
+                    f"""
+                    INSERT INTO rescore_jobs ({_RESCORE_JOB_COLUMNS})
+                    VALUES (?, ?, ?, 'running', ?, ?, 0, ?, 0, 0, ?, ?, NULL, NULL)
+                    """,
+                    (job_id, model_id, model_version, source_db, started_at, total_count, started_at, started_at),
+                )
+                conn.commit()
+        return self.get_rescore_job(job_id)
+
+    def update_rescore_progress(
+        self,
+        *,
+        job_id: str,
+        last_id: int,
+        rescored_count: int,
+        rows_per_second: float,
+        source_db: str | None = None,
+    ) -> None:
+        with self._lock:
+            with self._connect() as conn:
+                conn.execute(
+                    """
+                    UPDATE rescore_jobs
+                    SET last_id = ?,
+                        rescored_count = ?,
+                        rows_per_second = ?,
+                        source_db = COALESCE(?, source_db),
+                        updated_at = ?
+                    WHERE job_id = ?
+                    """,
+                    (last_id, rescored_count, rows_per_second, source_db, _timestamp_now(), job_id),
+                )
+                conn.commit()
+
+    def complete_rescore_job(self, *, job_id: str, status: str, error_message: str | None = None) -> None:
+        completed_at = _timestamp_now()
+        with self._lock:
+            with self._connect() as conn:
+                conn.execute(
+                    """
+                    UPDATE rescore_jobs
+                    SET status = ?, completed_at = ?, updated_at = ?, error_message = ?
+                    WHERE job_id = ?
+                    """,
+                    (status, completed_at, completed_at, error_message, job_id),
+                )
+                conn.commit()
+
+    def get_rescore_job(self, job_id: str) -> RescoreJobRow | None:
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT {_RESCORE_JOB_COLUMNS} FROM rescore_jobs WHERE job_id = ?",
+                (job_id,),
+            ).fetchone()
+        return _to_rescore_job_row(row)
+
+    def get_latest_rescore_job(self) -> RescoreJobRow | None:
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT {_RESCORE_JOB_COLUMNS} FROM rescore_jobs ORDER BY started_at DESC, id DESC LIMIT 1"
+            ).fetchone()
+        return _to_rescore_job_row(row)
+
+    def get_running_rescore_job(self) -> RescoreJobRow | None:
+        with self._connect() as conn:
+            row = conn.execute(
+                f"""
+                SELECT {_RESCORE_JOB_COLUMNS}
+                FROM rescore_jobs
+                WHERE status = 'running'
+                ORDER BY started_at DESC, id DESC
+                LIMIT 1
+                """
+            ).fetchone()
+        return _to_rescore_job_row(row)
+
     def _ensure_schema(self) -> None:
         with self._lock:
             with self._connect() as conn:
@@ -620,10 +711,14 @@ class EvaluationStore:
                         error TEXT,
                         duration_ms INTEGER NOT NULL,
                         created_at TEXT NOT NULL,
+                        cross_validation_json TEXT,
+                        ranking_json TEXT,
                         UNIQUE(evaluation_id, model_id, model_version)
                     )
                     """
                 )
+                _ensure_column(conn, "evaluation_results", "cross_validation_json", "TEXT")
+                _ensure_column(conn, "evaluation_results", "ranking_json", "TEXT")
                 conn.execute(
                     """
                     CREATE INDEX IF NOT EXISTS idx_evaluation_results__evaluation_id
@@ -694,6 +789,33 @@ class EvaluationStore:
                     ON retrain_jobs(started_at)
                     """
                 )
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS rescore_jobs (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        job_id TEXT NOT NULL UNIQUE,
+                        model_id TEXT NOT NULL,
+                        model_version TEXT NOT NULL,
+                        status TEXT NOT NULL,
+                        source_db TEXT NOT NULL,
+                        scored_at TEXT NOT NULL,
+                        last_id INTEGER NOT NULL DEFAULT 0,
+                        total_count INTEGER NOT NULL DEFAULT 0,
+                        rescored_count INTEGER NOT NULL DEFAULT 0,
+                        rows_per_second REAL NOT NULL DEFAULT 0,
+                        started_at TEXT NOT NULL,
+                        updated_at TEXT NOT NULL,
+                        completed_at TEXT,
+                        error_message TEXT
+                    )
+                    """
+                )
+                conn.execute(
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_rescore_jobs__status
+                    ON rescore_jobs(status)
+                    """
+                )
                 conn.commit()
 
     def _connect(self) -> sqlite3.Connection:
@@ -721,3 +843,47 @@ def _to_retrain_job_row(row: tuple | None) -> RetrainJobRow | None:
         error_message=row[9],
         triggered_by=row[10],
     )
+
+
+def _to_result_row(row: tuple) -> EvaluationResultRow:
+    return EvaluationResultRow(
+        evaluation_id=row[0],
+        model_id=row[1],
+        model_version=row[2],
+        dataset_id=row[3],
+        status=row[4],
+        metrics=json.loads(row[5]) if row[5] else {},
+        error=row[6],
+        duration_ms=row[7],
+        created_at=row[8],
+        cross_validation=json.loads(row[9]) if row[9] else None,
+        ranking=json.loads(row[10]) if row[10] else None,
+    )
+
+
+def _ensure_column(conn: sqlite3.Connection, table: str, column: str, definition: str) -> None:
+    # Databases created before ``column`` existed get it added in place
+    existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    if column not in existing:
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
+def _to_rescore_job_row(row: tuple | None) -> RescoreJobRow | None:
+    if row is None:
+        return None
+    return RescoreJobRow(
+        job_id=row[0],
+        model_id=row[1],
+        model_version=row[2],
+        status=row[3],
+        source_db=row[4],
+        scored_at=row[5],
+        last_id=int(row[6] or 0),
+        total_count=int(row[7] or 0),
+        rescored_count=int(row[8] or 0),
+        rows_per_second=float(row[9] or 0.0),
+        started_at=row[10],
+        updated_at=row[11],
+        completed_at=row[12],
+        error_message=row[13],
+    )
@@ -0,0 +1,215 @@
+"""Versioned hashed token-count features, stored once per run item.
+
+Each row's title, snippet and domain are tokenised once (at ingestion) into
+hashed token counts and stored in ``run_item_features`` as packed uint32
+indices followed by uint16 counts. Scoring, evaluation and retraining read
+them back in batches as a ``FeatureMatrix`` (CSR layout in NumPy arrays).
+
+Rows stored under another ``FEATURIZER_VERSION`` (or not stored at all) are
+recomputed on read; writers of the run DB store the recomputed vectors.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+import hashlib
+import re
+import sqlite3
+from typing import Any, Callable, Iterable, Sequence
+
+import numpy as np
+
+
+FEATURIZER_VERSION = "hashed-tokens-v1"
+N_FEATURES = 1 << 18
+FEATURE_FIELDS = ("title", "snippet", "domain")
+_MAX_COUNT = np.iinfo(np.uint16).max
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+# Select/join fragments for ``vectors_from_rows``: (version, payload) of a row
+FEATURE_COLUMNS = "f.version, f.features"
+FEATURE_JOIN = "LEFT JOIN run_item_features f ON f.item_id = ri.id"
+
+# Sorted feature indices (uint32) and their counts (uint16)
+FeatureVector = tuple[np.ndarray, np.ndarray]
+
+
+@dataclass(frozen=True)
+class FeatureMatrix:
+    """Sparse rows: row ``i`` owns ``indices``/``values`` in ``indptr[i]:indptr[i + 1]``."""
+
+    indptr: np.ndarray
+    indices: np.ndarray
+    values: np.ndarray
+    n_features: int = N_FEATURES
+
+    def __len__(self) -> int:
+        return len(self.indptr) - 1
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return (len(self), self.n_features)
+
+    @classmethod
+    def from_vectors(cls, vectors: Sequence[FeatureVector], n_features: int = N_FEATURES) -> FeatureMatrix:
+        indptr = np.zeros(len(vectors) + 1, dtype=np.int64)
+        if vectors:
+            np.cumsum([indices.size for indices, _ in vectors], out=indptr[1:])
+            indices = np.concatenate([indices for indices, _ in vectors]).astype(np.uint32, copy=False)
+            values = np.concatenate([counts for _, counts in vectors]).astype(np.float32)
+        else:
+            indices = np.empty(0, dtype=np.uint32)
+            values = np.empty(0, dtype=np.float32)
+        return cls(indptr=indptr, indices=indices, values=values, n_features=n_features)
+
+    @classmethod
+    def concatenate(cls, matrices: Sequence[FeatureMatrix], n_features: int = N_FEATURES) -> FeatureMatrix:
+        """Rows of ``matrices`` stacked in order."""
+        if not matrices:
+            return cls.from_vectors([], n_features=n_features)
+        offsets = np.cumsum([0] + [int(matrix.indptr[-1]) for matrix in matrices[:-1]])
+        indptr = np.concatenate(
+            [np.zeros(1, dtype=np.int64)]
+            + [matrix.indptr[1:] + offset for matrix, offset in zip(matrices, offsets)]
+        )
+        return cls(
+            indptr=indptr,
+            indices=np.concatenate([matrix.indices for matrix in matrices]),
+            values=np.concatenate([matrix.values for matrix in matrices]),
+            n_features=matrices[0].n_features,
+        )
+
+    def row_ids(self) -> np.ndarray:
+        """Row number of every stored value."""
+        return np.repeat(np.arange(len(self), dtype=np.int64), np.diff(self.indptr))
+
+    def dot(self, weights: np.ndarray) -> np.ndarray:
+        """``X @ weights`` for a dense weight vector of length ``n_features``."""
+        return np.bincount(
+            self.row_ids(), weights=self.values * weights[self.indices], minlength=len(self)
+        )
+
+    def take(self, rows: np.ndarray | Sequence[int]) -> FeatureMatrix:
+        """The given rows, in order, as a new matrix."""
+        rows = np.asarray(rows, dtype=np.int64)
+        lengths = np.diff(self.indptr)[rows]
+        indptr = np.zeros(rows.size + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+        positions = np.repeat(self.indptr[rows] - indptr[:-1], lengths) + np.arange(indptr[-1])
+        return FeatureMatrix(
+            indptr=indptr,
+            indices=self.indices[positions],
+            values=self.values[positions],
+            n_features=self.n_features,
+        )
+
+    def to_dense(self, dtype: Any = np.float32) -> np.ndarray:
+        dense = np.zeros(self.shape, dtype=dtype)
+        dense[self.row_ids(), self.indices] = self.values
+        return dense
+
+
+def featurize(title: str | None, snippet: str | None, domain: str | None) -> FeatureVector:
+    """Hashed token counts of one row (title and snippet words, whole domain)."""
+    hashed = _hashed_tokens(title, snippet, domain)
+    if hashed.size == 0:
+        return np.empty(0, dtype=np.uint32), np.empty(0, dtype=np.uint16)
+    indices, counts = np.unique(hashed, return_counts=True)
+    return indices.astype(np.uint32), np.minimum(counts, _MAX_COUNT).astype(np.uint16)
+
+
+def featurize_rows(rows: Iterable[dict[str, Any]]) -> FeatureMatrix:
+    """Featurize ``{"title", "snippet", "domain"}`` feature dicts in one batch.
+
+    Same vectors as ``featurize`` per row, but the counting is one ``np.unique``
+    over (row, index) keys for the whole batch.
+    """
+    hashed = [_hashed_tokens(row.get("title"), row.get("snippet"), row.get("domain")) for row in rows]
+    if not hashed:
+        return FeatureMatrix.from_vectors([])
+    lengths = np.fromiter((tokens.size for tokens in hashed), dtype=np.int64, count=len(hashed))
+    keys = np.repeat(np.arange(len(hashed), dtype=np.int64), lengths) * N_FEATURES + np.concatenate(hashed)
+    unique_keys, counts = np.unique(keys, return_counts=True)
+    indptr = np.zeros(len(hashed) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(unique_keys // N_FEATURES, minlength=len(hashed)), out=indptr[1:])
+    return FeatureMatrix(
+        indptr=indptr,
+        indices=(unique_keys % N_FEATURES).astype(np.uint32),
+        values=np.minimum(counts, _MAX_COUNT).astype(np.float32),
+    )
+
+
+def encode_features(vector: FeatureVector) -> bytes:
+    indices, counts = vector
+    return indices.astype("<u4", copy=False).tobytes() + counts.astype("<u2", copy=False).tobytes()
+
+
+def decode_features(payload: bytes) -> FeatureVector:
+    size = len(payload) // 6
+    indices = np.frombuffer(payload, dtype="<u4", count=size).astype(np.uint32)
+    counts = np.frombuffer(payload, dtype="<u2", count=size, offset=4 * size).astype(np.uint16)
+    return indices, counts
+
+
+def vectors_from_rows(
+    rows: Sequence[Sequence[Any]],
+) -> tuple[list[FeatureVector], list[int]]:
+    """Vectors for rows of (version, payload, title, snippet, domain).
+
+    Returns the vectors and the positions that were recomputed because their
+    stored features were missing or from another featurizer version.
+    """
+    vectors: list[FeatureVector] = []
+    recomputed: list[int] = []
+    for position, (version, payload, title, snippet, domain) in enumerate(rows):
+        if version == FEATURIZER_VERSION and payload is not None:
+            vectors.append(decode_features(payload))
+        else:
+            vectors.append(featurize(title, snippet, domain))
+            recomputed.append(position)
+    return vectors, recomputed
+
+
+def feature_sql(connection: sqlite3.Connection) -> tuple[str, str]:
+    """(columns, join) fragments for a raw connection; NULL features on DBs predating the table."""
+    exists = connection.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'run_item_features'"
+    ).fetchone()
+    return (FEATURE_COLUMNS, FEATURE_JOIN) if exists else ("NULL, NULL", "")
+
+
+def supports_feature_matrix(model: Any) -> bool:
+    """Whether ``model`` consumes this store's matrices (``fit_features``/``predict_features``)."""
+    return (
+        getattr(model, "featurizer_version", None) == FEATURIZER_VERSION
+        and callable(getattr(model, "predict_features", None))
+        and callable(getattr(model, "fit_features", None))
+    )
+
+
+def _hashed_tokens(title: str | None, snippet: str | None, domain: str | None) -> np.ndarray:
+    indices = list(map(_TITLE_INDEX, _TOKEN.findall((title or "").lower())))
+    indices.extend(map(_SNIPPET_INDEX, _TOKEN.findall((snippet or "").lower())))
+    if domain:
+        indices.append(_DOMAIN_INDEX(domain.strip().lower()))
+    return np.array(indices, dtype=np.int64)
+
+
+def _token_index(token: str) -> int:
+    digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") % N_FEATURES
+
+
+def _field_indexer(prefix: str) -> Callable[[str], int]:
+    # One memo per field so cache hits skip building the prefixed token
+    @lru_cache(maxsize=262_144)
+    def index(word: str) -> int:
+        return _token_index(prefix + word)
+
+    return index
+
+
+_TITLE_INDEX = _field_indexer("t:")
+_SNIPPET_INDEX = _field_indexer("s:")
+_DOMAIN_INDEX = _field_indexer("d:")
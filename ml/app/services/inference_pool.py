@@ -0,0 +1,344 @@
+"""Out-of-process inference workers for model fit/predict calls.
+
+Each worker is a separate process that reads models.yaml once, loads each
+model on its first request and then serves requests over its own pipe, so heavy models
+never contend with ingestion or the API for the GIL. Predictions are split
+into batches and spread over idle workers; a fit runs on a copy of the
+worker's model, so concurrent jobs never see each other's weights. Requests
+name a model version; each worker resolves it through its own registry, whose
+trained-version cache memory-maps artifacts shared by every worker.
+
+The pool is opt-in: ``inferenceWorkers`` in ml-config.yaml sets the process
+count and 0 (the default) keeps every call in-process. ``run_predict`` and
+``run_fit_predict`` pick the pool when one is running and fall back to the
+caller's local model otherwise, which keeps scoring, evaluation and retrain
+unaware of where a model actually runs.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+import copy
+from dataclasses import dataclass
+import logging
+import multiprocessing
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from pathlib import Path
+import queue
+import threading
+from typing import Any, Sequence
+
+import numpy as np
+
+from app.services.feature_store import FeatureMatrix, supports_feature_matrix
+from app.services.ml_config import int_setting
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INFERENCE_WORKERS = 0
+MAX_INFERENCE_WORKERS = 16
+# Rows per request sent to one worker
+DEFAULT_BATCH_SIZE = 5_000
+MAX_BATCH_SIZE = 100_000
+_SHUTDOWN_SECONDS = 5.0
+
+
+class InferenceWorkerError(RuntimeError):
+    """A worker failed a request or exited while serving it."""
+
+
+class ModelNotLoadedError(InferenceWorkerError):
+    """The workers' registry has no model with the requested identifier."""
+
+
+@dataclass
+class _Worker:
+    process: BaseProcess
+    connection: Connection
+
+
+class InferencePool:
+    """Fixed set of inference processes, each holding its own loaded registry.
+
+    Example:
+        pool = InferencePool(2, config_path="config/ml/models.yaml")
+        scores = pool.predict("hashed_logistic", matrix, use_features=True)
+        pool.close()
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        *,
+        config_path: Path | str | None = None,
+        artifact_dir: Path | str | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> None:
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        # Spawned, not forked: the API process runs threads that a fork would copy mid-flight
+        self._context = multiprocessing.get_context("spawn")
+        self._config_path = str(config_path) if config_path is not None else None
+        self._artifact_dir = str(artifact_dir) if artifact_dir is not None else None
+        self._batch_size = max(1, min(MAX_BATCH_SIZE, int(batch_size)))
+        self._idle: queue.Queue[_Worker] = queue.Queue()
+        self._workers = [self._spawn(index) for index in range(workers)]
+        for worker in self._workers:
+            self._idle.put(worker)
+        self._dispatch = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="inference-dispatch")
+        self._closed = False
+        logger.info("inference_pool.started workers=%d batch_size=%d", workers, self._batch_size)
+
+    @property
+    def size(self) -> int:
+        return len(self._workers)
+
+    def predict(self, model_id: str, X: Any, *, use_features: bool, version: str | None = None) -> list[float]:
+        """Predictions for ``X`` from the workers' ``model_id`` (at ``version``), batches served in parallel."""
+        batches = _split(X, self._batch_size)
+        if len(batches) == 1:
+            return self._call("predict", model_id, version, batches[0], use_features)
+        results = self._dispatch.map(
+            lambda batch: self._call("predict", model_id, version, batch, use_features), batches
+        )
+        return [value for result in results for value in result]
+
+    def fit_predict(
+        self,
+        model_id: str,
+        X: Any,
+        y: Sequence[Any],
+        *,
+        use_features: bool,
+        return_model: bool = False,
+        version: str | None = None,
+    ) -> tuple[list[float], Any | None]:
+        """Fit a copy of ``model_id`` (at ``version``) on (X, y) in one worker and predict X with it.
+
+        Returns the predictions and, with ``return_model``, the fitted copy.
+        """
+        return self._call("fit_predict", model_id, version, X, list(y), use_features, return_model)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._dispatch.shutdown(wait=True)
+        for worker in self._workers:
+            try:
+                worker.connection.send(None)
+            except (OSError, ValueError):
+                pass
+        for worker in self._workers:
+            worker.process.join(timeout=_SHUTDOWN_SECONDS)
+            if worker.process.is_alive():
+                worker.process.terminate()
+            worker.connection.close()
+        logger.info("inference_pool.stopped workers=%d", len(self._workers))
+
+    def _call(self, op: str, *args: Any) -> Any:
+        if self._closed:
+            raise InferenceWorkerError("Inference pool is closed")
+        worker = self._idle.get()
+        try:
+            return self._exchange(worker, (op, args))
+        except InferenceWorkerError:
+            if not worker.process.is_alive():
+                worker = self._replace(worker)
+            raise
+        finally:
+            self._idle.put(worker)
+
+    def _exchange(self, worker: _Worker, message: tuple[str, tuple[Any, ...]]) -> Any:
+        try:
+            worker.connection.send(message)
+            status, value = worker.connection.recv()
+        except (EOFError, OSError) as exc:
+            raise InferenceWorkerError(f"Inference worker {worker.process.name} exited: {exc}") from exc
+        if status == "missing":
+            raise ModelNotLoadedError(value)
+        if status != "ok":
+            raise InferenceWorkerError(value)
+        return value
+
+    def _spawn(self, index: int) -> _Worker:
+        parent, child = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(child, self._config_path, self._artifact_dir),
+            name=f"inference-worker-{index}",
+            daemon=True,
+        )
+        process.start()
+        child.close()
+        return _Worker(process=process, connection=parent)
+
+    def _replace(self, worker: _Worker) -> _Worker:
+        index = self._workers.index(worker)
+        worker.connection.close()
+        if worker.process.is_alive():
+            worker.process.terminate()
+        replacement = self._spawn(index)
+        self._workers[index] = replacement
+        logger.warning("inference_pool.worker_restarted worker=%s", replacement.process.name)
+        return replacement
+
+
+_pool: InferencePool | None = None
+_pool_lock = threading.Lock()
+
+
+def start_inference_pool(
+    config_path: Path | str | None = None,
+    artifact_dir: Path | str | None = None,
+) -> InferencePool | None:
+    """Start the shared pool with ``inferenceWorkers`` processes; None when that is 0."""
+    global _pool
+    workers = int_setting(
+        "inferenceWorkers", DEFAULT_INFERENCE_WORKERS, minimum=0, maximum=MAX_INFERENCE_WORKERS
+    )
+    with _pool_lock:
+        if _pool is not None or workers == 0:
+            return _pool
+        batch_size = int_setting("inferenceBatchSize", DEFAULT_BATCH_SIZE, minimum=1, maximum=MAX_BATCH_SIZE)
+        _pool = InferencePool(workers, config_path=config_path, artifact_dir=artifact_dir, batch_size=batch_size)
+        return _pool
+
+
+def get_inference_pool() -> InferencePool | None:
+    return _pool
+
+
+def set_inference_pool(pool: InferencePool | None) -> None:
+    global _pool
+    with _pool_lock:
+        _pool = pool
+
+
+def shutdown_inference_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
+
+
+def run_predict(
+    model_id: str | None,
+    model: Any,
+    X: Any,
+    *,
+    use_features: bool,
+    version: str | None = None,
+) -> list[float]:
+    """Predict through the pool when it serves ``model_id``, else with the local ``model``.
+
+    ``model`` must be the caller's instance for ``version``; workers resolve
+    the same version from their own registry.
+    """
+    pool = get_inference_pool()
+    if pool is not None and model_id:
+        try:
+            return pool.predict(model_id, X, use_features=use_features, version=version)
+        except ModelNotLoadedError:
+            logger.debug("inference_pool.local_fallback model=%s", model_id)
+    return list(_predict(model, X, use_features))
+
+
+def run_fit_predict(
+    model_id: str | None,
+    model: Any,
+    X: Any,
+    y: Sequence[Any],
+    *,
+    use_features: bool,
+    return_model: bool = False,
+    version: str | None = None,
+) -> tuple[list[float], Any | None]:
+    """Fit a copy of the model, then predict ``X`` with it; through the pool when it serves ``model_id``.
+
+    The caller's ``model`` is never modified (it may be a cached version);
+    the fitted copy is returned with ``return_model``.
+    """
+    pool = get_inference_pool()
+    if pool is not None and model_id:
+        try:
+            return pool.fit_predict(
+                model_id, X, y, use_features=use_features, return_model=return_model, version=version
+            )
+        except ModelNotLoadedError:
+            logger.debug("inference_pool.local_fallback model=%s", model_id)
+    fitted = copy.deepcopy(model)
+    _fit(fitted, X, y, use_features)
+    return list(_predict(fitted, X, use_features)), fitted if return_model else None
+
+
+def _predict(model: Any, X: Any, use_features: bool) -> Any:
+    if use_features and supports_feature_matrix(model):
+        return model.predict_features(X)
+    return model.predict(X)
+
+
+def _fit(model: Any, X: Any, y: Sequence[Any], use_features: bool) -> None:
+    if use_features and supports_feature_matrix(model):
+        model.fit_features(X, y)
+    else:
+        model.fit(X, y)
+
+
+def _split(X: Any, batch_size: int) -> list[Any]:
+    if len(X) <= batch_size:
+        return [X]
+    if isinstance(X, FeatureMatrix):
+        return [X.take(np.arange(start, min(start + batch_size, len(X)))) for start in range(0, len(X), batch_size)]
+    rows = list(X)
+    return [rows[start : start + batch_size] for start in range(0, len(rows), batch_size)]
+
+
+def _worker_main(connection: Connection, config_path: str | None, artifact_dir: str | None) -> None:
+    # Imported here so the parent never pays for a second registry
+    from app.registry.model_registry import ModelRegistry
+    from app.registry.registry_watcher import RegistryWatcher
+
+    # Each worker keeps its own version LRU; artifact arrays are mmapped, so their pages are shared
+    registry = ModelRegistry(artifact_dir=artifact_dir)
+    registry.load_from_config(config_path)
+    if config_path is not None:
+        # Workers follow models.yaml and artifact changes like the API process does
+        RegistryWatcher(registry, config_path).start()
+
+    def resolve(model_id: str, version: str | None) -> Any:
+        model = registry.get_model_version(model_id, version)
+        if model is None:
+            raise ModelNotLoadedError(f"Model '{model_id}' version '{version}' is not loaded in the inference workers")
+        return model
+
+    while True:
+        try:
+            message = connection.recv()
+        except (EOFError, OSError):
+            return
+        if message is None:
+            return
+        op, args = message
+        try:
+            if op == "predict":
+                model_id, version, X, use_features = args
+                reply: tuple[str, Any] = ("ok", list(_predict(resolve(model_id, version), X, use_features)))
+            elif op == "fit_predict":
+                model_id, version, X, y, use_features, return_model = args
+                model = copy.deepcopy(resolve(model_id, version))
+                _fit(model, X, y, use_features)
+                reply = ("ok", (list(_predict(model, X, use_features)), model if return_model else None))
+            else:
+                reply = ("error", f"Unknown inference op '{op}'")
+        except ModelNotLoadedError as exc:
+            reply = ("missing", str(exc))
+        except Exception as exc:
+            reply = ("error", f"{type(exc).__name__}: {exc}")
+        try:
+            connection.send(reply)
+        except (OSError, ValueError):
+            return
@@ -1,7 +1,34 @@
+"""Classification and ranking metrics over NumPy arrays.
+
+Fixed-threshold metrics (precision, recall, f1, accuracy) come from four
+vectorized counts. Ranking metrics come from one stable sort of the scores:
+cumulative hits at each distinct score give the confusion counts for every
+threshold at once, from which the ROC and precision-recall curves, their
+areas and precision@k follow without another pass. ``ranking_summary``
+packs these, plus calibration bins, into a small JSON-able dict with
+downsampled curves, stored alongside each evaluation result.
+
+Scores are relevance scores in [-1, 1], the scale run items are stored on
+(``HashedLogisticModel.predict`` returns ``2p - 1``). A row is predicted
+relevant when its score is positive, the rule labels are derived by.
+``score_probabilities`` maps scores to [0, 1] with ``(s + 1) / 2``; calibration
+bins and PR-curve thresholds are reported on that scale, where the fixed
+cut-off of ``predicted_labels`` is 0.5.
+"""
+
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Iterable
+from typing import Any, Iterable, Sequence
+
+import numpy as np
+
+
+DEFAULT_PRECISION_AT = (10, 50, 100)
+DEFAULT_CALIBRATION_BINS = 10
+# Points kept per stored curve; curves are downsampled along their length
+DEFAULT_CURVE_POINTS = 64
+_DECIMALS = 4
 
 
 @dataclass(frozen=True)
@@ -12,36 +39,79 @@ class ClassificationCounts:
     false_negative: int
 
 
+@dataclass(frozen=True)
+class ThresholdCounts:
+    """Confusion counts at every distinct score, highest score first.
+
+    At ``thresholds[i]`` the rows scoring ``>= thresholds[i]`` are predicted
+    positive; ``ranked_hits[k - 1]`` is the number of positives in the top k.
+    """
+
+    thresholds: np.ndarray
+    true_positive: np.ndarray
+    false_positive: np.ndarray
+    positives: int
+    negatives: int
+    ranked_hits: np.ndarray
+
+    def roc_curve(self) -> tuple[np.ndarray, np.ndarray]:
+        """(false positive rate, true positive rate), starting at (0, 0)."""
+        fpr = np.concatenate([[0.0], self.false_positive / max(self.negatives, 1)])
+        tpr = np.concatenate([[0.0], self.true_positive / max(self.positives, 1)])
+        return fpr, tpr
+
+    def pr_curve(self) -> tuple[np.ndarray, np.ndarray]:
+        """(recall, precision) at each threshold."""
+        precision = self.true_positive / np.maximum(self.true_positive + self.false_positive, 1)
+        return self.true_positive / max(self.positives, 1), precision
+
+    def roc_auc(self) -> float | None:
+        if not self.positives or not self.negatives:
+            return None
+        fpr, tpr = self.roc_curve()
+        return float(np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1]) / 2.0))
+
+    def average_precision(self) -> float | None:
+        """Precision at each threshold weighted by the recall it adds."""
+        if not self.positives:
+            return None
+        recall, precision = self.pr_curve()
+        return float(np.sum(np.diff(np.concatenate([[0.0], recall])) * precision))
+
+    def precision_at(self, k: int) -> float | None:
+        """Share of positives among the ``k`` highest-scored rows (ties in input order)."""
+        if k < 1 or k > self.ranked_hits.size:
+            return None
+        return float(self.ranked_hits[k - 1] / k)
+
+
 def calculate_classification_counts(y_true: Iterable[int], y_pred: Iterable[int]) -> ClassificationCounts:
-    true_values = [int(value) for value in y_true]
-    pred_values = [int(value) for value in y_pred]
-    if len(true_values) != len(pred_values):
+    true_values = _binary_array(y_true)
+    pred_values = _binary_array(y_pred)
+    if true_values.size != pred_values.size:
         raise ValueError("y_true and y_pred must have equal length")
 
-    tp = 0
-    tn = 0
-    fp = 0
-    fn = 0
-    for actual, predicted in zip(true_values, pred_values, strict=True):
-        if actual not in (0, 1) or predicted not in (0, 1):
-            raise ValueError("classification inputs must be binary values 0 or 1")
-        if actual == 1 and predicted == 1:
-            tp += 1
-        elif actual == 0 and predicted == 0:
-            tn += 1
-        elif actual == 0 and predicted == 1:
-            fp += 1
-        else:
-            fn += 1
-
+    tp = int(np.count_nonzero(true_values & pred_values))
+    fp = int(np.count_nonzero(pred_values)) - tp
+    fn = int(np.count_nonzero(true_values)) - tp
     return ClassificationCounts(
         true_positive=tp,
-        true_negative=tn,
+        true_negative=int(true_values.size) - tp - fp - fn,
         false_positive=fp,
         false_negative=fn,
     )
 
 
+def score_probabilities(scores: Iterable[float]) -> np.ndarray:
+    """Relevance scores in [-1, 1] as probabilities in [0, 1]: ``(s + 1) / 2``, clipped."""
+    return np.clip((_score_array(scores) + 1.0) / 2.0, 0.0, 1.0)
+
+
+def predicted_labels(scores: Iterable[float]) -> np.ndarray:
+    """1 where the relevance score is positive (probability above 0.5), else 0."""
+    return (_score_array(scores) > 0).astype(np.int8)
+
+
 def calculate_metrics(y_true: Iterable[int], y_pred: Iterable[int]) -> dict[str, float]:
     counts = calculate_classification_counts(y_true, y_pred)
     total = counts.true_positive + counts.true_negative + counts.false_positive + counts.false_negative
@@ -60,3 +130,105 @@ def calculate_metrics(y_true: Iterable[int], y_pred: Iterable[int]) -> dict[str,
         "f1": f1,
         "accuracy": accuracy,
     }
+
+
+def threshold_counts(y_true: Iterable[int], scores: Iterable[float]) -> ThresholdCounts:
+    """Confusion counts for every threshold from one sort of ``scores``."""
+    labels = _binary_array(y_true)
+    values = _score_array(scores)
+    if labels.size != values.size:
+        raise ValueError("y_true and scores must have equal length")
+    # Stable, so equal scores keep their input order for precision@k
+    order = np.argsort(-values, kind="stable")
+    ranked_values = values[order]
+    ranked_hits = np.cumsum(labels[order], dtype=np.int64)
+    # Last rank of each run of equal scores
+    ends = np.flatnonzero(np.diff(ranked_values, append=np.inf))
+    true_positive = ranked_hits[ends]
+    positives = int(ranked_hits[-1]) if values.size else 0
+    return ThresholdCounts(
+        thresholds=ranked_values[ends],
+        true_positive=true_positive,
+        false_positive=ends + 1 - true_positive,
+        positives=positives,
+        negatives=int(values.size) - positives,
+        ranked_hits=ranked_hits,
+    )
+
+
+def calibration_bins(
+    y_true: Iterable[int],
+    scores: Iterable[float],
+    *,
+    bins: int = DEFAULT_CALIBRATION_BINS,
+) -> dict[str, list[float] | list[int]]:
+    """Row count, mean probability and observed positive rate in equal-width probability bins over [0, 1]."""
+    labels = _binary_array(y_true)
+    values = score_probabilities(scores)
+    if labels.size != values.size:
+        raise ValueError("y_true and scores must have equal length")
+    index = np.minimum((values * bins).astype(np.int64), bins - 1)
+    count = np.bincount(index, minlength=bins)
+    occupied = np.maximum(count, 1)
+    return {
+        "count": count.tolist(),
+        "meanScore": _rounded(np.bincount(index, weights=values, minlength=bins) / occupied),
+        "positiveRate": _rounded(np.bincount(index, weights=labels, minlength=bins) / occupied),
+    }
+
+
+def ranking_summary(
+    y_true: Iterable[int],
+    scores: Iterable[float],
+    *,
+    precision_at: Sequence[int] = DEFAULT_PRECISION_AT,
+    bins: int = DEFAULT_CALIBRATION_BINS,
+    curve_points: int = DEFAULT_CURVE_POINTS,
+) -> dict[str, Any]:
+    """Areas, precision@k, downsampled ROC/PR curves and calibration bins as a JSON-able dict.
+
+    PR thresholds and calibration bins are on the ``score_probabilities`` scale.
+    """
+    labels = _binary_array(y_true)
+    values = _score_array(scores)
+    counts = threshold_counts(labels, values)
+    fpr, tpr = counts.roc_curve()
+    recall, precision = counts.pr_curve()
+    roc_points = _curve_sample(fpr.size, curve_points)
+    pr_points = _curve_sample(recall.size, curve_points)
+    return {
+        "rows": int(labels.size),
+        "positives": counts.positives,
+        "rocAuc": counts.roc_auc(),
+        "averagePrecision": counts.average_precision(),
+        "precisionAt": {str(k): counts.precision_at(k) for k in precision_at if k <= labels.size},
+        "roc": {"fpr": _rounded(fpr[roc_points]), "tpr": _rounded(tpr[roc_points])},
+        "pr": {
+            "recall": _rounded(recall[pr_points]),
+            "precision": _rounded(precision[pr_points]),
+            "threshold": _rounded(score_probabilities(counts.thresholds[pr_points])),
+        },
+        "calibration": calibration_bins(labels, values, bins=bins),
+    }
+
+
+def _binary_array(values: Iterable[Any]) -> np.ndarray:
+    array = np.asarray(values if isinstance(values, np.ndarray) else list(values))
+    if array.size and not (array.dtype.kind in "biuf" and np.isin(array, (0, 1)).all()):
+        raise ValueError("classification inputs must be binary values 0 or 1")
+    return array.reshape(-1).astype(np.int64)
+
+
+def _score_array(scores: Iterable[float]) -> np.ndarray:
+    return np.asarray(scores if isinstance(scores, np.ndarray) else list(scores), dtype=np.float64).reshape(-1)
+
+
+def _curve_sample(length: int, points: int) -> np.ndarray:
+    """Evenly spaced indices along a curve, always keeping both ends."""
+    if length <= points:
+        return np.arange(length)
+    return np.unique(np.linspace(0, length - 1, points).round().astype(np.int64))
+
+
+def _rounded(values: np.ndarray) -> list[float]:
+    return np.round(values.astype(np.float64), _DECIMALS).tolist()
@@ -0,0 +1,141 @@
+"""MinHash signatures and LSH banding for near-duplicate candidate search."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from functools import lru_cache
+import hashlib
+from typing import Hashable, Iterable
+
+import numpy as np
+
+
+DEFAULT_SHINGLE_SIZE = 3
+DEFAULT_NUM_PERM = 128
+# Probability that a pair exactly at the similarity threshold becomes a candidate
+DEFAULT_TARGET_RECALL = 0.999
+_SEED = 0x5EED_D0C5
+
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_SHIFT_30 = np.uint64(30)
+_SHIFT_27 = np.uint64(27)
+_SHIFT_31 = np.uint64(31)
+
+
+def shingle_hashes(text: str, n: int = DEFAULT_SHINGLE_SIZE) -> np.ndarray:
+    """Sorted unique 64-bit hashes of the word n-grams of ``text``.
+
+    Tokenisation matches the dedupe pipeline (lowercase, whitespace split);
+    hashes are stable across processes so they can be persisted.
+    """
+    words = text.lower().split()
+    if len(words) < n:
+        return np.empty(0, dtype=np.uint64)
+    word_hashes = np.fromiter((_word_hash(word) for word in words), dtype=np.uint64, count=len(words))
+    combined = word_hashes[: len(words) - n + 1].copy()
+    with np.errstate(over="ignore"):
+        for offset in range(1, n):
+            combined = _mix(combined * _GOLDEN + word_hashes[offset : len(words) - n + 1 + offset])
+    return np.unique(combined)
+
+
+def encode_shingles(hashes: np.ndarray) -> bytes:
+    """Pack shingle hashes for storage (8 bytes per shingle, little-endian)."""
+    return hashes.astype("<u8", copy=False).tobytes()
+
+
+def decode_shingles(payload: bytes) -> np.ndarray:
+    return np.frombuffer(payload, dtype="<u8").astype(np.uint64)
+
+
+def jaccard(left: np.ndarray, right: np.ndarray) -> float:
+    """Exact Jaccard similarity of two sorted unique hash arrays."""
+    if left.size == 0 and right.size == 0:
+        return 1.0
+    if left.size == 0 or right.size == 0:
+        return 0.0
+    intersection = np.intersect1d(left, right, assume_unique=True).size
+    return intersection / (left.size + right.size - intersection)
+
+
+def candidate_probability(similarity: float, bands: int, rows: int) -> float:
+    """Chance that two sets with this Jaccard similarity share at least one band."""
+    return 1.0 - (1.0 - similarity**rows) ** bands
+
+
+def optimal_bands(
+    threshold: float,
+    num_perm: int = DEFAULT_NUM_PERM,
+    target_recall: float = DEFAULT_TARGET_RECALL,
+) -> int:
+    """Fewest bands (widest, most selective rows) that still reach ``target_recall`` at ``threshold``."""
+    for bands in sorted(b for b in range(1, num_perm + 1) if num_perm % b == 0):
+        if candidate_probability(threshold, bands, num_perm // bands) >= target_recall:
+            return bands
+    return num_perm
+
+
+class MinHasher:
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM, *, seed: int = _SEED) -> None:
+        if num_perm < 1:
+            raise ValueError("num_perm must be positive")
+        self.num_perm = num_perm
+        rng = np.random.default_rng(seed)
+        self._salts = rng.integers(0, np.iinfo(np.uint64).max, size=(num_perm, 1), dtype=np.uint64, endpoint=True)
+
+    def signature(self, hashes: np.ndarray) -> np.ndarray | None:
+        """MinHash signature (``num_perm`` uint64 values), or None for an empty set."""
+        if hashes.size == 0:
+            return None
+        with np.errstate(over="ignore"):
+            permuted = _mix(hashes[np.newaxis, :] ^ self._salts)
+        return permuted.min(axis=1)
+
+
+class LshIndex:
+    """Band the signatures into buckets; keys sharing any bucket are candidates."""
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM, bands: int = 16) -> None:
+        if bands < 1 or num_perm % bands != 0:
+            raise ValueError(f"bands ({bands}) must divide num_perm ({num_perm})")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._buckets: dict[bytes, list[Hashable]] = defaultdict(list)
+
+    def band_keys(self, signature: np.ndarray) -> list[bytes]:
+        rows = self.rows
+        return [
+            band.to_bytes(2, "little") + signature[band * rows : (band + 1) * rows].tobytes()
+            for band in range(self.bands)
+        ]
+
+    def insert(self, key: Hashable, signature: np.ndarray) -> None:
+        for band_key in self.band_keys(signature):
+            self._buckets[band_key].append(key)
+
+    def query(self, signature: np.ndarray) -> set[Hashable]:
+        candidates: set[Hashable] = set()
+        for band_key in self.band_keys(signature):
+            bucket = self._buckets.get(band_key)
+            if bucket:
+                candidates.update(bucket)
+        return candidates
+
+    def insert_many(self, items: Iterable[tuple[Hashable, np.ndarray]]) -> None:
+        for key, signature in items:
+            self.insert(key, signature)
+
+
+@lru_cache(maxsize=65536)
+def _word_hash(word: str) -> int:
+    return int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _mix(values: np.ndarray) -> np.ndarray:
+    # splitmix64 finaliser
+    values = (values ^ (values >> _SHIFT_30)) * _MIX_1
+    values = (values ^ (values >> _SHIFT_27)) * _MIX_2
+    return values ^ (values >> _SHIFT_31)
@@ -0,0 +1,33 @@
+"""Optional tuning settings from ``<CONFIG_DIR>/ml/ml-config.yaml``."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+
+def ml_config_path(config_dir: Path | None = None) -> Path:
+    return Path(config_dir or os.getenv("CONFIG_DIR", "config")) / "ml" / "ml-config.yaml"
+
+
+def load_ml_config(config_dir: Path | None = None) -> dict[str, Any]:
+    """The parsed settings mapping; empty when the file is missing or unreadable."""
+    config_path = ml_config_path(config_dir)
+    if not config_path.exists():
+        return {}
+    try:
+        payload = yaml.safe_load(config_path.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    return payload if isinstance(payload, dict) else {}
+
+
+def int_setting(key: str, default: int, *, minimum: int, maximum: int, config_dir: Path | None = None) -> int:
+    """Integer setting clamped to ``[minimum, maximum]``; ``default`` when absent or not an int."""
+    value = load_ml_config(config_dir).get(key, default)
+    if isinstance(value, bool) or not isinstance(value, int):
+        value = default
+    return max(minimum, min(maximum, value))
@@ -4,6 +4,7 @@ from dataclasses import dataclass
 from typing import Any
 
 from app.registry.model_registry import ModelRegistry
+from app.services.active_model_cache import invalidate_active_model
 from app.services.evaluation_store import ActiveModelRow, EvaluationStore
 
 
@@ -49,6 +50,7 @@ class ModelActivationService:
             reason=reason,
             evaluation_id=latest_result.evaluation_id,
         )
+        invalidate_active_model()
         return _to_activated_model(row)
 
     def rollback_model(
@@ -74,6 +76,7 @@ class ModelActivationService:
             reason=reason,
             evaluation_id=target.evaluation_id,
         )
+        invalidate_active_model()
         return _to_activated_model(row)
 
     def get_active_model(self) -> ActivatedModel | None:
@@ -0,0 +1,205 @@
+"""Pickle-free model artifacts: a JSON header plus one ``.npy`` file per array.
+
+An artifact is a directory ``<model_id>_<version>/`` holding ``artifact.json``
+(identity, metrics, featurizer version, the model class and its scalar
+attributes) and the model's NumPy attributes as ``.npy`` files. Validation
+reads only the header; loading memory-maps the arrays copy-on-write, so it
+takes milliseconds regardless of weight size, and processes that load the
+same artifact share its pages until one of them writes.
+
+A model is saved from its instance attributes: arrays go to ``.npy`` files and
+everything else must be JSON-serialisable. Loading imports the class recorded
+in the header and restores the attributes without calling ``__init__``. The
+header is data, so only classes defined under ``MODEL_PACKAGES`` are imported;
+any other ``modelClass`` is rejected before its module is touched.
+
+Retrains before this format wrote ``<model_id>_<version>.pkl``. Those files
+are never unpickled: the registry recognises them by name and serves their
+version with the configured model, as it did when they were written.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import importlib
+import json
+from pathlib import Path
+import shutil
+from typing import Any
+
+import numpy as np
+
+
+ARTIFACT_FORMAT = "jobato-model-artifact"
+ARTIFACT_FORMAT_VERSION = 1
+HEADER_NAME = "artifact.json"
+DEFAULT_ARTIFACT_DIR = Path("ml/app/models/trained")
+# Packages whose classes an artifact may name
+MODEL_PACKAGES = ("app.models",)
+LEGACY_ARTIFACT_SUFFIX = ".pkl"
+
+
+class ArtifactError(ValueError):
+    """An artifact cannot be written, or its header or files are invalid."""
+
+
+@dataclass(frozen=True)
+class ArtifactHeader:
+    model_id: str
+    model_version: str
+    trained_at: str
+    metrics: dict[str, float]
+    featurizer_version: str | None
+    model_class: str
+    params: dict[str, Any]
+    arrays: dict[str, dict[str, Any]]
+
+
+def artifact_path(artifact_dir: Path, model_id: str, model_version: str) -> Path:
+    return artifact_dir / f"{model_id}_{model_version}"
+
+
+def legacy_artifact_path(artifact_dir: Path, model_id: str, model_version: str) -> Path:
+    """Where retrain pickled ``model_version`` before the artifact format existed."""
+    return artifact_dir / f"{model_id}_{model_version}{LEGACY_ARTIFACT_SUFFIX}"
+
+
+def write_artifact(
+    artifact_dir: Path,
+    *,
+    model_id: str,
+    model_version: str,
+    model: Any,
+    metrics: dict[str, float],
+    trained_at: str | None = None,
+) -> Path:
+    """Write ``model`` as an artifact directory and return its path.
+
+    The directory is assembled under a temporary name and renamed into place,
+    so readers never see a partial artifact.
+    """
+    params, arrays = _model_state(model)
+    target = artifact_path(artifact_dir, model_id, model_version)
+    staging = target.with_name(f".{target.name}.tmp")
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+    try:
+        array_entries: dict[str, dict[str, Any]] = {}
+        for name, value in arrays.items():
+            file_name = f"{name}.npy"
+            np.save(staging / file_name, np.ascontiguousarray(value), allow_pickle=False)
+            array_entries[name] = {"file": file_name, "dtype": value.dtype.str, "shape": list(value.shape)}
+        header = {
+            "format": ARTIFACT_FORMAT,
+            "formatVersion": ARTIFACT_FORMAT_VERSION,
+            "modelId": model_id,
+            "modelVersion": model_version,
+            "trainedAt": trained_at or _timestamp_now(),
+            "metrics": metrics,
+            "featurizerVersion": getattr(model, "featurizer_version", None),
+            "modelClass": f"{type(model).__module__}:{type(model).__qualname__}",
+            "params": params,
+            "arrays": array_entries,
+        }
+        (staging / HEADER_NAME).write_text(json.dumps(header, indent=2, sort_keys=True), encoding="utf-8")
+        shutil.rmtree(target, ignore_errors=True)
+        staging.replace(target)
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return target
+
+
+def read_header(path: Path) -> ArtifactHeader:
+    """Parse and check an artifact's header without touching its arrays."""
+    try:
+        payload = json.loads((path / HEADER_NAME).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError) as exc:
+        raise ArtifactError(f"Unreadable artifact header in {path}: {exc}") from exc
+    if payload.get("format") != ARTIFACT_FORMAT:
+        raise ArtifactError(f"{path} is not a model artifact")
+    if payload.get("formatVersion") != ARTIFACT_FORMAT_VERSION:
+        raise ArtifactError(f"Unsupported artifact format version {payload.get('formatVersion')!r} in {path}")
+    try:
+        return ArtifactHeader(
+            model_id=str(payload["modelId"]),
+            model_version=str(payload["modelVersion"]),
+            trained_at=str(payload["trainedAt"]),
+            metrics=dict(payload.get("metrics") or {}),
+            featurizer_version=payload.get("featurizerVersion"),
+            model_class=str(payload["modelClass"]),
+            params=dict(payload.get("params") or {}),
+            arrays=dict(payload.get("arrays") or {}),
+        )
+    except KeyError as exc:
+        raise ArtifactError(f"Artifact header in {path} is missing {exc}") from exc
+
+
+def validate_artifact(path: Path, *, expected_version: str) -> ArtifactHeader:
+    """Header-only check that the artifact is complete and has ``expected_version``."""
+    header = read_header(path)
+    if header.model_version != expected_version:
+        raise ArtifactError("Saved retrain artifact version mismatch")
+    missing = [entry["file"] for entry in header.arrays.values() if not (path / entry["file"]).is_file()]
+    if missing:
+        raise ArtifactError(f"Artifact {path.name} is missing array files: {', '.join(missing)}")
+    return header
+
+
+def load_artifact(path: Path, *, mmap: bool = True) -> tuple[ArtifactHeader, Any]:
+    """Header and reconstructed model; arrays are memory-mapped copy-on-write unless ``mmap`` is False."""
+    header = read_header(path)
+    module_path, class_name = _check_model_class(header.model_class, path)
+    try:
+        model_class = getattr(importlib.import_module(module_path), class_name)
+    except (ImportError, AttributeError) as exc:
+        raise ArtifactError(f"Model class '{header.model_class}' of {path.name} is not importable: {exc}") from exc
+    # Names re-exported into a model module (``Path``, ``np``) are not models
+    if not isinstance(model_class, type) or model_class.__module__ != module_path:
+        raise ArtifactError(f"Model class '{header.model_class}' of {path.name} is not defined in {module_path}")
+    model = model_class.__new__(model_class)
+    model.__dict__.update(header.params)
+    for name, entry in header.arrays.items():
+        value = np.load(path / entry["file"], mmap_mode="c" if mmap else None, allow_pickle=False)
+        if value.dtype.str != entry["dtype"] or list(value.shape) != entry["shape"]:
+            raise ArtifactError(f"Array '{name}' of {path.name} does not match its header")
+        setattr(model, name, value)
+    return header, model
+
+
+def _check_model_class(model_class: str, path: Path) -> tuple[str, str]:
+    """Split ``module:Class`` and check the module lies under ``MODEL_PACKAGES``."""
+    module_path, _, class_name = model_class.partition(":")
+    allowed = any(module_path == package or module_path.startswith(f"{package}.") for package in MODEL_PACKAGES)
+    if not allowed or not class_name.isidentifier():
+        raise ArtifactError(
+            f"Model class '{model_class}' of {path.name} is outside the model packages ({', '.join(MODEL_PACKAGES)})"
+        )
+    return module_path, class_name
+
+
+def _model_state(model: Any) -> tuple[dict[str, Any], dict[str, np.ndarray]]:
+    params: dict[str, Any] = {}
+    arrays: dict[str, np.ndarray] = {}
+    for name, value in vars(model).items():
+        if isinstance(value, np.ndarray):
+            if value.dtype.hasobject:
+                raise ArtifactError(f"Array attribute '{name}' holds Python objects")
+            arrays[name] = value
+            continue
+        if isinstance(value, np.generic):
+            value = value.item()
+        try:
+            json.dumps(value)
+        except (TypeError, ValueError) as exc:
+            raise ArtifactError(
+                f"Attribute '{name}' of {type(model).__name__} is neither an array nor JSON-serialisable"
+            ) from exc
+        params[name] = value
+    return params, arrays
+
+
+def _timestamp_now() -> str:
+    value = datetime.now(timezone.utc).replace(microsecond=0)
+    return value.isoformat().replace("+00:00", "Z")
@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+import logging
+import shutil
+import sqlite3
+from pathlib import Path
+from typing import Any, Iterable, Sequence
+from urllib.parse import quote, unquote
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from app.db.page_text import decode_page_text
+from app.services.feature_store import feature_sql
+
+
+logger = logging.getLogger(__name__)
+
+# Partitions live at <data_dir>/exports/run_items/date=YYYY-MM-DD/run_id=<id>/part-0.parquet
+EXPORT_DIR = Path("exports") / "run_items"
+PART_FILE = "part-0.parquet"
+_BATCH_SIZE = 5_000
+_COMPRESSION = "zstd"
+_BOOLEAN_COLUMNS = frozenset({"is_duplicate", "is_hidden"})
+
+EXPORT_SCHEMA = pa.schema(
+    [
+        ("id", pa.int64()),
+        ("run_id", pa.string()),
+        ("query_id", pa.string()),
+        ("query_text", pa.string()),
+        ("search_query", pa.string()),
+        ("domain", pa.string()),
+        ("title", pa.string()),
+        ("snippet", pa.string()),
+        ("raw_url", pa.string()),
+        ("final_url", pa.string()),
+        ("normalized_url", pa.string()),
+        ("created_at", pa.string()),
+        ("last_seen_at", pa.string()),
+        ("canonical_id", pa.int64()),
+        ("is_duplicate", pa.bool_()),
+        ("is_hidden", pa.bool_()),
+        ("duplicate_count", pa.int32()),
+        ("relevance_score", pa.float64()),
+        ("scored_at", pa.string()),
+        ("score_version", pa.string()),
+        ("visible_text", pa.string()),
+        # Stored feature-store vectors; null in partitions written before they existed
+        ("feature_version", pa.string()),
+        ("features", pa.binary()),
+    ]
+)
+FEATURE_SOURCE_COLUMNS = ("feature_version", "features", "title", "snippet", "domain")
+_JOINED_COLUMNS = frozenset({"visible_text", "feature_version", "features"})
+_SQL_COLUMNS = [f"ri.{name}" for name in EXPORT_SCHEMA.names if name not in _JOINED_COLUMNS]
+LABELED_ROWS_SQL = "ri.relevance_score IS NOT NULL AND (ri.is_duplicate = 0 OR ri.is_duplicate IS NULL)"
+# Per-row fingerprint term of (id, label), squared modulo a prime so that
+# opposite label flips do not cancel out in the sum; all products fit in int64
+_FINGERPRINT_MULTIPLIER = 2_654_435_761
+_FINGERPRINT_MODULUS = 2_147_483_647
+_FINGERPRINT_TERM_SQL = f"((ri.id * 2 + (ri.relevance_score > 0)) * {_FINGERPRINT_MULTIPLIER}) % {_FINGERPRINT_MODULUS}"
+
+# (rows, checksum, latest scored_at) of a run's labeled rows
+RunFingerprint = tuple[int, int, str | None]
+
+
+def export_root_for(data_dir: Path) -> Path:
+    return data_dir / EXPORT_DIR
+
+
+def has_exports(export_root: Path) -> bool:
+    return any(export_root.glob(f"date=*/run_id=*/{PART_FILE}"))
+
+
+def export_run(db_path: Path, run_id: str, export_root: Path) -> Path | None:
+    """Write one run's rows to its Parquet partition, replacing any earlier export.
+
+    Rows are streamed from SQLite in batches, so memory stays bounded by the
+    batch size rather than the run size. Returns None when the run has no rows.
+    """
+    with sqlite3.connect(f"file:{db_path}?mode=ro", uri=True) as connection:
+        first_created_at = connection.execute(
+            "SELECT MIN(created_at) FROM run_items WHERE run_id = ?", (run_id,)
+        ).fetchone()[0]
+        if first_created_at is None:
+            return None
+
+        partition_dir = export_root / f"date={str(first_created_at)[:10]}" / f"run_id={quote(run_id, safe='')}"
+        partition_dir.mkdir(parents=True, exist_ok=True)
+        target = partition_dir / PART_FILE
+        temp_path = partition_dir / f"{PART_FILE}.tmp"
+
+        feature_columns, feature_join = feature_sql(connection)
+        cursor = connection.execute(
+            f"""
+            SELECT {", ".join(_SQL_COLUMNS)}, t.codec, t.visible_text, {feature_columns}
+            FROM run_items ri
+            LEFT JOIN run_item_texts t ON t.item_id = ri.id
+            {feature_join}
+            WHERE ri.run_id = ?
+            ORDER BY ri.id
+            """,
+            (run_id,),
+        )
+        row_count = 0
+        with pq.ParquetWriter(temp_path, EXPORT_SCHEMA, compression=_COMPRESSION) as writer:
+            while True:
+                rows = cursor.fetchmany(_BATCH_SIZE)
+                if not rows:
+                    break
+                writer.write_batch(_to_record_batch(rows))
+                row_count += len(rows)
+
+    temp_path.replace(target)
+    _remove_stale_partitions(export_root, run_id, keep=partition_dir)
+    logger.info("export.run_written run_id=%s rows=%d path=%s", run_id, row_count, target)
+    return target
+
+
+def sync_exports(db_path: Path, export_root: Path) -> list[str]:
+    """Export every run in ``db_path`` that has no partition yet (backfills history)."""
+    exported = set(exported_run_ids(export_root))
+    with sqlite3.connect(f"file:{db_path}?mode=ro", uri=True) as connection:
+        run_ids = [str(row[0]) for row in connection.execute("SELECT DISTINCT run_id FROM run_items")]
+    written: list[str] = []
+    for run_id in run_ids:
+        if run_id in exported:
+            continue
+        if export_run(db_path, run_id, export_root) is not None:
+            written.append(run_id)
+    return written
+
+
+def exported_run_ids(export_root: Path) -> list[str]:
+    return sorted({run_id for run_id, _ in partition_files(export_root)})
+
+
+def current_partitions(connection: sqlite3.Connection, export_root: Path) -> dict[str, Path]:
+    """Partitions whose labeled rows still match their run in the DB, by run id.
+
+    Rows rescored, marked duplicate or added after a run was exported make
+    its partition stale; those runs (and runs never exported) are read from
+    the DB instead.
+    """
+    expected = run_fingerprints(connection)
+    return {
+        run_id: path
+        for run_id, path in partition_files(export_root)
+        if run_id in expected and partition_fingerprint(path) == expected[run_id]
+    }
+
+
+def run_fingerprints(connection: sqlite3.Connection) -> dict[str, RunFingerprint]:
+    """Fingerprint of every run's labeled rows, computed inside SQLite."""
+    rows = connection.execute(
+        f"""
+        SELECT run_id, COUNT(*), SUM(term * term % {_FINGERPRINT_MODULUS}), MAX(scored_at)
+        FROM (
+            SELECT ri.run_id, ri.scored_at, {_FINGERPRINT_TERM_SQL} AS term
+            FROM run_items ri
+            WHERE {LABELED_ROWS_SQL}
+        )
+        GROUP BY run_id
+        """
+    )
+    return {str(row[0]): (int(row[1]), int(row[2] or 0), row[3]) for row in rows}
+
+
+def rows_fingerprint(connection: sqlite3.Connection, *, max_id: int) -> tuple[int, int]:
+    """``label_fingerprint`` of the labeled rows with ``id <= max_id``, computed inside SQLite."""
+    count, checksum = connection.execute(
+        f"""
+        SELECT COUNT(*), SUM(term * term % {_FINGERPRINT_MODULUS})
+        FROM (
+            SELECT {_FINGERPRINT_TERM_SQL} AS term
+            FROM run_items ri
+            WHERE {LABELED_ROWS_SQL} AND ri.id <= ?
+        )
+        """,
+        (max_id,),
+    ).fetchone()
+    return int(count), int(checksum or 0)
+
+
+def partition_fingerprint(path: Path) -> RunFingerprint:
+    """The ``run_fingerprints`` value of the run as it was exported to ``path``."""
+    return table_fingerprint(load_partition(path, ["id", "relevance_score", "scored_at"], filter=labeled_rows_filter()))
+
+
+def table_fingerprint(table: pa.Table) -> RunFingerprint:
+    """Fingerprint of labeled rows with ``id``, ``relevance_score`` and ``scored_at`` columns."""
+    rows, checksum = label_fingerprint(
+        column_to_numpy(table, "id"), (column_to_numpy(table, "relevance_score") > 0).astype(np.int64)
+    )
+    return rows, checksum, pc.max(table.column("scored_at")).as_py()
+
+
+def label_fingerprint(ids: np.ndarray, labels: np.ndarray) -> tuple[int, int]:
+    """(rows, checksum) of (id, label) pairs, matching the fingerprint SQLite computes."""
+    terms = ((ids.astype(np.int64) * 2 + labels) * _FINGERPRINT_MULTIPLIER) % _FINGERPRINT_MODULUS
+    return int(ids.size), int((terms * terms % _FINGERPRINT_MODULUS).sum())
+
+
+def load_run_items(
+    export_root: Path,
+    columns: Sequence[str],
+    *,
+    run_ids: Iterable[str] | None = None,
+    filter: ds.Expression | None = None,
+) -> pa.Table:
+    """Read ``columns`` across run partitions as one Arrow table.
+
+    Only the requested columns are decoded; ``run_ids`` prunes partitions
+    before any file is opened.
+    """
+    wanted = None if run_ids is None else set(run_ids)
+    files = [str(path) for run_id, path in partition_files(export_root) if wanted is None or run_id in wanted]
+    if not files:
+        return EXPORT_SCHEMA.empty_table().select(list(columns))
+    dataset = ds.dataset(files, schema=EXPORT_SCHEMA, format="parquet")
+    return dataset.to_table(columns=list(columns), filter=filter)
+
+
+def load_partition(path: Path, columns: Sequence[str], *, filter: ds.Expression | None = None) -> pa.Table:
+    """Read ``columns`` of one partition file (as listed by ``partition_files``)."""
+    dataset = ds.dataset([str(path)], schema=EXPORT_SCHEMA, format="parquet")
+    return dataset.to_table(columns=list(columns), filter=filter)
+
+
+def labeled_rows_filter(*, scored_after: str | None = None) -> ds.Expression:
+    """Scored canonical rows, mirroring the SQL used for training labels."""
+    expression = pc.field("relevance_score").is_valid() & (
+        pc.field("is_duplicate").is_null() | (pc.field("is_duplicate") == False)  # noqa: E712
+    )
+    if scored_after is not None:
+        expression = expression & (pc.field("scored_at") > scored_after)
+    return expression
+
+
+def column_to_numpy(table: pa.Table, name: str) -> np.ndarray:
+    """Column as a NumPy array; zero-copy for single-chunk primitive columns without nulls."""
+    column = table.column(name)
+    if column.num_chunks == 1:
+        return column.chunk(0).to_numpy(zero_copy_only=False)
+    return column.to_numpy()
+
+
+def feature_dicts(table: pa.Table, columns: Sequence[str]) -> list[dict[str, str]]:
+    """Text columns as the list-of-dicts feature rows the model interface expects."""
+    values = [pc.fill_null(table.column(name), "").to_pylist() for name in columns]
+    return [dict(zip(columns, row)) for row in zip(*values)]
+
+
+def feature_source_rows(table: pa.Table) -> list[tuple[Any, ...]]:
+    """(feature_version, features, title, snippet, domain) rows for ``vectors_from_rows``."""
+    return list(zip(*(table.column(name).to_pylist() for name in FEATURE_SOURCE_COLUMNS)))
+
+
+def _to_record_batch(rows: list[tuple[Any, ...]]) -> pa.RecordBatch:
+    text_index = len(_SQL_COLUMNS)
+    arrays: list[pa.Array] = []
+    for index, field in enumerate(EXPORT_SCHEMA):
+        if field.name == "visible_text":
+            values = [decode_page_text(row[text_index], row[text_index + 1]) for row in rows]
+        elif field.name == "feature_version":
+            values = [row[text_index + 2] for row in rows]
+        elif field.name == "features":
+            values = [row[text_index + 3] for row in rows]
+        elif field.name in _BOOLEAN_COLUMNS:
+            values = [None if row[index] is None else bool(row[index]) for row in rows]
+        else:
+            values = [row[index] for row in rows]
+        arrays.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=EXPORT_SCHEMA)
+
+
+def partition_files(export_root: Path) -> list[tuple[str, Path]]:
+    """(run_id, path) of every partition file, in path order."""
+    files: list[tuple[str, Path]] = []
+    for path in sorted(export_root.glob(f"date=*/run_id=*/{PART_FILE}")):
+        files.append((unquote(path.parent.name.split("=", 1)[1]), path))
+    return files
+
+
+def _remove_stale_partitions(export_root: Path, run_id: str, *, keep: Path) -> None:
+    # A re-export can land in a different date partition; drop the old copy
+    for stale_run_id, path in partition_files(export_root):
+        if stale_run_id == run_id and path.parent != keep:
+            shutil.rmtree(path.parent, ignore_errors=True)
+            if not any(path.parent.parent.iterdir()):
+                path.parent.parent.rmdir()
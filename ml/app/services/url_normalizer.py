@@ -4,13 +4,17 @@ from __future__ import annotations
 
 import hashlib
 import logging
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable, Literal, overload
 from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
 
 
 logger = logging.getLogger(__name__)
 
 # Tracking parameters to strip from URLs
-_TRACKING_PARAMS = {
+_TRACKING_PARAMS = frozenset({
     # Google Analytics
     "utm_source",
     "utm_medium",
@@ -40,11 +44,28 @@ _TRACKING_PARAMS = {
     "cid",
     "mcid",
     "sourceid",
-}
+})
 
 # Default ports to remove
 _DEFAULT_PORTS = {"http": 80, "https": 443}
 
+# Distinct URLs remembered by the normalization memo
+_MEMO_SIZE = 65_536
+
+# scheme://host[/path] with no query, fragment, params, brackets or non-ASCII:
+# urlparse would only split it, so it is split here directly
+_SIMPLE_URL = re.compile(
+    r"(?P<scheme>[A-Za-z][A-Za-z0-9+.\-]*)://"
+    r"(?P<host>[A-Za-z0-9._~%!$&'()*+,=:@\-]+)"
+    r"(?P<path>/[A-Za-z0-9._~%!$&'()*+,=:@/\-]*)?"
+)
+
+
+@dataclass(frozen=True)
+class NormalizedUrl:
+    url: str
+    key: str
+
 
 def normalize_url(url: str) -> str | None:
     """Normalize a URL for stable dedupe key generation.
@@ -68,9 +89,65 @@ def normalize_url(url: str) -> str | None:
     if not url or not isinstance(url, str):
         logger.warning("url_normalization.empty_or_invalid url=%s", url)
         return None
+    normalized = _normalize_memoized(url)
+    return normalized.key if normalized is not None else None
+
+
+@overload
+def normalize_urls(urls: Iterable[str | None], *, with_url: Literal[False] = ...) -> list[str | None]: ...
+
+
+@overload
+def normalize_urls(urls: Iterable[str | None], *, with_url: Literal[True]) -> list[NormalizedUrl | None]: ...
+
+
+def normalize_urls(urls: Iterable[str | None], *, with_url: bool = False) -> list[str | None] | list[NormalizedUrl | None]:
+    """Normalize a batch of URLs, reusing results for URLs seen recently.
+
+    Args:
+        urls: URLs to normalize, in order
+        with_url: Return ``NormalizedUrl`` (normalized string and hash) instead of the hash
 
+    Returns:
+        One entry per input, None where the URL is empty or malformed.
+
+    """
+    results: list = []
+    for url in urls:
+        if not url or not isinstance(url, str):
+            logger.warning("url_normalization.empty_or_invalid url=%s", url)
+            results.append(None)
+            continue
+        normalized = _normalize_memoized(url)
+        if normalized is None or with_url:
+            results.append(normalized)
+        else:
+            results.append(normalized.key)
+    return results
+
+
+@lru_cache(maxsize=_MEMO_SIZE)
+def _normalize_memoized(url: str) -> NormalizedUrl | None:
+    normalized = _normalize(url)
+    if normalized is None:
+        return None
+    return NormalizedUrl(url=normalized, key=hashlib.sha256(normalized.encode("utf-8")).hexdigest())
+
+
+def _normalize(url: str) -> str | None:
+    """The normalized URL string, or None if the URL is malformed."""
+    stripped = url.strip()
+    simple = _SIMPLE_URL.fullmatch(stripped)
+    if simple is not None:
+        scheme = simple.group("scheme").lower()
+        path = simple.group("path") or ""
+        return f"{scheme}://{_normalize_host(scheme, simple.group('host'))}{path.lower()}"
+    return _normalize_parsed(stripped)
+
+
+def _normalize_parsed(url: str) -> str | None:
     try:
-        parsed = urlparse(url.strip())
+        parsed = urlparse(url)
     except Exception as e:
         logger.warning("url_normalization.parse_failed url=%s error=%s", url, e)
         return None
@@ -83,22 +160,7 @@ def normalize_url(url: str) -> str | None:
     # Normalize scheme (lowercase)
     scheme = parsed.scheme.lower()
 
-    # Normalize host (lowercase)
-    host = parsed.netloc.lower()
-
-    # Remove default port if present
-    if ":" in host:
-        host_parts = host.rsplit(":", 1)
-        if len(host_parts) == 2:
-            hostname, port_str = host_parts
-            try:
-                port = int(port_str)
-                default_port = _DEFAULT_PORTS.get(scheme)
-                if default_port and port == default_port:
-                    host = hostname
-            except ValueError:
-                # Port is not a valid number, keep as-is
-                pass
+    host = _normalize_host(scheme, parsed.netloc)
 
     # Normalize path (lowercase and ensure it starts with / if not empty)
     path = parsed.path.lower() if parsed.path else parsed.path
@@ -112,12 +174,25 @@ def normalize_url(url: str) -> str | None:
     fragment = ""
 
     # Reconstruct normalized URL
-    normalized = urlunparse((scheme, host, path, parsed.params, query, fragment))
+    return urlunparse((scheme, host, path, parsed.params, query, fragment))
 
-    # Generate SHA-256 hash
-    hash_value = hashlib.sha256(normalized.encode("utf-8")).hexdigest()
 
-    return hash_value
+def _normalize_host(scheme: str, netloc: str) -> str:
+    """Lowercase the host and drop the scheme's default port."""
+    host = netloc.lower()
+    if ":" in host:
+        host_parts = host.rsplit(":", 1)
+        if len(host_parts) == 2:
+            hostname, port_str = host_parts
+            try:
+                port = int(port_str)
+                default_port = _DEFAULT_PORTS.get(scheme)
+                if default_port and port == default_port:
+                    host = hostname
+            except ValueError:
+                # Port is not a valid number, keep as-is
+                pass
+    return host
 
 
 def _normalize_query(query: str) -> str:
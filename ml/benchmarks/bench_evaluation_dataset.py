@@ -0,0 +1,75 @@
+"""Time loading the evaluation dataset: cold build, unchanged DB and a small append.
+
+Usage (from ml/): python -m benchmarks.bench_evaluation_dataset --rows 20000 --append 200
+"""
+
+from __future__ import annotations
+
+import argparse
+from datetime import datetime, timezone
+from pathlib import Path
+import tempfile
+import time
+
+from app.db.results_repository import ResultRepository
+from app.db.session import open_session
+from app.schemas.results import ResultMetadata
+from app.services.evaluation_dataset import EvaluationDatasetCache
+
+
+def _results(start: int, count: int) -> list[ResultMetadata]:
+    created_at = datetime(2026, 2, 8, 12, 0, tzinfo=timezone.utc)
+    return [
+        ResultMetadata(
+            run_id=f"run-{index // 1000}",
+            query_id="q1",
+            query_text="python",
+            search_query="site:example.com python",
+            domain=f"site{index % 50}.example.com",
+            title=f"Senior engineer {index} python data",
+            snippet=f"Remote role {index} working on pipelines and services",
+            raw_url=f"https://example.com/{index}",
+            final_url=f"https://example.com/{index}",
+            created_at=created_at,
+            updated_at=created_at,
+            relevance_score=1.0 if index % 3 == 0 else -1.0,
+            scored_at="2026-02-08T12:00:00Z",
+        )
+        for index in range(start, start + count)
+    ]
+
+
+def _write(db_path: Path, results: list[ResultMetadata]) -> None:
+    session = open_session(db_path)
+    try:
+        ResultRepository(session).write_all(results)
+    finally:
+        session.close()
+
+
+def _timed(label: str, fn) -> None:
+    started = time.perf_counter()
+    columns = fn()
+    print(f"{label:<10} ms={(time.perf_counter() - started) * 1000:.2f} rows={len(columns)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--append", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = Path(directory) / "active.db"
+        _write(db_path, _results(0, args.rows))
+        cache = EvaluationDatasetCache()
+
+        _timed("cold", lambda: cache.load_run_db(db_path))
+        _timed("unchanged", lambda: cache.load_run_db(db_path))
+        _write(db_path, _results(args.rows, args.append))
+        _timed("appended", lambda: cache.load_run_db(db_path))
+        _timed("rebuild", lambda: EvaluationDatasetCache().load_run_db(db_path))
+
+
+if __name__ == "__main__":
+    main()
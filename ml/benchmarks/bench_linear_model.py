@@ -0,0 +1,75 @@
+"""Time the hashed logistic model: featurizing, fitting, partial_fit and batch prediction.
+
+Usage (from ml/): python -m benchmarks.bench_linear_model --rows 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from app.models.linear_model import DEFAULT_EPOCHS, HashedLogisticModel
+from app.services.feature_store import featurize_rows
+
+_RELEVANT = ["python", "backend", "engineer", "django", "fastapi", "platform", "remote", "senior"]
+_IRRELEVANT = ["cashier", "retail", "driver", "warehouse", "sales", "barista", "shift", "store"]
+_COMMON = ["job", "role", "team", "apply", "full", "time", "benefits", "hiring", "company", "position"]
+
+
+def build_rows(count: int, *, seed: int = 5) -> tuple[list[dict[str, str]], list[int]]:
+    """Job-like rows whose label depends on which vocabulary dominates."""
+    rng = random.Random(seed)
+    rows: list[dict[str, str]] = []
+    labels: list[int] = []
+    for index in range(count):
+        label = rng.random() < 0.4
+        vocabulary = _RELEVANT if label else _IRRELEVANT
+        title = " ".join(rng.choice(vocabulary) for _ in range(3)) + f" {rng.choice(_COMMON)}"
+        snippet = " ".join(rng.choice(_COMMON + vocabulary) for _ in range(20))
+        rows.append({"title": title, "snippet": snippet, "domain": f"jobs{index % 113}.example.com"})
+        labels.append(int(label))
+    return rows, labels
+
+
+def _rate(label: str, rows: int, seconds: float) -> None:
+    print(f"{label:<16} rows={rows} seconds={seconds:.3f} rows_per_sec={rows / seconds:,.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--epochs", type=int, default=DEFAULT_EPOCHS)
+    args = parser.parse_args()
+
+    rows, labels = build_rows(args.rows)
+
+    started = time.perf_counter()
+    matrix = featurize_rows(rows)
+    _rate("featurize", len(rows), time.perf_counter() - started)
+
+    model = HashedLogisticModel(epochs=args.epochs)
+    started = time.perf_counter()
+    model.fit_features(matrix, labels)
+    _rate("fit", len(rows) * args.epochs, time.perf_counter() - started)
+
+    started = time.perf_counter()
+    model.partial_fit(matrix, labels)
+    _rate("partial_fit", len(rows), time.perf_counter() - started)
+
+    started = time.perf_counter()
+    scores = np.asarray(model.predict_features(matrix))
+    _rate("predict_stored", len(rows), time.perf_counter() - started)
+
+    started = time.perf_counter()
+    model.predict(rows)
+    _rate("predict_dicts", len(rows), time.perf_counter() - started)
+
+    accuracy = float(np.mean((scores > 0) == np.asarray(labels, dtype=bool)))
+    print(f"train_accuracy={accuracy:.3f}")
+
+
+if __name__ == "__main__":
+    main()
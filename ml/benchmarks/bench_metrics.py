@@ -0,0 +1,60 @@
+"""Time fixed-threshold metrics (old per-element loop vs NumPy) and the full ranking summary.
+
+Usage (from ml/): python -m benchmarks.bench_metrics --rows 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+
+import numpy as np
+
+from app.services.metrics import calculate_metrics, predicted_labels, ranking_summary
+
+
+def _loop_counts(y_true: list[int], y_pred: list[int]) -> tuple[int, int, int, int]:
+    # The per-element loop calculate_classification_counts used before
+    tp = tn = fp = fn = 0
+    for actual, predicted in zip(y_true, y_pred, strict=True):
+        if actual not in (0, 1) or predicted not in (0, 1):
+            raise ValueError("classification inputs must be binary values 0 or 1")
+        if actual == 1 and predicted == 1:
+            tp += 1
+        elif actual == 0 and predicted == 0:
+            tn += 1
+        elif actual == 0 and predicted == 1:
+            fp += 1
+        else:
+            fn += 1
+    return tp, tn, fp, fn
+
+
+def _timed(label: str, fn) -> object:
+    started = time.perf_counter()
+    result = fn()
+    print(f"{label:<16} ms={(time.perf_counter() - started) * 1000:.1f}")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(11)
+    labels = rng.integers(0, 2, size=args.rows)
+    # Relevance scores in [-1, 1], as models predict them
+    scores = np.clip(labels * 0.5 + rng.random(args.rows) * 1.5 - 1.0, -1.0, 1.0)
+    binary = predicted_labels(scores)
+    label_list, binary_list = labels.tolist(), binary.tolist()
+
+    _timed("loop_counts", lambda: _loop_counts(label_list, binary_list))
+    _timed("numpy_metrics", lambda: calculate_metrics(labels, binary))
+    summary = _timed("ranking_summary", lambda: ranking_summary(labels, scores))
+    print(f"rocAuc={summary['rocAuc']:.4f} stored_bytes={len(json.dumps(summary, separators=(',', ':')))}")
+
+
+if __name__ == "__main__":
+    main()
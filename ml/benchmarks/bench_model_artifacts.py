@@ -0,0 +1,62 @@
+"""Time saving, validating and loading a model artifact against the old pickle format.
+
+Usage (from ml/): python -m benchmarks.bench_model_artifacts --repeat 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import pickle
+from pathlib import Path
+import tempfile
+import time
+
+import numpy as np
+
+from app.models.linear_model import HashedLogisticModel
+from app.services.model_artifacts import load_artifact, validate_artifact, write_artifact
+
+
+def _timed(label: str, repeat: int, fn) -> None:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    print(f"{label:<18} ms_per_call={(time.perf_counter() - started) * 1000 / repeat:.3f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    model = HashedLogisticModel()
+    model.weights = np.random.default_rng(3).normal(size=model.weights.size)
+
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        pickle_path = root / "model.pkl"
+        payload = {"modelVersion": "1.0.0", "metrics": {}, "model": model}
+
+        def write_pickle() -> None:
+            with pickle_path.open("wb") as handle:
+                pickle.dump(payload, handle)
+
+        def read_pickle() -> None:
+            with pickle_path.open("rb") as handle:
+                pickle.load(handle)
+
+        def write() -> None:
+            write_artifact(root, model_id="bench", model_version="1.0.0", model=model, metrics={})
+
+        _timed("pickle_write", args.repeat, write_pickle)
+        _timed("pickle_load", args.repeat, read_pickle)
+        _timed("artifact_write", args.repeat, write)
+        path = root / "bench_1.0.0"
+        _timed("artifact_validate", args.repeat, lambda: validate_artifact(path, expected_version="1.0.0"))
+        _timed("artifact_load_mmap", args.repeat, lambda: load_artifact(path))
+        _timed("artifact_load_read", args.repeat, lambda: load_artifact(path, mmap=False))
+        print(f"weights_bytes={model.weights.nbytes}")
+
+
+if __name__ == "__main__":
+    main()
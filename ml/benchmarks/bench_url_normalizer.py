@@ -0,0 +1,57 @@
+"""Time batch URL normalization (memo + fast path) against the per-URL urlparse path.
+
+Usage (from ml/): python -m benchmarks.bench_url_normalizer --urls 200000 --distinct 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import random
+import time
+
+from app.services.url_normalizer import _normalize_memoized, _normalize_parsed, normalize_urls
+
+
+def build_urls(count: int, distinct: int, *, query_share: float = 0.3, seed: int = 11) -> list[str]:
+    """Job URLs drawn with repetition; ``query_share`` of them carry tracking/query params."""
+    rng = random.Random(seed)
+    pool: list[str] = []
+    for index in range(distinct):
+        url = f"https://Jobs{index % 97}.example.com/Careers/Posting/{index}"
+        if rng.random() < query_share:
+            url += f"?id={index}&utm_source=feed&ref=board{index % 7}"
+        pool.append(url)
+    return [rng.choice(pool) for _ in range(count)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--urls", type=int, default=200_000)
+    parser.add_argument("--distinct", type=int, default=20_000)
+    args = parser.parse_args()
+
+    urls = build_urls(args.urls, args.distinct)
+
+    started = time.perf_counter()
+    baseline = []
+    for url in urls:
+        normalized = _normalize_parsed(url.strip())
+        baseline.append(hashlib.sha256(normalized.encode("utf-8")).hexdigest() if normalized else None)
+    baseline_seconds = time.perf_counter() - started
+    print(f"per_url urls={len(urls)} seconds={baseline_seconds:.3f} urls_per_sec={len(urls) / baseline_seconds:,.0f}")
+
+    _normalize_memoized.cache_clear()
+    started = time.perf_counter()
+    batched = normalize_urls(urls)
+    batch_seconds = time.perf_counter() - started
+    info = _normalize_memoized.cache_info()
+    print(
+        f"batch   urls={len(urls)} seconds={batch_seconds:.3f} urls_per_sec={len(urls) / batch_seconds:,.0f} "
+        f"memo_hits={info.hits} memo_misses={info.misses}"
+    )
+    print(f"identical={batched == baseline} speedup={baseline_seconds / batch_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Reference exact near-duplicate grouping: an O(n^2) pairwise scan over word trigram sets.
+
+Production dedupe groups rows with MinHash/LSH (``app.pipelines.dedupe``);
+this is the scan it replaced, kept to measure it against.
+"""
+
+from __future__ import annotations
+
+import re
+
+
+def exact_similar_groups(items: list[tuple[int, str]], threshold: float) -> list[tuple[int, list[int]]]:
+    """(canonical id, duplicate ids) groups, claiming rows in input order like ``_similar_groups``."""
+    signatures = [ngram_signature(text) if text else set() for _, text in items]
+    groups: list[tuple[int, list[int]]] = []
+    claimed: set[int] = set()
+    for i, sig1 in enumerate(signatures):
+        if i in claimed or not sig1:
+            continue
+        matches = [
+            j
+            for j in range(i + 1, len(items))
+            if j not in claimed and signatures[j] and jaccard_similarity(sig1, signatures[j]) >= threshold
+        ]
+        if matches:
+            claimed.update(matches)
+            groups.append((items[i][0], [items[j][0] for j in matches]))
+    return groups
+
+
+def ngram_signature(text: str, n: int = 3) -> set[str]:
+    """Word n-grams of ``text`` after lowercasing and collapsing whitespace."""
+    words = re.sub(r"\s+", " ", text.lower().strip()).split()
+    return {" ".join(words[i : i + n]) for i in range(len(words) - n + 1)}
+
+
+def jaccard_similarity(set1: set, set2: set) -> float:
+    if not set1 and not set2:
+        return 1.0
+    if not set1 or not set2:
+        return 0.0
+    return len(set1 & set2) / len(set1 | set2)
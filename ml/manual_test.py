@@ -12,6 +12,7 @@ from pathlib import Path
 # Add the app directory to path
 sys.path.insert(0, "/app")
 
+from app.db.page_text import decode_page_text
 from app.pipelines.ingestion import RunInput, ingest_run, build_run_inputs
 from app.schemas.results import SearchResultItem
 
@@ -135,8 +136,10 @@ def test_stories_2_3_to_2_5(run_id: str = None):
         
         if count > 0:
             cursor.execute("""
-                SELECT title, domain, raw_url, final_url, raw_html_path, visible_text 
-                FROM run_items LIMIT 3
+                SELECT ri.title, ri.domain, ri.raw_url, ri.final_url, ri.raw_html_path, t.codec, t.visible_text
+                FROM run_items ri
+                LEFT JOIN run_item_texts t ON t.item_id = ri.id
+                LIMIT 3
             """)
             rows = cursor.fetchall()
             print("\n   Sample data:")
@@ -145,7 +148,8 @@ def test_stories_2_3_to_2_5(run_id: str = None):
                 print(f"     Domain: {row[1]}")
                 print(f"     URL: {row[3]}")
                 print(f"     HTML Path: {row[4]}")
-                print(f"     Visible Text Preview: {str(row[5])[:100]}..." if row[5] else "     Visible Text: None")
+                visible_text = decode_page_text(row[5], row[6])
+                print(f"     Visible Text Preview: {visible_text[:100]}..." if visible_text else "     Visible Text: None")
                 print()
         
         conn.close()
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import logging
+
+import numpy as np
+import yaml
+
+from app.models.linear_model import HashedLogisticModel
+from app.registry import ModelRegistry
+from app.registry.artifact_cache import ArtifactCache
+from app.services.model_artifacts import write_artifact
+
+
+def _trained(seed: int) -> HashedLogisticModel:
+    model = HashedLogisticModel()
+    model.weights = np.random.default_rng(seed).normal(size=model.weights.size)
+    return model
+
+
+def _registry(tmp_path, artifact_dir) -> ModelRegistry:
+    config_path = tmp_path / "models.yaml"
+    config_path.write_text(
+        yaml.dump(
+            {
+                "models": [
+                    {
+                        "identifier": "hashed_logistic",
+                        "module_path": "app.models.linear_model",
+                        "class_name": "HashedLogisticModel",
+                        "version": "1.0.0",
+                    }
+                ]
+            }
+        )
+    )
+    registry = ModelRegistry(artifact_dir=artifact_dir)
+    registry.load_from_config(config_path)
+    return registry
+
+
+def test_registry_resolves_trained_versions_and_never_serves_another_version(tmp_path, caplog):
+    artifact_dir = tmp_path / "trained"
+    trained = _trained(1)
+    write_artifact(artifact_dir, model_id="hashed_logistic", model_version="1.0.0-r1", model=trained, metrics={})
+    registry = _registry(tmp_path, artifact_dir)
+
+    versioned = registry.get_model_version("hashed_logistic", "1.0.0-r1")
+
+    assert np.array_equal(versioned.weights, trained.weights)
+    assert registry.get_model_version("hashed_logistic", "1.0.0-r1") is versioned
+    assert registry.get_model_version("hashed_logistic", "1.0.0") is registry.get_model("hashed_logistic")
+    assert registry.get_model_version("hashed_logistic", None) is registry.get_model("hashed_logistic")
+    with caplog.at_level(logging.WARNING, logger="app.registry.model_registry"):
+        assert registry.get_model_version("hashed_logistic", "1.0.0-r9") is None
+    assert "registry.version_missing identifier=hashed_logistic version=1.0.0-r9" in caplog.text
+    assert registry.get_model_version("unknown", "1.0.0-r1") is None
+    assert registry.get_trained_versions("hashed_logistic") == ["1.0.0-r1"]
+    stats = registry.artifact_cache_stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+def test_legacy_pickled_versions_resolve_to_the_configured_model_without_unpickling(tmp_path, caplog):
+    artifact_dir = tmp_path / "trained"
+    artifact_dir.mkdir()
+    # Not a valid pickle: resolving the version must never load it
+    (artifact_dir / "hashed_logistic_1.0.0-20260101000000.pkl").write_bytes(b"not a pickle")
+    registry = _registry(tmp_path, artifact_dir)
+
+    with caplog.at_level(logging.WARNING, logger="app.registry.model_registry"):
+        first = registry.get_model_version("hashed_logistic", "1.0.0-20260101000000")
+        second = registry.get_model_version("hashed_logistic", "1.0.0-20260101000000")
+
+    assert first is second is registry.get_model("hashed_logistic")
+    assert caplog.text.count("registry.legacy_artifact identifier=hashed_logistic") == 1
+    assert registry.get_trained_versions("hashed_logistic") == []
+
+
+def test_lru_evicts_least_recently_used_versions_over_budget(tmp_path):
+    artifact_dir = tmp_path / "trained"
+    for index in range(3):
+        write_artifact(artifact_dir, model_id="m", model_version=f"v{index}", model=_trained(index), metrics={})
+    weight_bytes = _trained(0).weights.nbytes
+    cache = ArtifactCache(artifact_dir, budget_bytes=2 * weight_bytes)
+
+    first = cache.get("m", "v0")
+    cache.get("m", "v1")
+    assert cache.get("m", "v0") is first  # v0 is now the most recently used
+    cache.get("m", "v2")
+
+    stats = cache.stats()
+    assert [entry["modelVersion"] for entry in stats["resident"]] == ["v0", "v2"]
+    assert stats["evictions"] == 1 and stats["residentBytes"] == 2 * weight_bytes
+    assert cache.get("m", "missing") is None
+
+
+def test_oversized_version_stays_resident_alone(tmp_path):
+    artifact_dir = tmp_path / "trained"
+    write_artifact(artifact_dir, model_id="m", model_version="v0", model=_trained(0), metrics={})
+    write_artifact(artifact_dir, model_id="m", model_version="v1", model=_trained(1), metrics={})
+    cache = ArtifactCache(artifact_dir, budget_bytes=1)
+
+    cache.get("m", "v0")
+    cache.get("m", "v1")
+
+    assert [entry["modelVersion"] for entry in cache.stats()["resident"]] == ["v1"]
@@ -1,22 +1,23 @@
 """Tests for deduplication pipeline."""
 
+import numpy as np
 import pytest
 from datetime import datetime, timezone
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 
 from app.db.models import Base, RunResult
 from app.pipelines.dedupe import (
     dedupe_run_results,
     DedupeOutcome,
-    _compute_jaccard_similarity,
-    _compute_ngram_signature,
-    _extract_comparable_text,
-    _group_by_normalized_url,
-    _process_url_groups,
+    _decide_url_duplicates,
     _find_similar_duplicates,
+    _reset_decisions,
+    _Scope,
     DEFAULT_SIMILARITY_THRESHOLD,
 )
+from app.services.dedupe_index import comparable_text
+from app.services.minhash import jaccard, shingle_hashes
 
 
 @pytest.fixture
@@ -280,63 +281,57 @@ class TestDedupeRunResults:
         assert outcome.canonical_count == 1  # Single result with no duplicates
 
 
-class TestGroupByNormalizedUrl:
-    """Test cases for _group_by_normalized_url function."""
+def _url_decisions(session, run_id="test-run-1"):
+    _reset_decisions(session)
+    _decide_url_duplicates(session, _Scope(run_id=run_id, after_id=0))
+    return session.execute(
+        text("SELECT item_id, canonical_id FROM temp.dedupe_decisions ORDER BY item_id")
+    ).all()
 
-    def test_groups_by_normalized_url(self, sample_results):
-        """Test that results are correctly grouped by normalized_url."""
-        groups = _group_by_normalized_url(sample_results)
-        
-        assert "abc123hash" in groups
-        assert "def456hash" in groups
-        assert len(groups["abc123hash"]) == 2
-        assert len(groups["def456hash"]) == 1
 
-    def test_empty_normalized_url_excluded(self, sample_results):
-        """Test that results without normalized_url are excluded."""
-        sample_results[0].normalized_url = None
-        
-        groups = _group_by_normalized_url(sample_results)
-        
-        assert len(groups) == 2  # Only 2 unique normalized_urls remain
+def _items(results):
+    return [
+        (result.id, shingle_hashes(comparable_text(result.title, result.snippet, result.visible_text)))
+        for result in results
+    ]
 
-    def test_empty_list_returns_empty_dict(self):
-        """Test that empty list returns empty dict."""
-        groups = _group_by_normalized_url([])
-        
-        assert groups == {}
 
+class TestDecideUrlDuplicates:
+    """Test cases for the SQL exact-URL phase."""
 
-class TestProcessUrlGroups:
-    """Test cases for _process_url_groups function."""
+    def test_groups_by_normalized_url(self, db_session, sample_results):
+        """Test that the lowest id of each normalized_url group is canonical."""
+        db_session.add_all(sample_results)
+        db_session.commit()
 
-    def test_single_result_per_url_not_duplicate(self, db_session, sample_results):
-        """Test that single results per URL are not marked duplicates."""
-        groups = {"hash1": [sample_results[2]]}  # Only one result
-        
-        duplicates = _process_url_groups(db_session, groups)
-        
-        assert len(duplicates) == 0
-        # When single result in group, is_duplicate is not set (remains None or 0)
-        assert sample_results[2].is_duplicate == False or sample_results[2].is_duplicate is None
+        assert _url_decisions(db_session) == [(2, 1)]
 
-    def test_multiple_results_mark_duplicates(self, db_session, sample_results):
-        """Test that multiple results per URL mark duplicates correctly."""
-        # Create two results with same URL but different IDs
-        r1 = sample_results[0]  # id=1
-        r2 = sample_results[1]  # id=2
-        r1.normalized_url = "samehash"
-        r2.normalized_url = "samehash"
-        
-        groups = {"samehash": [r1, r2]}
-        
-        duplicates = _process_url_groups(db_session, groups)
-        
-        assert len(duplicates) == 1
-        assert r1.is_duplicate is False  # First (lowest id) is canonical
-        assert r2.is_duplicate is True
-        assert r2.canonical_id == r1.id
-        assert r1.duplicate_count == 1
+    def test_empty_normalized_url_excluded(self, db_session, sample_results):
+        """Test that results without normalized_url are never grouped."""
+        for result in sample_results:
+            result.normalized_url = None
+        db_session.add_all(sample_results)
+        db_session.commit()
+
+        assert _url_decisions(db_session) == []
+
+    def test_already_duplicate_rows_not_regrouped(self, db_session, sample_results):
+        """Test that rows flagged by an earlier pass stay out of the groups."""
+        sample_results[1].is_duplicate = True
+        sample_results[1].canonical_id = 1
+        db_session.add_all(sample_results)
+        db_session.commit()
+
+        assert _url_decisions(db_session) == []
+
+    def test_empty_run_returns_no_decisions(self, db_session):
+        """Test that an empty run produces no decisions."""
+        assert _url_decisions(db_session) == []
+
+
+def _hashes(*values):
+    """Sorted unique uint64 shingle hashes, the form ``jaccard`` compares."""
+    return np.array(sorted(set(values)), dtype=np.uint64)
 
 
 class TestComputeJaccardSimilarity:
@@ -344,71 +339,70 @@ class TestComputeJaccardSimilarity:
 
     def test_identical_sets_have_similarity_one(self):
         """Test that identical sets have similarity of 1.0."""
-        set1 = {"a", "b", "c"}
-        set2 = {"a", "b", "c"}
+        set1 = _hashes(1, 2, 3)
+        set2 = _hashes(1, 2, 3)
         
-        similarity = _compute_jaccard_similarity(set1, set2)
+        similarity = jaccard(set1, set2)
         
         assert similarity == 1.0
 
     def test_disjoint_sets_have_similarity_zero(self):
         """Test that disjoint sets have similarity of 0.0."""
-        set1 = {"a", "b", "c"}
-        set2 = {"x", "y", "z"}
+        set1 = _hashes(1, 2, 3)
+        set2 = _hashes(7, 8, 9)
         
-        similarity = _compute_jaccard_similarity(set1, set2)
+        similarity = jaccard(set1, set2)
         
         assert similarity == 0.0
 
     def test_partial_overlap(self):
         """Test partial overlap between sets."""
-        set1 = {"a", "b", "c"}
-        set2 = {"b", "c", "d"}
-        # Intersection: {b, c} = 2
-        # Union: {a, b, c, d} = 4
+        set1 = _hashes(1, 2, 3)
+        set2 = _hashes(2, 3, 4)
+        # Intersection: {2, 3} = 2
+        # Union: {1, 2, 3, 4} = 4
         # Similarity: 2/4 = 0.5
         
-        similarity = _compute_jaccard_similarity(set1, set2)
+        similarity = jaccard(set1, set2)
         
         assert similarity == 0.5
 
     def test_empty_sets(self):
         """Test handling of empty sets."""
-        assert _compute_jaccard_similarity(set(), set()) == 1.0
-        assert _compute_jaccard_similarity(set(), {"a"}) == 0.0
-        assert _compute_jaccard_similarity({"a"}, set()) == 0.0
+        assert jaccard(_hashes(), _hashes()) == 1.0
+        assert jaccard(_hashes(), _hashes(1)) == 0.0
+        assert jaccard(_hashes(1), _hashes()) == 0.0
 
 
 class TestComputeNgramSignature:
-    """Test cases for n-gram signature computation."""
+    """Test cases for n-gram shingle hashing."""
 
     def test_basic_ngrams(self):
         """Test basic n-gram generation."""
-        text = "the quick brown fox"
-        signature = _compute_ngram_signature(text, n=2)
+        signature = shingle_hashes("the quick brown fox", n=2)
         
-        expected = {"the quick", "quick brown", "brown fox"}
-        assert signature == expected
+        # "the quick", "quick brown", "brown fox"
+        assert signature.size == 3
+        assert signature.dtype == np.uint64
+        assert np.all(signature[1:] > signature[:-1])
 
     def test_text_normalization(self):
         """Test that text is normalized (lowercased, whitespace)."""
-        text = "  The   QUICK   Brown  Fox  "
-        signature = _compute_ngram_signature(text, n=2)
+        signature = shingle_hashes("  The   QUICK   Brown  Fox  ", n=2)
         
-        expected = {"the quick", "quick brown", "brown fox"}
-        assert signature == expected
+        expected = shingle_hashes("the quick brown fox", n=2)
+        assert np.array_equal(signature, expected)
 
     def test_single_word(self):
         """Test handling of single word text."""
-        text = "hello"
-        signature = _compute_ngram_signature(text, n=2)
+        signature = shingle_hashes("hello", n=2)
         
-        assert signature == set()  # Not enough words for bigrams
+        assert signature.size == 0  # Not enough words for bigrams
 
     def test_empty_text(self):
         """Test handling of empty text."""
-        assert _compute_ngram_signature("") == set()
-        assert _compute_ngram_signature("   ") == set()
+        assert shingle_hashes("").size == 0
+        assert shingle_hashes("   ").size == 0
 
 
 class TestExtractComparableText:
@@ -417,7 +411,7 @@ class TestExtractComparableText:
     def test_extracts_all_fields(self, sample_results):
         """Test that all text fields are extracted."""
         result = sample_results[0]
-        text = _extract_comparable_text(result)
+        text = comparable_text(result.title, result.snippet, result.visible_text)
         
         assert result.title in text
         assert result.snippet in text
@@ -443,7 +437,7 @@ class TestExtractComparableText:
             visible_text=None,
         )
         
-        text = _extract_comparable_text(result)
+        text = comparable_text(result.title, result.snippet, result.visible_text)
         
         assert "Title Only" in text
         assert "  " not in text  # No double spaces from empty fields
@@ -491,10 +485,9 @@ class TestFindSimilarDuplicates:
             ),
         ]
         
-        duplicates = _find_similar_duplicates(db_session, results, 0.90)
+        duplicates = _find_similar_duplicates(_items(results), 0.90)
         
-        assert len(duplicates) == 1
-        assert duplicates[0].id == 2  # Second result is duplicate
+        assert duplicates == [(2, 1)]  # Second result is duplicate of the first
 
     def test_different_text_not_duplicate(self, db_session):
         """Test that different text is not marked as duplicate."""
@@ -535,7 +528,7 @@ class TestFindSimilarDuplicates:
             ),
         ]
         
-        duplicates = _find_similar_duplicates(db_session, results, 0.90)
+        duplicates = _find_similar_duplicates(_items(results), 0.90)
         
         assert len(duplicates) == 0
 
@@ -579,10 +572,10 @@ class TestFindSimilarDuplicates:
         ]
         
         # With high threshold, might not be detected
-        duplicates_high = _find_similar_duplicates(db_session, results, 0.95)
+        duplicates_high = _find_similar_duplicates(_items(results), 0.95)
         
         # With lower threshold, should be detected
-        duplicates_low = _find_similar_duplicates(db_session, results, 0.70)
+        duplicates_low = _find_similar_duplicates(_items(results), 0.70)
         
         # The exact counts depend on the similarity score
         assert len(duplicates_high) <= len(duplicates_low)
@@ -739,3 +732,38 @@ class TestIntegrationScenarios:
         assert outcome.exact_duplicates == 1
         assert outcome.similar_duplicates == 1
         assert outcome.canonical_count == 3  # 5 total - 2 duplicates
+
+    def test_canonical_counts_duplicates_from_both_phases(self, db_session):
+        """Test that a canonical claimed by URL and by text counts every duplicate."""
+        base_time = datetime.now(timezone.utc).isoformat()
+        description = "Backend engineer building data pipelines with Python and Postgres on a remote team."
+
+        def make(item_id, normalized_url):
+            return RunResult(
+                id=item_id,
+                run_id="test-run-1",
+                query_id="q1",
+                query_text="backend",
+                search_query="site:example.com backend",
+                domain="example.com",
+                title="Backend Engineer",
+                snippet="Remote role",
+                raw_url=f"https://example.com/job/{item_id}",
+                final_url=f"https://example.com/job/{item_id}",
+                created_at=base_time,
+                updated_at=base_time,
+                normalized_url=normalized_url,
+                visible_text=description,
+            )
+
+        db_session.add_all([make(1, "hash-a"), make(2, "hash-a"), make(3, "hash-b")])
+        db_session.commit()
+
+        outcome = dedupe_run_results(db_session, "test-run-1", cross_run=False)
+
+        rows = {r.id: r for r in db_session.query(RunResult).all()}
+        assert (outcome.exact_duplicates, outcome.similar_duplicates) == (1, 1)
+        assert rows[1].duplicate_count == 2
+        assert rows[1].is_duplicate == False
+        assert [rows[2].canonical_id, rows[3].canonical_id] == [1, 1]
+        assert rows[2].is_hidden == True and rows[3].is_hidden == True
@@ -0,0 +1,179 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import func, select, text
+
+from app.db.models import DedupeLshBucket, DedupeSignature, DedupeUrlEntry, RunItemShingles, RunResult
+from app.db.results_repository import ResultRepository
+from app.db.session import open_session
+from app.pipelines.dedupe import DedupeOutcome, dedupe_run_results
+from app.schemas.results import ResultMetadata
+from app.services.dedupe_index import INDEX_BANDS, DedupeIndex, item_shingles
+from app.services.minhash import decode_shingles
+
+
+_NOW = datetime(2026, 2, 8, 12, 0, tzinfo=timezone.utc)
+_POSTING = " ".join(f"requirement{index}" for index in range(60))
+
+
+def _result(run_id: str, slug: str, *, normalized_url: str, text: str | None = None) -> ResultMetadata:
+    return ResultMetadata(
+        run_id=run_id,
+        query_id="q1",
+        query_text="python",
+        search_query="site:example.com python",
+        domain="example.com",
+        title=f"Role {slug}",
+        snippet="Remote",
+        raw_url=f"https://example.com/{slug}",
+        final_url=f"https://example.com/{slug}",
+        created_at=_NOW,
+        updated_at=_NOW,
+        visible_text=text,
+        normalized_url=normalized_url,
+    )
+
+
+def _rows(session, run_id: str) -> dict[str, RunResult]:
+    return {
+        row.title: row
+        for row in session.execute(select(RunResult).where(RunResult.run_id == run_id)).scalars()
+    }
+
+
+def test_reposted_url_in_later_run_is_duplicate_of_history(tmp_path):
+    session = open_session(tmp_path / "run.db")
+    try:
+        ResultRepository(session).write_all([_result("run-1", "a", normalized_url="url-a")])
+        dedupe_run_results(session, "run-1")
+        ResultRepository(session).write_all(
+            [_result("run-2", "a-again", normalized_url="url-a"), _result("run-2", "b", normalized_url="url-b")]
+        )
+
+        outcome = dedupe_run_results(session, "run-2")
+
+        original = _rows(session, "run-1")["Role a"]
+        repost = _rows(session, "run-2")["Role a-again"]
+        assert outcome.history_duplicates == 1
+        assert outcome.exact_duplicates == 1
+        assert outcome.canonical_count == 1
+        assert (repost.is_duplicate, repost.is_hidden, repost.canonical_id) == (True, True, original.id)
+        session.refresh(original)
+        assert original.duplicate_count == 1
+        assert not _rows(session, "run-2")["Role b"].is_duplicate
+    finally:
+        session.close()
+
+
+def test_near_duplicate_text_in_later_run_matches_history(tmp_path):
+    session = open_session(tmp_path / "run.db")
+    try:
+        ResultRepository(session).write_all([_result("run-1", "a", normalized_url="url-a", text=_POSTING)])
+        dedupe_run_results(session, "run-1")
+        ResultRepository(session).write_all(
+            [
+                _result("run-2", "a", normalized_url="url-a-v2", text=_POSTING + " apply"),
+                _result("run-2", "other", normalized_url="url-c", text="Completely different retail cashier role"),
+            ]
+        )
+
+        outcome = dedupe_run_results(session, "run-2")
+
+        assert outcome.history_duplicates == 1
+        assert outcome.similar_duplicates == 1
+        rows = _rows(session, "run-2")
+        assert rows["Role a"].canonical_id == _rows(session, "run-1")["Role a"].id
+        assert not rows["Role other"].is_duplicate
+    finally:
+        session.close()
+
+
+def test_history_deduped_without_index_is_backfilled_once(tmp_path):
+    session = open_session(tmp_path / "run.db")
+    try:
+        ResultRepository(session).write_all(
+            [_result("run-1", "a", normalized_url="url-a", text=_POSTING), _result("run-1", "b", normalized_url="url-b")]
+        )
+        dedupe_run_results(session, "run-1", cross_run=False)
+        ResultRepository(session).write_all([_result("run-2", "b-again", normalized_url="url-b")])
+
+        outcome = dedupe_run_results(session, "run-2")
+
+        assert outcome.history_duplicates == 1
+        assert session.execute(select(func.count()).select_from(DedupeUrlEntry)).scalar_one() == 2
+        assert session.execute(select(func.count()).select_from(DedupeSignature)).scalar_one() == 2
+        assert session.execute(select(func.count()).select_from(DedupeLshBucket)).scalar_one() == 2 * INDEX_BANDS
+
+        index = DedupeIndex(session)
+        assert index.catch_up(before_id=index.watermark + 1) == 0
+    finally:
+        session.close()
+
+
+def test_second_pass_only_processes_rows_inserted_since_the_first(tmp_path):
+    session = open_session(tmp_path / "run.db")
+    try:
+        ResultRepository(session).write_all(
+            [_result("run-1", "a", normalized_url="url-a", text=_POSTING), _result("run-1", "b", normalized_url="url-b")]
+        )
+        first = dedupe_run_results(session, "run-1")
+        ResultRepository(session).write_all(
+            [
+                _result("run-1", "a-copy", normalized_url="url-a"),
+                _result("run-1", "a-text", normalized_url="url-a2", text=_POSTING),
+                _result("run-1", "c", normalized_url="url-c"),
+            ]
+        )
+
+        second = dedupe_run_results(session, "run-1")
+        third = dedupe_run_results(session, "run-1")
+
+        rows = _rows(session, "run-1")
+        session.refresh(rows["Role a"])
+        assert (first.canonical_count, first.duplicates_found) == (2, 0)
+        assert (second.canonical_count, second.duplicates_found, second.history_duplicates) == (1, 2, 2)
+        assert third == DedupeOutcome(duplicates_found=0, canonical_count=0)
+        assert rows["Role a-copy"].canonical_id == rows["Role a"].id
+        assert rows["Role a-text"].canonical_id == rows["Role a"].id
+        assert rows["Role a"].duplicate_count == 2
+        assert not rows["Role c"].is_duplicate
+    finally:
+        session.close()
+
+
+def test_ingestion_stores_shingles_and_dedupe_reads_them_without_page_text(tmp_path):
+    session = open_session(tmp_path / "run.db")
+    try:
+        ResultRepository(session).write_all(
+            [
+                _result("run-1", "a", normalized_url="url-a", text=_POSTING),
+                _result("run-1", "b", normalized_url="url-b", text=_POSTING),
+            ]
+        )
+        stored = session.execute(select(RunItemShingles).order_by(RunItemShingles.item_id)).scalars().all()
+        assert len(stored) == 2
+        assert decode_shingles(stored[0].hashes).tolist() == item_shingles("Role a", "Remote", _POSTING).tolist()
+
+        # Dedupe only needs the stored hashes
+        session.execute(text("DELETE FROM run_item_texts"))
+        session.commit()
+        outcome = dedupe_run_results(session, "run-1")
+
+        assert outcome.similar_duplicates == 1
+        assert _rows(session, "run-1")["Role b"].canonical_id == _rows(session, "run-1")["Role a"].id
+    finally:
+        session.close()
+
+
+def test_rows_without_stored_shingles_are_backfilled_by_dedupe(tmp_path):
+    session = open_session(tmp_path / "run.db")
+    try:
+        ResultRepository(session).write_all([_result("run-1", "a", normalized_url="url-a", text=_POSTING)])
+        session.execute(text("DELETE FROM run_item_shingles"))
+        session.commit()
+
+        dedupe_run_results(session, "run-1")
+
+        stored = session.execute(select(RunItemShingles)).scalars().one()
+        assert decode_shingles(stored.hashes).tolist() == item_shingles("Role a", "Remote", _POSTING).tolist()
+    finally:
+        session.close()
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import logging
+import os
+from pathlib import Path
+import sqlite3
+
+import numpy as np
+
+from app.db.results_repository import ResultRepository
+from app.db.session import open_session
+from app.pipelines.evaluation import EvaluationDatasetProvider
+from app.schemas.results import ResultMetadata
+from app.services.evaluation_dataset import EvaluationDatasetCache
+from app.services.feature_store import FeatureMatrix, featurize_rows
+from app.services.run_item_export import export_root_for, export_run, sync_exports
+
+
+def _result(run_id: str, title: str, *, day: int, score: float | None) -> ResultMetadata:
+    created_at = datetime(2026, 2, day, 12, 0, tzinfo=timezone.utc)
+    return ResultMetadata(
+        run_id=run_id,
+        query_id="q1",
+        query_text="python",
+        search_query="site:example.com python",
+        domain="example.com",
+        title=title,
+        snippet=f"{title} snippet",
+        raw_url=f"https://example.com/{title}",
+        final_url=f"https://example.com/{title}",
+        created_at=created_at,
+        updated_at=created_at,
+        relevance_score=score,
+        scored_at=None if score is None else f"2026-02-{day:02d}T12:00:00Z",
+    )
+
+
+def _write(data_dir: Path, results: list[ResultMetadata]) -> Path:
+    db_path = data_dir / "db" / "runs" / "active.db"
+    session = open_session(db_path)
+    try:
+        ResultRepository(session).write_all(results)
+    finally:
+        session.close()
+    (data_dir / "db" / "current-db.txt").write_text("db/runs/active.db", encoding="utf-8")
+    _touch(db_path)
+    return db_path
+
+
+def _touch(path: Path) -> None:
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_unchanged_db_is_served_from_memory_and_new_rows_are_appended(tmp_path, caplog):
+    data_dir = tmp_path / "data"
+    _write(data_dir, [_result("run-1", "alpha", day=8, score=0.8), _result("run-1", "beta", day=8, score=-0.2)])
+    provider = EvaluationDatasetProvider(data_dir=data_dir)
+
+    first = provider.load_dataset()
+    assert provider.load_dataset() is first
+
+    _write(data_dir, [_result("run-2", "gamma", day=9, score=0.4), _result("run-2", "delta", day=9, score=None)])
+    with caplog.at_level(logging.INFO, logger="app.services.evaluation_dataset"):
+        extended = provider.load_dataset()
+
+    assert "evaluation_dataset.extended added=1 rows=3" in caplog.text
+    assert extended.dataset_id == "active.db:3"
+    assert extended.labels == [1, 0, 1]
+    assert [row["title"] for row in extended.features] == ["alpha", "beta", "gamma"]
+    assert extended.features[-1] == {"title": "gamma", "snippet": "gamma snippet", "domain": "example.com"}
+    expected = featurize_rows(list(extended.features))
+    assert np.array_equal(extended.matrix.indptr, expected.indptr)
+    assert np.array_equal(extended.matrix.indices, expected.indices)
+
+
+def test_changed_labels_rebuild_the_dataset(tmp_path, caplog):
+    data_dir = tmp_path / "data"
+    db_path = _write(
+        data_dir, [_result("run-1", "alpha", day=8, score=0.8), _result("run-1", "beta", day=8, score=-0.2)]
+    )
+    provider = EvaluationDatasetProvider(data_dir=data_dir)
+    provider.load_dataset()
+
+    with sqlite3.connect(db_path) as connection:
+        connection.execute("UPDATE run_items SET relevance_score = 0.5 WHERE title = 'beta'")
+    _touch(db_path)
+    with caplog.at_level(logging.INFO, logger="app.services.evaluation_dataset"):
+        dataset = provider.load_dataset()
+
+    assert "evaluation_dataset.rebuilt rows=2" in caplog.text
+    assert dataset.labels == [1, 1]
+
+
+def test_balanced_label_flips_rebuild_the_dataset(tmp_path, caplog):
+    data_dir = tmp_path / "data"
+    db_path = _write(
+        data_dir, [_result("run-1", "alpha", day=8, score=0.8), _result("run-1", "beta", day=8, score=-0.2)]
+    )
+    provider = EvaluationDatasetProvider(data_dir=data_dir)
+    assert provider.load_dataset().labels == [1, 0]
+
+    # One label goes 1 -> 0 and the other 0 -> 1: the row count and label sum are unchanged
+    with sqlite3.connect(db_path) as connection:
+        connection.execute("UPDATE run_items SET relevance_score = -0.5 WHERE title = 'alpha'")
+        connection.execute("UPDATE run_items SET relevance_score = 0.5 WHERE title = 'beta'")
+    _touch(db_path)
+    with caplog.at_level(logging.INFO, logger="app.services.evaluation_dataset"):
+        dataset = provider.load_dataset()
+
+    assert "evaluation_dataset.rebuilt rows=2" in caplog.text
+    assert dataset.labels == [0, 1]
+
+
+def test_exports_reread_only_new_or_rewritten_partitions(tmp_path, caplog):
+    data_dir = tmp_path / "data"
+    db_path = _write(
+        data_dir, [_result("run-1", "alpha", day=8, score=0.8), _result("run-2", "beta", day=9, score=-0.2)]
+    )
+    export_root = export_root_for(data_dir)
+    sync_exports(db_path, export_root)
+    cache = EvaluationDatasetCache()
+    first, _ = cache.load_exports(export_root, db_path)
+
+    _write(data_dir, [_result("run-3", "gamma", day=10, score=0.3)])
+    export_run(db_path, "run-3", export_root)
+    with caplog.at_level(logging.INFO, logger="app.services.evaluation_dataset"):
+        loaded = cache.load_exports(export_root, db_path)
+    columns, source = loaded
+
+    assert "partitions=3 current=3 read=1 db_runs=0 rows=3" in caplog.text
+    assert source == "exports[3]+active.db[0]"
+    assert columns.labels.tolist() == [1, 0, 1]
+    assert columns.texts["title"].to_pylist() == ["alpha", "beta", "gamma"]
+    assert len(first) == 2 and cache.load_exports(export_root, db_path) is loaded
+
+
+def test_feature_matrix_concatenate_matches_single_build():
+    rows = [{"title": f"role {index}", "snippet": "python" * (index % 3), "domain": "x.com"} for index in range(7)]
+
+    stacked = FeatureMatrix.concatenate([featurize_rows(rows[:3]), featurize_rows([]), featurize_rows(rows[3:])])
+    whole = featurize_rows(rows)
+
+    assert np.array_equal(stacked.indptr, whole.indptr)
+    assert np.array_equal(stacked.indices, whole.indices)
+    assert np.array_equal(stacked.values, whole.values)
@@ -1,8 +1,14 @@
 import asyncio
 from dataclasses import dataclass
 from pathlib import Path
+import sqlite3
+import threading
 
+import pytest
+
+from app.models.linear_model import HashedLogisticModel
 from app.pipelines.evaluation import EvaluationDataset, EvaluationPipeline, get_results, get_status
+from app.services.cross_validation import FoldPool, stratified_folds
 from app.services.evaluation_store import EvaluationStore
 
 
@@ -89,8 +95,125 @@ def test_evaluation_pipeline_persists_metrics_and_failures(tmp_path: Path) -> No
     assert ok_result["modelVersion"] == "1.2.3"
     assert ok_result["datasetId"] == "dataset-1"
     assert set(ok_result["metrics"].keys()) == {"precision", "recall", "f1", "accuracy"}
+    assert ok_result["ranking"]["rocAuc"] == 1.0
+    # Scores 1 and 0 are probabilities 1.0 and 0.5
+    assert ok_result["ranking"]["calibration"]["count"] == [0, 0, 0, 0, 0, 2, 0, 0, 0, 2]
 
     failed_result = next(item for item in results_payload["results"] if item["modelId"] == "bad-model")
     assert failed_result["status"] == "failed"
     assert failed_result["metrics"] == {}
     assert failed_result["error"] is not None
+
+
+class _MajorityModel:
+    def fit(self, X, y):
+        self.positive = sum(y) * 2 >= len(y)
+        return self
+
+    def predict(self, X):
+        return [1.0 if self.positive else 0.0 for _ in X]
+
+
+def test_stratified_folds_keep_label_balance() -> None:
+    labels = [1] * 9 + [0] * 21
+
+    assignment = stratified_folds(labels, 3)
+
+    for fold in range(3):
+        members = [label for label, assigned in zip(labels, assignment) if assigned == fold]
+        assert len(members) == 10
+        assert sum(members) == 3
+
+
+class _RecordingFoldPool(FoldPool):
+    threads: list[str] = []
+
+    def __init__(self, *args, **kwargs) -> None:
+        self.threads.append(threading.current_thread().name)
+        super().__init__(*args, **kwargs)
+
+    def warm(self) -> None:
+        self.threads.append(threading.current_thread().name)
+        super().warm()
+
+
+def test_k_fold_evaluation_stores_per_fold_and_aggregate_metrics(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr("app.pipelines.evaluation.FoldPool", _RecordingFoldPool)
+    store = EvaluationStore(tmp_path / "evaluations.db")
+    rows = [{"title": f"python role {index}", "snippet": "remote", "domain": "x"} for index in range(12)]
+    rows += [{"title": f"cashier shift {index}", "snippet": "store", "domain": "y"} for index in range(12)]
+
+    class _Provider:
+        def load_dataset(self) -> EvaluationDataset:
+            return EvaluationDataset(dataset_id="dataset-cv", features=rows, labels=[1] * 12 + [0] * 12)
+
+    pipeline = EvaluationPipeline(
+        store=store,
+        registry=_FakeRegistry(
+            models={"linear": HashedLogisticModel(), "majority": _MajorityModel(), "bad-model": _FailingModel()},
+            versions={"linear": "1.0.0", "majority": "0.1.0", "bad-model": "2.0.0"},
+        ),
+        dataset_provider=_Provider(),
+        eval_workers=2,
+        folds=0,
+    )
+
+    async def run_case() -> dict:
+        payload = pipeline.trigger_evaluation(folds=4)
+        for _ in range(600):
+            status_payload = get_status(store, payload["evaluationId"])
+            if status_payload is not None and status_payload["status"] != "running":
+                break
+            await asyncio.sleep(0.05)
+        return payload
+
+    payload = asyncio.run(run_case())
+
+    assert payload["folds"] == 4
+    # The workers are spawned and sent the dataset off the event loop's thread
+    assert len(_RecordingFoldPool.threads) == 2
+    assert threading.main_thread().name not in _RecordingFoldPool.threads
+    results = {item["modelId"]: item for item in get_results(store, payload["evaluationId"])["results"]}
+    linear = results["linear"]["crossValidation"]
+    assert linear["folds"] == 4
+    assert [fold["rows"] for fold in linear["perFold"]] == [6, 6, 6, 6]
+    assert results["linear"]["metrics"] == linear["mean"]
+    assert linear["mean"]["accuracy"] == 1.0
+    assert linear["variance"]["accuracy"] == 0.0
+    # Ranking metrics are computed over the pooled out-of-fold scores
+    assert results["linear"]["ranking"]["rows"] == 24
+    assert results["linear"]["ranking"]["rocAuc"] == 1.0
+    # Every training split is balanced, so the majority model always predicts one class
+    assert results["majority"]["metrics"]["accuracy"] == 0.5
+    assert results["bad-model"]["status"] == "failed"
+    assert results["bad-model"]["crossValidation"] is None
+
+
+def test_store_adds_cross_validation_column_to_existing_databases(tmp_path: Path) -> None:
+    db_path = tmp_path / "evaluations.db"
+    with sqlite3.connect(db_path) as connection:
+        connection.execute(
+            """
+            CREATE TABLE evaluation_results (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                evaluation_id TEXT NOT NULL,
+                model_id TEXT NOT NULL,
+                model_version TEXT NOT NULL,
+                dataset_id TEXT NOT NULL,
+                status TEXT NOT NULL,
+                metrics_json TEXT NOT NULL,
+                error TEXT,
+                duration_ms INTEGER NOT NULL,
+                created_at TEXT NOT NULL,
+                UNIQUE(evaluation_id, model_id, model_version)
+            )
+            """
+        )
+
+    EvaluationStore(db_path)
+
+    with sqlite3.connect(db_path) as connection:
+        columns = {row[1] for row in connection.execute("PRAGMA table_info(evaluation_results)")}
+    assert "cross_validation_json" in columns
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import numpy as np
+
+from app.services.feature_store import (
+    FEATURIZER_VERSION,
+    N_FEATURES,
+    FeatureMatrix,
+    decode_features,
+    encode_features,
+    featurize,
+    featurize_rows,
+    supports_feature_matrix,
+    vectors_from_rows,
+)
+
+
+def test_featurize_counts_tokens_per_field():
+    indices, counts = featurize("Python python", "Python jobs", "Example.com")
+
+    assert indices.dtype == np.uint32 and counts.dtype == np.uint16
+    assert np.all(np.diff(indices.astype(np.int64)) > 0)
+    assert np.all(indices < N_FEATURES)
+    # t:python twice, s:python, s:jobs and the domain are distinct features
+    assert sorted(counts.tolist()) == [1, 1, 1, 2]
+    assert featurize(None, "", None)[0].size == 0
+
+
+def test_encoded_features_round_trip():
+    vector = featurize("Senior Python engineer", "Remote role", "example.com")
+
+    indices, counts = decode_features(encode_features(vector))
+
+    assert len(encode_features(vector)) == 6 * vector[0].size
+    assert np.array_equal(indices, vector[0]) and np.array_equal(counts, vector[1])
+
+
+def test_feature_matrix_dot_matches_dense_product():
+    rows = [
+        {"title": "Python engineer", "snippet": "Backend", "domain": "a.com"},
+        {"title": "", "snippet": "", "domain": ""},
+        {"title": "Cashier", "snippet": "Retail retail", "domain": "b.com"},
+    ]
+    matrix = featurize_rows(rows)
+    weights = np.random.default_rng(7).normal(size=N_FEATURES)
+
+    assert matrix.shape == (3, N_FEATURES)
+    assert np.allclose(matrix.dot(weights), matrix.to_dense(np.float64) @ weights)
+    assert np.array_equal(matrix.take([2]).to_dense(), matrix.to_dense()[[2]])
+    assert len(FeatureMatrix.from_vectors([])) == 0
+
+
+def test_vectors_from_rows_recomputes_missing_and_stale_versions():
+    stored = featurize("Stored", "", None)
+    rows = [
+        (FEATURIZER_VERSION, encode_features(stored), "Ignored", "", None),
+        ("hashed-tokens-v0", encode_features(stored), "Fresh", "", None),
+        (None, None, "Missing", "", None),
+    ]
+
+    vectors, recomputed = vectors_from_rows(rows)
+
+    assert recomputed == [1, 2]
+    assert np.array_equal(vectors[0][0], stored[0])
+    assert np.array_equal(vectors[1][0], featurize("Fresh", "", None)[0])
+
+
+def test_supports_feature_matrix_requires_matching_version():
+    class _Model:
+        featurizer_version = FEATURIZER_VERSION
+
+        def fit_features(self, X, y):
+            return self
+
+        def predict_features(self, X):
+            return []
+
+    class _Stale(_Model):
+        featurizer_version = "hashed-tokens-v0"
+
+    assert supports_feature_matrix(_Model())
+    assert not supports_feature_matrix(_Stale())
+    assert not supports_feature_matrix(object())
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from app.models.linear_model import HashedLogisticModel
+from app.services import inference_pool
+from app.services.feature_store import featurize_rows
+from app.services.inference_pool import InferencePool, ModelNotLoadedError, run_fit_predict, run_predict
+from app.services.model_artifacts import write_artifact
+
+
+CONFIG_PATH = Path(__file__).resolve().parents[2] / "config" / "ml" / "models.yaml"
+
+
+def _rows(count: int) -> tuple[list[dict[str, str]], list[int]]:
+    rows, labels = [], []
+    for index in range(count):
+        relevant = index % 2 == 0
+        rows.append(
+            {
+                "title": "Staff data engineer" if relevant else "Warehouse picker",
+                "snippet": f"spark pipelines {index}" if relevant else f"night shift {index}",
+                "domain": "jobs.example.com",
+            }
+        )
+        labels.append(int(relevant))
+    return rows, labels
+
+
+@pytest.fixture(scope="module")
+def artifact_dir(tmp_path_factory):
+    return tmp_path_factory.mktemp("trained")
+
+
+@pytest.fixture(scope="module")
+def pool(artifact_dir):
+    # One spawned worker is enough to exercise the IPC path; batches of 16 force splitting
+    pool = InferencePool(1, config_path=CONFIG_PATH, artifact_dir=artifact_dir, batch_size=16)
+    inference_pool.set_inference_pool(pool)
+    yield pool
+    inference_pool.set_inference_pool(None)
+    pool.close()
+
+
+def test_fit_predict_matches_in_process_and_leaves_worker_model_untouched(pool):
+    rows, labels = _rows(40)
+    matrix = featurize_rows(rows)
+
+    predictions, fitted = pool.fit_predict("hashed_logistic", matrix, labels, use_features=True, return_model=True)
+    local = HashedLogisticModel().fit(matrix, labels)
+
+    assert np.allclose(predictions, local.predict(matrix))
+    assert np.allclose(fitted.weights, local.weights)
+    # The worker fitted a copy; its own instance still predicts from zero weights
+    assert pool.predict("hashed_logistic", matrix, use_features=True) == [0.0] * len(rows)
+
+
+def test_versions_resolve_to_trained_artifacts_and_batches_are_reassembled_in_order(pool, artifact_dir):
+    rows, labels = _rows(50)
+    matrix = featurize_rows(rows)
+    trained = HashedLogisticModel().fit(matrix, labels)
+    write_artifact(artifact_dir, model_id="hashed_logistic", model_version="1.0.0-r1", model=trained, metrics={})
+
+    predictions = pool.predict("hashed_logistic", matrix, use_features=True, version="1.0.0-r1")
+
+    assert np.allclose(predictions, trained.predict(matrix))
+    assert np.allclose(pool.predict("hashed_logistic", rows, use_features=False, version="1.0.0-r1"), predictions)
+    # Unknown versions are never served by the configured model; callers fall back to their own instance
+    with pytest.raises(ModelNotLoadedError, match="version '9.9.9'"):
+        pool.predict("hashed_logistic", rows, use_features=False, version="9.9.9")
+
+
+def test_run_helpers_fall_back_to_local_model_when_workers_lack_it(pool):
+    rows, labels = _rows(10)
+    local = HashedLogisticModel()
+
+    predictions, fitted = run_fit_predict("not_in_config", local, rows, labels, use_features=False, return_model=True)
+
+    # The caller's instance is never fitted in place
+    assert fitted is not local and not local.weights.any()
+    assert np.allclose(predictions, fitted.predict(rows))
+    assert np.allclose(run_predict("not_in_config", fitted, rows, use_features=False), predictions)
+
+
+def test_model_errors_are_raised_in_the_caller(pool):
+    with pytest.raises(inference_pool.InferenceWorkerError, match="ValueError"):
+        pool.fit_predict("hashed_logistic", featurize_rows(_rows(4)[0]), [1, 0], use_features=True)
+    # The worker survives a failed request
+    assert pool.predict("baseline", _rows(3)[0], use_features=False) == [0.0, 0.0, 0.0]
+
+
+def test_dead_worker_is_replaced(pool):
+    pool._workers[0].process.kill()
+    pool._workers[0].process.join()
+
+    with pytest.raises(inference_pool.InferenceWorkerError):
+        pool.predict("baseline", _rows(2)[0], use_features=False)
+    assert pool.predict("baseline", _rows(2)[0], use_features=False) == [0.0, 0.0]
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import pickle
+
+import numpy as np
+import pytest
+
+from app.models.linear_model import HashedLogisticModel
+from app.registry.model_interface import is_model_instance
+from app.services.feature_store import featurize_rows, supports_feature_matrix
+
+
+def _rows(count: int) -> tuple[list[dict[str, str]], list[int]]:
+    rows, labels = [], []
+    for index in range(count):
+        relevant = index % 3 == 0
+        rows.append(
+            {
+                "title": "Senior Python engineer" if relevant else "Retail cashier",
+                "snippet": f"backend platform role {index}" if relevant else f"store shift role {index}",
+                "domain": f"jobs{index % 5}.example.com",
+            }
+        )
+        labels.append(int(relevant))
+    return rows, labels
+
+
+def test_fit_separates_relevant_rows_and_scores_in_range():
+    rows, labels = _rows(90)
+
+    model = HashedLogisticModel().fit(rows, labels)
+    scores = np.asarray(model.predict(rows))
+
+    assert is_model_instance(model) and supports_feature_matrix(model)
+    assert np.all((scores >= -1.0) & (scores <= 1.0))
+    assert np.array_equal(scores > 0, np.asarray(labels, dtype=bool))
+
+
+def test_feature_matrix_and_dict_inputs_agree():
+    rows, labels = _rows(30)
+    matrix = featurize_rows(rows)
+
+    model = HashedLogisticModel().fit_features(matrix, labels)
+
+    assert np.allclose(model.predict_features(matrix), model.predict(rows))
+    assert np.allclose(model.predict_proba(matrix), (np.asarray(model.predict(rows)) + 1) / 2)
+
+
+def test_partial_fit_updates_weights_incrementally():
+    rows, labels = _rows(60)
+    model = HashedLogisticModel()
+
+    model.partial_fit(rows[:30], labels[:30])
+    first = model.predict_proba(rows[30:])
+    model.partial_fit(rows[30:], labels[30:])
+
+    assert model.samples_seen == 60
+    positive = np.asarray(labels[30:], dtype=bool)
+    # The second batch pushes its own rows further towards their labels
+    assert np.all(model.predict_proba(rows[30:])[positive] > first[positive])
+
+
+def test_model_pickles_and_rejects_mismatched_labels():
+    rows, labels = _rows(12)
+    model = HashedLogisticModel().fit(rows, labels)
+
+    restored = pickle.loads(pickle.dumps(model))
+
+    assert np.allclose(restored.predict(rows), model.predict(rows))
+    with pytest.raises(ValueError):
+        model.fit(rows, labels[:-1])
@@ -1,4 +1,16 @@
-from app.services.metrics import calculate_classification_counts, calculate_metrics
+import json
+
+import numpy as np
+
+from app.models.linear_model import HashedLogisticModel
+from app.services.metrics import (
+    calculate_classification_counts,
+    calculate_metrics,
+    calibration_bins,
+    predicted_labels,
+    ranking_summary,
+    threshold_counts,
+)
 
 
 def test_calculate_metrics_returns_expected_values() -> None:
@@ -35,3 +47,74 @@ def test_counts_reject_non_binary_values() -> None:
         raised = True
 
     assert raised
+
+
+def test_threshold_counts_match_brute_force_at_every_threshold() -> None:
+    rng = np.random.default_rng(7)
+    labels = rng.integers(0, 2, size=200)
+    scores = rng.integers(0, 20, size=200) / 20.0
+
+    counts = threshold_counts(labels, scores)
+
+    assert counts.thresholds.tolist() == sorted(set(scores.tolist()), reverse=True)
+    for threshold, tp, fp in zip(counts.thresholds, counts.true_positive, counts.false_positive):
+        predicted = scores >= threshold
+        assert tp == int(np.sum(predicted & (labels == 1)))
+        assert fp == int(np.sum(predicted & (labels == 0)))
+
+
+def test_ranking_areas_and_precision_at_k() -> None:
+    labels = [1, 1, 0, 1, 0, 0]
+
+    perfect = threshold_counts(labels, [0.9, 0.8, 0.3, 0.7, 0.2, 0.1])
+    reversed_order = threshold_counts(labels, [0.1, 0.2, 0.7, 0.3, 0.8, 0.9])
+    tied = threshold_counts(labels, [0.5] * 6)
+
+    assert perfect.roc_auc() == 1.0 and perfect.average_precision() == 1.0
+    assert reversed_order.roc_auc() == 0.0
+    assert tied.roc_auc() == 0.5 and tied.average_precision() == 0.5
+    assert perfect.precision_at(3) == 1.0
+    assert reversed_order.precision_at(2) == 0.0
+    assert perfect.precision_at(7) is None
+    assert threshold_counts([0, 0], [0.2, 0.4]).roc_auc() is None
+
+
+def test_ranking_summary_is_compact_and_json_serialisable() -> None:
+    rng = np.random.default_rng(3)
+    labels = rng.integers(0, 2, size=10_000)
+    scores = np.clip(labels * 0.6 + rng.random(10_000) * 1.4 - 1.0, -1.0, 1.0)
+
+    summary = ranking_summary(labels, scores, curve_points=32)
+
+    assert len(summary["roc"]["fpr"]) == 32 and summary["roc"]["fpr"][0] == 0.0
+    assert summary["roc"]["tpr"][-1] == 1.0
+    assert len(summary["pr"]["recall"]) == 32
+    assert 0.5 < summary["rocAuc"] <= 1.0
+    assert set(summary["precisionAt"]) == {"10", "50", "100"}
+    calibration = summary["calibration"]
+    assert sum(calibration["count"]) == 10_000 and len(calibration["positiveRate"]) == 10
+    assert len(json.dumps(summary)) < 4_000
+
+
+def test_calibration_and_thresholds_map_relevance_scores_to_probabilities() -> None:
+    rows = [
+        {"title": "Python engineer" if index % 2 else "Line cook", "snippet": f"role {index}", "domain": "example.com"}
+        for index in range(40)
+    ]
+    labels = [index % 2 for index in range(40)]
+    model = HashedLogisticModel(epochs=3).fit(rows, labels)
+    scores = np.asarray(model.predict(rows))
+    probabilities = model.predict_proba(rows)
+
+    # Cooks score below 0, where clipping to [0, 1] would pile them into the first bin
+    assert scores.min() < 0.0
+    calibration = calibration_bins(labels, scores)
+    index = np.minimum((probabilities * 10).astype(np.int64), 9)
+    count = np.bincount(index, minlength=10)
+    assert calibration["count"] == count.tolist()
+    occupied = count > 0
+    mean_probability = np.bincount(index, weights=probabilities, minlength=10)[occupied] / count[occupied]
+    assert np.allclose(np.asarray(calibration["meanScore"])[occupied], mean_probability, atol=1e-4)
+    thresholds = ranking_summary(labels, scores)["pr"]["threshold"]
+    assert thresholds[0] == round(float(probabilities.max()), 4) and min(thresholds) >= 0.0
+    assert predicted_labels(scores).tolist() == (probabilities > 0.5).astype(int).tolist()
@@ -0,0 +1,138 @@
+import random
+
+import numpy as np
+import pytest
+
+from app.pipelines.dedupe import _signature_pool, _similar_groups, _similar_groups_parallel, shutdown_dedupe_pool
+from app.services.minhash import (
+    LshIndex,
+    MinHasher,
+    candidate_probability,
+    decode_shingles,
+    encode_shingles,
+    jaccard,
+    optimal_bands,
+    shingle_hashes,
+)
+
+
+def _corpus(rows: int, seed: int = 3) -> list[tuple[int, str]]:
+    rng = random.Random(seed)
+    vocabulary = [f"w{index}" for index in range(800)]
+    corpus: list[tuple[int, str]] = []
+    while len(corpus) < rows:
+        base = rng.choices(vocabulary, k=rng.randint(40, 120))
+        for _ in range(rng.randint(1, 3)):
+            words = [rng.choice(vocabulary) if rng.random() < 0.01 else word for word in base]
+            corpus.append((len(corpus) + 1, " ".join(words)))
+    rng.shuffle(corpus)
+    return corpus[:rows]
+
+
+def _exact_groups(corpus: list[tuple[int, str]], threshold: float) -> list[tuple[int, list[int]]]:
+    """O(n^2) pairwise scan with exact Jaccard, claiming rows in input order like ``_similar_groups``."""
+    hashes = [shingle_hashes(text) for _, text in corpus]
+    groups: list[tuple[int, list[int]]] = []
+    claimed: set[int] = set()
+    for i, left in enumerate(hashes):
+        if i in claimed or not left.size:
+            continue
+        matches = [
+            j
+            for j in range(i + 1, len(corpus))
+            if j not in claimed and hashes[j].size and jaccard(left, hashes[j]) >= threshold
+        ]
+        if matches:
+            claimed.update(matches)
+            groups.append((corpus[i][0], [corpus[j][0] for j in matches]))
+    return groups
+
+
+def test_shingle_hashes_match_string_trigram_jaccard():
+    left = "Senior Python Engineer building data platform services remotely"
+    right = "Senior Python Engineer building data pipelines services remotely"
+
+    trigrams = [
+        {" ".join(words[i : i + 3]) for i in range(len(words) - 2)}
+        for words in (left.lower().split(), right.lower().split())
+    ]
+    expected = len(trigrams[0] & trigrams[1]) / len(trigrams[0] | trigrams[1])
+
+    assert shingle_hashes(left).size == len(trigrams[0])
+    assert jaccard(shingle_hashes(left), shingle_hashes(right)) == pytest.approx(expected)
+    assert shingle_hashes("two words").size == 0
+    assert np.array_equal(shingle_hashes("A b C d"), shingle_hashes("a  B c\nD"))
+
+
+def test_minhash_estimates_jaccard():
+    hasher = MinHasher(256)
+    left = shingle_hashes(" ".join(f"w{index}" for index in range(300)))
+    right = shingle_hashes(" ".join(f"w{index}" for index in range(60, 360)))
+
+    estimate = float(np.mean(hasher.signature(left) == hasher.signature(right)))
+
+    assert estimate == pytest.approx(jaccard(left, right), abs=0.08)
+    assert hasher.signature(np.empty(0, dtype=np.uint64)) is None
+
+
+def test_lsh_index_returns_keys_sharing_a_band():
+    hasher = MinHasher(64)
+    index = LshIndex(64, bands=16)
+    text = " ".join(f"w{index}" for index in range(100))
+    index.insert("a", hasher.signature(shingle_hashes(text)))
+    index.insert("b", hasher.signature(shingle_hashes("completely different words in this one posting")))
+
+    assert index.query(hasher.signature(shingle_hashes(text + " w100"))) == {"a"}
+    with pytest.raises(ValueError):
+        LshIndex(64, bands=10)
+
+
+def test_optimal_bands_reaches_target_recall_at_threshold():
+    for threshold in (0.5, 0.7, 0.9):
+        bands = optimal_bands(threshold, 128)
+        assert 128 % bands == 0
+        assert candidate_probability(threshold, bands, 128 // bands) >= 0.999
+    assert optimal_bands(0.9, 128) < optimal_bands(0.5, 128)
+
+
+@pytest.mark.parametrize("threshold", [0.7, 0.9])
+def test_lsh_groups_match_exact_pairwise_scan(threshold):
+    corpus = _corpus(300)
+
+    exact = _exact_groups(corpus, threshold)
+    approximate = _similar_groups([(item_id, shingle_hashes(text)) for item_id, text in corpus], threshold)
+
+    assert exact
+    assert approximate == exact
+
+
+def test_encoded_shingles_round_trip_at_eight_bytes_each():
+    hashes = shingle_hashes("senior python engineer remote role with benefits")
+
+    payload = encode_shingles(hashes)
+
+    assert len(payload) == 8 * hashes.size
+    assert decode_shingles(payload).tolist() == hashes.tolist()
+    assert decode_shingles(b"").size == 0
+
+
+def test_parallel_grouping_matches_serial_first_id_canonical():
+    corpus = _corpus(300)
+    items = [(item_id, shingle_hashes(text)) for item_id, text in corpus]
+    # Chained near-duplicates: 1000~1001 and 1001~1002 but not 1000~1002, so a
+    # transitive merge would differ from the greedy claim
+    chain = ["a b c d e f g h i j k l", "a b c d e f g h i j k x", "z b c d e f g h i j k x"]
+    items += [(1000 + offset, shingle_hashes(text)) for offset, text in enumerate(chain)]
+
+    serial = _similar_groups(items, 0.75)
+    try:
+        parallel = _similar_groups_parallel(items, 0.75, workers=2)
+        pool = _signature_pool(2)
+        assert _similar_groups_parallel(items, 0.75, workers=2) == parallel
+        assert _signature_pool(2) is pool
+    finally:
+        shutdown_dedupe_pool()
+
+    assert parallel == serial
+    assert (1000, [1001]) in serial
+    assert all(1002 not in duplicates and canonical != 1002 for canonical, duplicates in serial)
@@ -5,6 +5,8 @@ from sqlalchemy.orm import sessionmaker
 
 from app.db.models import Base, RunResult
 from app.pipelines.scoring import score_run_results
+from app.services import active_model_cache
+from app.services.active_model_cache import ActiveModelReference, get_active_model_reference
 from app.services.evaluation_store import EvaluationResultRow, EvaluationStore
 from app.services.model_activation import ModelActivationService
 
@@ -27,11 +29,19 @@ class _PredictingModel:
 class _PredictingRegistry:
     is_initialized = True
 
+    def __init__(self, versions: set[str] | None = None) -> None:
+        self._versions = versions
+
     def get_model(self, identifier: str):
         if identifier == "model-a":
             return _PredictingModel()
         return None
 
+    def get_model_version(self, identifier: str, version: str | None):
+        if self._versions is not None and version not in self._versions:
+            return None
+        return self.get_model(identifier)
+
 
 def _seed_evaluation_result(store: EvaluationStore, *, evaluation_id: str, model_id: str, model_version: str):
     store.create_run(
@@ -82,7 +92,7 @@ def test_activation_and_rollback_history(tmp_path):
     assert history[0]["action"] == "rollback"
 
 
-def test_scoring_uses_active_model_version(tmp_path, monkeypatch):
+def _score_with_active_version(tmp_path, monkeypatch, registry: _PredictingRegistry) -> tuple[float, str, str | None]:
     data_dir = tmp_path / "data"
     data_dir.mkdir(parents=True, exist_ok=True)
     evaluations_db = data_dir / "db" / "evaluations.db"
@@ -97,7 +107,7 @@ def test_scoring_uses_active_model_version(tmp_path, monkeypatch):
     )
 
     monkeypatch.setenv("DATA_DIR", str(data_dir))
-    monkeypatch.setattr("app.pipelines.scoring.get_registry", lambda: _PredictingRegistry())
+    monkeypatch.setattr("app.pipelines.scoring.get_registry", lambda: registry)
 
     engine = create_engine("sqlite:///:memory:")
     Base.metadata.create_all(engine)
@@ -127,6 +137,58 @@ def test_scoring_uses_active_model_version(tmp_path, monkeypatch):
     assert outcome.scored_count == 1
 
     row = session.query(RunResult).filter_by(run_id="run-1").one()
-    assert row.relevance_score == 0.42
-    assert row.score_version == "9.9.9"
+    scored = (row.relevance_score, row.score_version, row.score_model_id)
     session.close()
+    return scored
+
+
+def test_scoring_uses_active_model_version(tmp_path, monkeypatch):
+    assert _score_with_active_version(tmp_path, monkeypatch, _PredictingRegistry()) == (0.42, "9.9.9", "model-a")
+
+
+def test_scoring_records_the_baseline_when_the_active_version_is_unavailable(tmp_path, monkeypatch):
+    score, version, model_id = _score_with_active_version(
+        tmp_path, monkeypatch, _PredictingRegistry(versions={"1.0.0"})
+    )
+
+    assert score != 0.42
+    assert (version, model_id) == ("baseline", None)
+
+
+def test_active_model_reference_is_cached_until_activation(tmp_path, monkeypatch):
+    db_path = tmp_path / "evaluations.db"
+    store = EvaluationStore(db_path)
+    _seed_evaluation_result(store, evaluation_id="eval-a", model_id="model-a", model_version="1.0.0")
+    _seed_evaluation_result(store, evaluation_id="eval-b", model_id="model-b", model_version="2.0.0")
+    service = ModelActivationService(store=store, registry=_FakeRegistry({"model-a", "model-b"}))
+    service.activate_model(model_id="model-a")
+
+    reads = []
+    read_active_model = active_model_cache._read_active_model
+    monkeypatch.setattr(
+        active_model_cache, "_read_active_model", lambda path: reads.append(path) or read_active_model(path)
+    )
+    # Pin the file stamp so only the explicit invalidation can refresh the entry
+    monkeypatch.setattr(active_model_cache, "_db_stamp", lambda path: (1,))
+
+    assert get_active_model_reference(db_path) == ActiveModelReference("model-a", "1.0.0")
+    assert get_active_model_reference(db_path) == ActiveModelReference("model-a", "1.0.0")
+    assert len(reads) == 1
+
+    service.activate_model(model_id="model-b")
+
+    assert get_active_model_reference(db_path) == ActiveModelReference("model-b", "2.0.0")
+    assert len(reads) == 2
+
+
+def test_active_model_reference_refreshes_when_db_changes_on_disk(tmp_path):
+    db_path = tmp_path / "evaluations.db"
+    assert get_active_model_reference(db_path) is None
+
+    store = EvaluationStore(db_path)
+    assert get_active_model_reference(db_path) is None
+
+    # Written as another process would: no in-process invalidation
+    store.activate_model(model_id="model-a", model_version="3.0.0", activated_by="tester", action="activated")
+
+    assert get_active_model_reference(db_path) == ActiveModelReference("model-a", "3.0.0")
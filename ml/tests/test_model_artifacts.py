@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pytest
+
+from app.models.linear_model import HashedLogisticModel
+from app.models.stub_model import BaselineModel
+from app.services.feature_store import FEATURIZER_VERSION, featurize_rows
+from app.services.model_artifacts import (
+    ArtifactError,
+    HEADER_NAME,
+    load_artifact,
+    read_header,
+    validate_artifact,
+    write_artifact,
+)
+
+
+def _trained_model() -> tuple[HashedLogisticModel, list[dict[str, str]]]:
+    rows = [
+        {"title": "Python engineer" if index % 2 else "Line cook", "snippet": f"role {index}", "domain": "example.com"}
+        for index in range(20)
+    ]
+    return HashedLogisticModel(epochs=3).fit(rows, [index % 2 for index in range(20)]), rows
+
+
+def test_round_trip_memory_maps_weights_and_keeps_predictions(tmp_path):
+    model, rows = _trained_model()
+
+    path = write_artifact(
+        tmp_path, model_id="hashed_logistic", model_version="1.0.0-r1", model=model, metrics={"f1": 0.9}
+    )
+    header, restored = load_artifact(path)
+
+    assert sorted(child.name for child in path.iterdir()) == [HEADER_NAME, "weights.npy"]
+    assert header.featurizer_version == FEATURIZER_VERSION
+    assert header.metrics == {"f1": 0.9}
+    assert isinstance(restored.weights, np.memmap)
+    assert restored.epochs == 3 and restored.bias == model.bias
+    assert np.allclose(restored.predict(featurize_rows(rows)), model.predict(rows))
+    # Copy-on-write: further training never touches the file
+    restored.partial_fit(rows, [1] * len(rows))
+    _, reloaded = load_artifact(path)
+    assert np.array_equal(reloaded.weights, model.weights)
+
+
+def test_validation_reads_only_the_header(tmp_path):
+    path = write_artifact(tmp_path, model_id="baseline", model_version="1.0.0-r2", model=BaselineModel(), metrics={})
+
+    assert validate_artifact(path, expected_version="1.0.0-r2").model_class == "app.models.stub_model:BaselineModel"
+    with pytest.raises(ArtifactError, match="version mismatch"):
+        validate_artifact(path, expected_version="1.0.0-r3")
+
+    model, _ = _trained_model()
+    weighted = write_artifact(tmp_path, model_id="m", model_version="1", model=model, metrics={})
+    (weighted / "weights.npy").write_bytes(b"not an array")
+    assert read_header(weighted).arrays["weights"]["shape"] == [model.weights.size]
+    (weighted / "weights.npy").unlink()
+    with pytest.raises(ArtifactError, match="missing array files"):
+        validate_artifact(weighted, expected_version="1")
+
+
+def test_rejects_unserialisable_state_and_foreign_headers(tmp_path):
+    model = BaselineModel()
+    model.callback = lambda value: value
+
+    with pytest.raises(ArtifactError, match="callback"):
+        write_artifact(tmp_path, model_id="baseline", model_version="1", model=model, metrics={})
+    assert list(tmp_path.iterdir()) == []
+
+    foreign = tmp_path / "foreign"
+    foreign.mkdir()
+    (foreign / HEADER_NAME).write_text(json.dumps({"format": "other"}), encoding="utf-8")
+    with pytest.raises(ArtifactError, match="not a model artifact"):
+        read_header(foreign)
+
+
+def test_headers_naming_classes_outside_the_model_packages_are_not_imported(tmp_path):
+    path = write_artifact(tmp_path, model_id="baseline", model_version="1", model=BaselineModel(), metrics={})
+    header = json.loads((path / HEADER_NAME).read_text(encoding="utf-8"))
+
+    for model_class in ("subprocess:Popen", "app.modelsx.evil:Model", "app.models.linear_model:FeatureMatrix"):
+        header["modelClass"] = model_class
+        (path / HEADER_NAME).write_text(json.dumps(header), encoding="utf-8")
+        with pytest.raises(ArtifactError, match=model_class):
+            load_artifact(path)
+
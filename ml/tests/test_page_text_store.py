@@ -0,0 +1,107 @@
+from datetime import datetime, timezone
+import sqlite3
+
+from alembic import command
+from alembic.config import Config
+import pytest
+from sqlalchemy import select
+
+from app.db.models import RunResult
+from app.db.page_text import IDENTITY_CODEC, ZLIB_CODEC, decode_page_text, encode_page_text
+from app.db.results_repository import ResultRepository
+from app.db.session import _alembic_ini_path, _migrations_path, open_session
+from app.schemas.results import ResultMetadata
+
+
+_NOW = datetime(2026, 2, 8, 12, 0, tzinfo=timezone.utc)
+
+
+def _result(title: str, visible_text: str | None) -> ResultMetadata:
+    return ResultMetadata(
+        run_id="run-1",
+        query_id="q1",
+        query_text="python",
+        search_query="site:example.com python",
+        domain="example.com",
+        title=title,
+        snippet="snippet",
+        raw_url=f"https://example.com/{title}",
+        final_url=f"https://example.com/{title}",
+        created_at=_NOW,
+        updated_at=_NOW,
+        visible_text=visible_text,
+    )
+
+
+def _alembic_config(db_path) -> Config:
+    config = Config(str(_alembic_ini_path()))
+    config.set_main_option("script_location", str(_migrations_path()))
+    config.set_main_option("sqlalchemy.url", f"sqlite:///{db_path}")
+    return config
+
+
+def test_page_text_codecs_round_trip():
+    text = "Senior Python Engineer " * 200
+
+    compressed = encode_page_text(text)
+
+    assert len(compressed) < len(text)
+    assert decode_page_text(ZLIB_CODEC, compressed) == text
+    assert decode_page_text(IDENTITY_CODEC, encode_page_text("plain", IDENTITY_CODEC)) == "plain"
+    assert decode_page_text(ZLIB_CODEC, None) is None
+    with pytest.raises(ValueError):
+        decode_page_text("brotli", b"")
+
+
+def test_visible_text_is_stored_compressed_in_side_table(tmp_path):
+    db_path = tmp_path / "texts.db"
+    session = open_session(db_path)
+    try:
+        ResultRepository(session).write_all([_result("with-text", "Remote Kubernetes role " * 50), _result("empty", None)])
+        session.expunge_all()
+        results = {row.title: row for row in session.execute(select(RunResult)).scalars()}
+        assert results["with-text"].visible_text == "Remote Kubernetes role " * 50
+        assert results["empty"].visible_text is None
+
+        results["with-text"].visible_text = "Updated text"
+        session.commit()
+        session.expunge_all()
+        assert session.execute(select(RunResult).where(RunResult.title == "with-text")).scalar_one().visible_text == "Updated text"
+    finally:
+        session.close()
+
+    with sqlite3.connect(db_path) as connection:
+        columns = {row[1] for row in connection.execute("PRAGMA table_info(run_items)")}
+        stored = connection.execute("SELECT codec, visible_text FROM run_item_texts").fetchall()
+        connection.execute("DELETE FROM run_items")
+        remaining = connection.execute("SELECT COUNT(*) FROM run_item_texts").fetchone()[0]
+
+    assert "visible_text" not in columns
+    assert stored == [(ZLIB_CODEC, encode_page_text("Updated text"))]
+    assert remaining == 0
+
+
+def test_migration_moves_existing_visible_text(tmp_path):
+    db_path = tmp_path / "legacy.db"
+    config = _alembic_config(db_path)
+    command.upgrade(config, "e5f6a7b8c9d0")
+    with sqlite3.connect(db_path) as connection:
+        connection.execute(
+            """
+            INSERT INTO run_items (
+                run_id, query_text, search_query, domain, title, snippet,
+                raw_url, final_url, created_at, updated_at, visible_text
+            ) VALUES ('run-1', 'q', 'q', 'example.com', 'Legacy', 's', 'u', 'u', 't', 't', 'Legacy page text')
+            """
+        )
+
+    command.upgrade(config, "head")
+
+    with sqlite3.connect(db_path) as connection:
+        codec, payload = connection.execute("SELECT codec, visible_text FROM run_item_texts").fetchone()
+    assert decode_page_text(codec, payload) == "Legacy page text"
+
+    command.downgrade(config, "e5f6a7b8c9d0")
+
+    with sqlite3.connect(db_path) as connection:
+        assert connection.execute("SELECT visible_text FROM run_items").fetchone() == ("Legacy page text",)
@@ -538,6 +538,89 @@ class TestDefaultModel:
         assert registry.get_default_model_identifier() is None
 
 
+class TestLazyLoading:
+    """Models are imported on first use; ``preload: true`` entries at startup."""
+
+    @staticmethod
+    def _write_model_module(tmp_path, name):
+        (tmp_path / f"{name}.py").write_text(
+            "IMPORTS = []\n"
+            "IMPORTS.append(__name__)\n"
+            "class Model:\n"
+            "    def fit(self, X, y):\n"
+            "        return self\n"
+            "    def predict(self, X):\n"
+            "        return [0.0 for _ in X]\n"
+        )
+
+    @staticmethod
+    def _config(tmp_path, entries):
+        config_path = tmp_path / "models.yaml"
+        with open(config_path, 'w') as f:
+            yaml.dump({'models': entries}, f)
+        return config_path
+
+    def test_model_is_imported_on_first_get_and_timed(self, tmp_path, monkeypatch):
+        import sys
+        self._write_model_module(tmp_path, "lazy_model_a")
+        monkeypatch.syspath_prepend(str(tmp_path))
+        config_path = self._config(tmp_path, [
+            {'identifier': 'lazy', 'module_path': 'lazy_model_a', 'class_name': 'Model', 'version': '1.0'},
+        ])
+
+        registry = ModelRegistry()
+        registry.load_from_config(config_path)
+
+        assert 'lazy_model_a' not in sys.modules
+        assert registry.get_available_models()[0]['loaded'] is False
+        assert registry.get_available_models()[0]['loadTimeMs'] is None
+
+        model = registry.get_model('lazy')
+
+        assert model is registry.get_model('lazy')
+        assert sys.modules['lazy_model_a'].IMPORTS == ['lazy_model_a']
+        info = registry.get_available_models()[0]
+        assert info['loaded'] is True and info['loadTimeMs'] >= 0
+
+    def test_preload_entries_are_loaded_with_config(self, tmp_path, monkeypatch):
+        import sys
+        self._write_model_module(tmp_path, "lazy_model_b")
+        self._write_model_module(tmp_path, "lazy_model_c")
+        monkeypatch.syspath_prepend(str(tmp_path))
+        config_path = self._config(tmp_path, [
+            {'identifier': 'eager', 'module_path': 'lazy_model_b', 'class_name': 'Model', 'preload': True},
+            {'identifier': 'deferred', 'module_path': 'lazy_model_c', 'class_name': 'Model'},
+            {'identifier': 'broken', 'module_path': 'lazy_model_c', 'class_name': 'Missing', 'preload': True},
+        ])
+
+        registry = ModelRegistry()
+        registry.load_from_config(config_path)
+
+        assert 'lazy_model_b' in sys.modules
+        loaded = {info['identifier']: info['loaded'] for info in registry.get_available_models()}
+        assert loaded == {'eager': True, 'deferred': False}
+        assert [error.identifier for error in registry.load_errors] == ['broken']
+
+    def test_missing_module_is_reported_at_config_time(self, tmp_path):
+        config_path = self._config(tmp_path, [
+            {'identifier': 'typo', 'module_path': 'app.models.stub_modle', 'class_name': 'BaselineModel'},
+        ])
+
+        registry = ModelRegistry()
+        registry.load_from_config(config_path)
+
+        assert registry.get_available_models() == []
+        assert registry.load_errors[0].error_type == 'ImportError'
+
+    def test_preload_must_be_boolean(self, tmp_path):
+        config_path = self._config(tmp_path, [
+            {'identifier': 'x', 'module_path': 'app.models.stub_model', 'class_name': 'BaselineModel', 'preload': 'yes'},
+        ])
+
+        with pytest.raises(RegistryConfigError, match="preload must be a boolean"):
+            load_registry_config(config_path)
+
+
 class TestSingletonRegistry:
     """Tests for singleton registry instance."""
 
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import os
+
+import numpy as np
+import yaml
+
+from app.models.linear_model import HashedLogisticModel
+from app.registry import ModelRegistry, RegistryWatcher
+from app.services.model_artifacts import write_artifact
+
+
+def _entry(identifier: str, class_name: str = "BaselineModel", module_path: str = "app.models.stub_model", **extra):
+    return {"identifier": identifier, "module_path": module_path, "class_name": class_name, "version": "1.0", **extra}
+
+
+def _write_config(path, entries) -> None:
+    path.write_text(yaml.dump({"models": entries}))
+    # Force a visible mtime change even on coarse-grained filesystems
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def _registry(tmp_path, entries) -> tuple[ModelRegistry, RegistryWatcher]:
+    config_path = tmp_path / "models.yaml"
+    _write_config(config_path, entries)
+    registry = ModelRegistry(artifact_dir=tmp_path / "trained")
+    registry.load_from_config(config_path)
+    return registry, RegistryWatcher(registry, config_path, poll_interval_seconds=60)
+
+
+def test_reload_keeps_unchanged_models_and_rebuilds_load_errors(tmp_path):
+    registry, watcher = _registry(tmp_path, [_entry("kept"), _entry("dropped")])
+    kept = registry.get_model("kept")
+
+    _write_config(
+        tmp_path / "models.yaml",
+        [_entry("kept", name="Renamed"), _entry("broken", class_name="Missing"), _entry("typo", module_path="no.such")],
+    )
+    assert watcher.check_once()
+
+    assert registry.get_model("kept") is kept
+    assert registry.get_available_models()[0]["name"] == "Renamed"
+    assert registry.get_model("dropped") is None
+    assert registry.get_model("broken") is None
+    assert sorted(error.identifier for error in registry.load_errors) == ["broken", "typo"]
+
+    _write_config(tmp_path / "models.yaml", [_entry("kept"), _entry("broken")])
+    reload = registry.reload_from_config()
+
+    assert (reload.added, reload.changed, reload.removed) == ((), ("kept", "broken"), ("typo",))
+    assert registry.get_model("broken") is not None
+    assert registry.load_errors == []
+    assert registry.get_model("kept") is kept
+
+
+def test_unreadable_config_leaves_registry_in_place(tmp_path):
+    registry, watcher = _registry(tmp_path, [_entry("kept")])
+    kept = registry.get_model("kept")
+
+    (tmp_path / "models.yaml").write_text("models: [unbalanced")
+    assert not watcher.check_once()
+
+    assert registry.get_model("kept") is kept
+    assert registry.load_errors == []
+
+
+def test_rewritten_artifact_is_reloaded_on_next_use(tmp_path):
+    registry, watcher = _registry(
+        tmp_path, [_entry("linear", class_name="HashedLogisticModel", module_path="app.models.linear_model")]
+    )
+    first = HashedLogisticModel()
+    first.weights[:] = 1.0
+    write_artifact(tmp_path / "trained", model_id="linear", model_version="1.0-r1", model=first, metrics={})
+    assert watcher.check_once()
+    assert registry.get_model_version("linear", "1.0-r1").weights[0] == 1.0
+
+    second = HashedLogisticModel()
+    second.weights[:] = 2.0
+    path = write_artifact(tmp_path / "trained", model_id="linear", model_version="1.0-r1", model=second, metrics={})
+    stat = (path / "artifact.json").stat()
+    os.utime(path / "artifact.json", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert watcher.check_once()
+    assert np.all(registry.get_model_version("linear", "1.0-r1").weights == 2.0)
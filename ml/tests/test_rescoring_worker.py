@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+from contextlib import closing
+import shutil
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+
+from app.db.results_repository import ResultRepository
+from app.db.session import open_session
+from app.runtime.rescoring_worker import RescoringWorker
+from app.schemas.results import ResultMetadata
+from app.services.evaluation_store import EvaluationStore
+
+
+def _result(
+    title: str, *, run_id: str = "run-1", version: str = "1.0.0", model_id: str = "m", **extra
+) -> ResultMetadata:
+    created_at = datetime(2026, 2, 8, 12, 0, tzinfo=timezone.utc)
+    return ResultMetadata(
+        run_id=run_id,
+        query_id="q1",
+        query_text="python",
+        search_query="site:example.com python",
+        domain="example.com",
+        title=title,
+        snippet=f"{title} snippet",
+        raw_url=f"https://example.com/{title}",
+        final_url=f"https://example.com/{title}",
+        created_at=created_at,
+        updated_at=created_at,
+        relevance_score=0.1,
+        scored_at="2026-02-08T12:00:00Z",
+        score_version=version,
+        score_model_id=model_id,
+        **extra,
+    )
+
+
+def _seed(data_dir: Path, name: str, results: list[ResultMetadata]) -> Path:
+    db_path = data_dir / "db" / "runs" / name
+    session = open_session(db_path)
+    try:
+        ResultRepository(session).write_all(results)
+    finally:
+        session.close()
+    (data_dir / "db" / "current-db.txt").write_text(f"db/runs/{name}", encoding="utf-8")
+    return db_path
+
+
+def _scores(db_path: Path) -> list[tuple[str, float, str]]:
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute("SELECT title, relevance_score, score_version FROM run_items ORDER BY id").fetchall()
+
+
+def _active_db(data_dir: Path) -> Path:
+    return data_dir / (data_dir / "db" / "current-db.txt").read_text(encoding="utf-8").strip()
+
+
+class _Model:
+    def __init__(self, on_predict=None) -> None:
+        self.calls: list[list[str]] = []
+        self._on_predict = on_predict
+
+    def fit(self, X, y):
+        return self
+
+    def predict(self, X):
+        self.calls.append([row["title"] for row in X])
+        if self._on_predict is not None:
+            self._on_predict(len(self.calls))
+        return [0.5] * len(X)
+
+
+class _Registry:
+    def __init__(self, model) -> None:
+        self._model = model
+
+    def get_model(self, identifier: str):
+        return self._model
+
+    def get_model_version(self, identifier: str, version: str | None):
+        return self.get_model(identifier)
+
+
+def _setup(tmp_path: Path, results: list[ResultMetadata]) -> tuple[Path, Path, EvaluationStore]:
+    data_dir = tmp_path / "data"
+    source = _seed(data_dir, "active.db", results)
+    store = EvaluationStore(tmp_path / "evaluations.db")
+    store.activate_model(model_id="m", model_version="2.0.0", activated_by="tester", action="activated")
+    return data_dir, source, store
+
+
+def test_rescores_stale_rows_in_the_active_db(tmp_path):
+    data_dir, source, store = _setup(
+        tmp_path,
+        [_result("alpha"), _result("beta", version="2.0.0"), _result("gamma")],
+    )
+    model = _Model()
+    worker = RescoringWorker(store=store, registry=_Registry(model), data_dir=data_dir, chunk_size=1, duty_percent=100)
+
+    job = worker.run_pending()
+
+    assert job.status == "completed"
+    assert (job.total_count, job.rescored_count, job.last_id) == (2, 2, 3)
+    assert model.calls == [["alpha"], ["gamma"]]
+    assert _active_db(data_dir) == source
+    assert _scores(source) == [("alpha", 0.5, "2.0.0"), ("beta", 0.1, "2.0.0"), ("gamma", 0.5, "2.0.0")]
+    payload = worker.status_payload()
+    assert payload["running"] is False
+    assert payload["latest"]["progress"] == 1.0
+    assert worker.run_pending() is None
+
+
+def test_switching_between_models_with_the_same_version_rescores_every_row(tmp_path):
+    data_dir, source, store = _setup(
+        tmp_path, [_result("alpha", model_id="baseline"), _result("beta", version="2.0.0", model_id="baseline")]
+    )
+    model = _Model()
+    worker = RescoringWorker(store=store, registry=_Registry(model), data_dir=data_dir, duty_percent=100)
+
+    for model_id in ("hashed_logistic", "baseline"):
+        store.activate_model(model_id=model_id, model_version="2.0.0", activated_by="tester", action="activated")
+        job = worker.run_pending()
+
+        assert (job.model_id, job.status, job.total_count, job.rescored_count) == (model_id, "completed", 2, 2)
+        with closing(sqlite3.connect(source)) as conn:
+            assert conn.execute("SELECT DISTINCT score_model_id, score_version FROM run_items").fetchall() == [
+                (model_id, "2.0.0")
+            ]
+    assert model.calls == [["alpha", "beta"], ["alpha", "beta"]]
+    assert worker.run_pending() is None
+
+
+def test_feedback_written_during_a_job_is_kept(tmp_path):
+    data_dir, source, store = _setup(tmp_path, [_result("alpha"), _result("beta")])
+
+    def write_feedback(calls: int) -> None:
+        if calls != 1:
+            return
+        # The API records a manual label in the active DB while the job runs
+        with closing(sqlite3.connect(source)) as conn:
+            conn.execute(
+                "CREATE TABLE manual_feedback (identity_key TEXT PRIMARY KEY, manual_label TEXT, "
+                "manual_label_updated_at TEXT NOT NULL)"
+            )
+            conn.execute("INSERT INTO manual_feedback VALUES ('k1', 'relevant', '2026-02-08T12:00:00Z')")
+            conn.commit()
+
+    model = _Model(on_predict=write_feedback)
+    worker = RescoringWorker(store=store, registry=_Registry(model), data_dir=data_dir, chunk_size=1, duty_percent=100)
+
+    job = worker.run_pending()
+
+    assert job.status == "completed"
+    assert _active_db(data_dir) == source
+    assert {row[2] for row in _scores(source)} == {"2.0.0"}
+    with closing(sqlite3.connect(source)) as conn:
+        assert conn.execute("SELECT identity_key, manual_label FROM manual_feedback").fetchall() == [
+            ("k1", "relevant")
+        ]
+
+
+def test_interrupted_job_resumes_from_its_checkpoint(tmp_path):
+    data_dir, _, store = _setup(tmp_path, [_result("alpha"), _result("beta"), _result("gamma")])
+    holder: dict[str, RescoringWorker] = {}
+    model = _Model(on_predict=lambda calls: holder["worker"].stop() if calls == 1 else None)
+    holder["worker"] = RescoringWorker(
+        store=store, registry=_Registry(model), data_dir=data_dir, chunk_size=1, duty_percent=100
+    )
+
+    interrupted = holder["worker"].run_pending()
+    resumed = RescoringWorker(
+        store=store, registry=_Registry(model), data_dir=data_dir, chunk_size=1, duty_percent=100
+    ).run_pending()
+
+    assert (interrupted.status, interrupted.rescored_count) == ("running", 1)
+    assert resumed.job_id == interrupted.job_id
+    assert resumed.status == "completed"
+    assert model.calls == [["alpha"], ["beta"], ["gamma"]]
+    assert {row[2] for row in _scores(_active_db(data_dir))} == {"2.0.0"}
+
+
+def test_resumed_job_continues_on_the_db_a_run_swapped_in(tmp_path):
+    data_dir, source, store = _setup(tmp_path, [_result("alpha"), _result("beta")])
+    holder: dict[str, RescoringWorker] = {}
+    model = _Model(on_predict=lambda calls: holder["worker"].stop() if calls == 1 else None)
+    holder["worker"] = RescoringWorker(
+        store=store, registry=_Registry(model), data_dir=data_dir, chunk_size=1, duty_percent=100
+    )
+    holder["worker"].run_pending()
+
+    # A run copies the active DB, adds its rows and swaps the pointer
+    run_db = data_dir / "db" / "runs" / "run-2.db"
+    shutil.copy2(source, run_db)
+    session = open_session(run_db)
+    try:
+        ResultRepository(session).write_all([_result("delta", run_id="run-2", version="1.0.0")])
+    finally:
+        session.close()
+    (data_dir / "db" / "current-db.txt").write_text("db/runs/run-2.db", encoding="utf-8")
+
+    job = RescoringWorker(
+        store=store, registry=_Registry(model), data_dir=data_dir, chunk_size=1, duty_percent=100
+    ).run_pending()
+
+    assert job.status == "completed"
+    # The chunk committed before the copy is carried over; only later rows are scored
+    assert model.calls == [["alpha"], ["beta"], ["delta"]]
+    assert Path(job.source_db).name == "run-2.db"
+    assert _scores(run_db) == [("alpha", 0.5, "2.0.0"), ("beta", 0.5, "2.0.0"), ("delta", 0.5, "2.0.0")]
+
+
+def test_model_failure_fails_the_job(tmp_path):
+    data_dir, source, store = _setup(tmp_path, [_result("alpha")])
+
+    class _Broken(_Model):
+        def predict(self, X):
+            raise RuntimeError("boom")
+
+    job = RescoringWorker(store=store, registry=_Registry(_Broken()), data_dir=data_dir, duty_percent=100).run_pending()
+
+    assert (job.status, job.error_message) == ("failed", "boom")
+    assert _active_db(data_dir) == source
+    assert _scores(source) == [("alpha", 0.1, "1.0.0")]
@@ -11,6 +11,9 @@ class _Registry:
     def get_model(self, identifier: str):
         return None
 
+    def get_model_version(self, identifier: str, version: str | None):
+        return self.get_model(identifier)
+
 
 def _prepare_empty_run_items(db_path: Path) -> None:
     with sqlite3.connect(db_path) as conn:
@@ -3,7 +3,16 @@ from __future__ import annotations
 import sqlite3
 from pathlib import Path
 
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+import yaml
+
+from app.db.models import Base, RunResult
 from app.pipelines.retrain import RetrainPipeline
+from app.pipelines.scoring import DEFAULT_SCORE_VERSION, score_run_results
+from app.registry import ModelRegistry
+from app.services.active_model_cache import ActiveModelReference
 from app.services.evaluation_store import EvaluationStore
 
 
@@ -36,6 +45,9 @@ class _Registry:
             return self._model
         return None
 
+    def get_model_version(self, identifier: str, version: str | None):
+        return self.get_model(identifier)
+
 
 def _write_pointer(data_dir: Path, run_db_path: Path) -> None:
     db_dir = data_dir / "db"
@@ -108,8 +120,9 @@ def test_retrain_pipeline_creates_new_version_and_promotes_active_model(tmp_path
     assert active is not None
     assert active.model_version == result.new_version
 
-    artifacts = list(artifact_dir.glob("baseline_*.pkl"))
+    artifacts = list(artifact_dir.glob("baseline_*/artifact.json"))
     assert len(artifacts) == 1
+    assert list(artifact_dir.glob("*.pkl")) == []
 
 
 def test_retrain_failure_keeps_previous_active_model(tmp_path: Path) -> None:
@@ -143,3 +156,92 @@ def test_retrain_failure_keeps_previous_active_model(tmp_path: Path) -> None:
     active = store.get_active_model()
     assert active is not None
     assert active.model_version == "2.0.0"
+
+
+def _configured_registry(tmp_path: Path, artifact_dir: Path) -> ModelRegistry:
+    config_path = tmp_path / "models.yaml"
+    config_path.write_text(
+        yaml.dump(
+            {
+                "models": [
+                    {
+                        "identifier": "hashed_logistic",
+                        "module_path": "app.models.linear_model",
+                        "class_name": "HashedLogisticModel",
+                        "version": "1.0.0",
+                    }
+                ]
+            }
+        )
+    )
+    registry = ModelRegistry(artifact_dir=artifact_dir)
+    registry.load_from_config(config_path)
+    return registry
+
+
+def _score_one_row(registry: ModelRegistry, version: str, monkeypatch: pytest.MonkeyPatch) -> tuple[str, str | None]:
+    monkeypatch.setattr("app.pipelines.scoring.get_registry", lambda: registry)
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add(
+        RunResult(
+            run_id="run-1",
+            query_id="q1",
+            query_text="python",
+            search_query="site:example.com python",
+            domain="example.com",
+            title="Role",
+            snippet="Desc",
+            raw_url="https://example.com/1",
+            final_url="https://example.com/1",
+            created_at="2026-02-13T10:00:00Z",
+            updated_at="2026-02-13T10:00:00Z",
+        )
+    )
+    session.commit()
+    score_run_results(session, "run-1", active_model=ActiveModelReference("hashed_logistic", version))
+    row = session.query(RunResult).one()
+    scored = (row.score_version, row.score_model_id)
+    session.close()
+    return scored
+
+
+@pytest.mark.parametrize("legacy", [True, False], ids=["legacy-pickle", "no-artifact"])
+def test_active_version_without_a_new_format_artifact(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, legacy: bool):
+    version = "1.0.0-20260101000000"
+    artifact_dir = tmp_path / "trained"
+    artifact_dir.mkdir()
+    if legacy:
+        # Written by retrain before the artifact format; never unpickled
+        (artifact_dir / f"hashed_logistic_{version}.pkl").write_bytes(b"legacy pickle")
+    registry = _configured_registry(tmp_path, artifact_dir)
+    store = EvaluationStore(tmp_path / "evaluations.db")
+    store.activate_model(model_id="hashed_logistic", model_version=version, activated_by="tester", action="activated")
+    data_dir = tmp_path / "data"
+    run_db_path = tmp_path / "run.db"
+    _write_pointer(data_dir, run_db_path)
+    _seed_run_items(
+        run_db_path,
+        rows=[
+            ("Role A", "python", "example.com", 1.0, "2026-02-13T08:00:00Z"),
+            ("Role B", "retail", "example.com", -1.0, "2026-02-13T08:01:00Z"),
+        ],
+    )
+    pipeline = RetrainPipeline(store=store, registry=registry, data_dir=data_dir, artifact_dir=artifact_dir)
+
+    result = pipeline.run_once(triggered_by="manual")
+    scored = _score_one_row(registry, version, monkeypatch)
+
+    if legacy:
+        # Served by the configured model, as before the upgrade; retrain writes the next version in the new format
+        assert result.status == "completed"
+        assert store.get_active_model().model_version == result.new_version
+        assert (artifact_dir / f"hashed_logistic_{result.new_version}" / "artifact.json").is_file()
+        assert scored == (version, "hashed_logistic")
+    else:
+        assert result.status == "failed"
+        assert f"version '{version}' is not registered or loadable" in result.error_message
+        assert store.get_active_model().model_version == version
+        # Scored by the baseline and recorded as such, never under the missing version
+        assert scored == (DEFAULT_SCORE_VERSION, None)
@@ -1,11 +1,11 @@
 import json
 from pathlib import Path
 
+from app.db.session import resolve_active_db_path
 from app.pipelines.ingestion import IngestionOutcome, ZeroResultObservation
 from app.runtime.run_events_worker import (
     RunEventsWorker,
     _prepare_run_database,
-    _resolve_active_db_path,
     _update_db_pointer,
 )
 
@@ -91,7 +91,7 @@ def test_worker_publishes_summary_metrics_and_zero_results(monkeypatch, tmp_path
 
 
 def test_resolve_active_db_path_returns_none_when_no_pointer_or_default(tmp_path: Path):
-    result = _resolve_active_db_path(tmp_path)
+    result = resolve_active_db_path(tmp_path)
     assert result is None
 
 
@@ -100,7 +100,7 @@ def test_resolve_active_db_path_falls_back_to_default(tmp_path: Path):
     default_db.parent.mkdir(parents=True, exist_ok=True)
     default_db.touch()
 
-    result = _resolve_active_db_path(tmp_path)
+    result = resolve_active_db_path(tmp_path)
     assert result == default_db
 
 
@@ -112,7 +112,7 @@ def test_resolve_active_db_path_uses_pointer(tmp_path: Path):
     pointer_file = tmp_path / "db" / "current-db.txt"
     pointer_file.write_text("db/runs/some-run.db", encoding="utf-8")
 
-    result = _resolve_active_db_path(tmp_path)
+    result = resolve_active_db_path(tmp_path)
     assert result == pointer_db
 
 
@@ -121,7 +121,7 @@ def test_resolve_active_db_path_ignores_nonexistent_pointer(tmp_path: Path):
     pointer_file.parent.mkdir(parents=True, exist_ok=True)
     pointer_file.write_text("db/runs/nonexistent.db", encoding="utf-8")
 
-    result = _resolve_active_db_path(tmp_path)
+    result = resolve_active_db_path(tmp_path)
     assert result is None
 
 
@@ -0,0 +1,217 @@
+from datetime import datetime, timezone
+from pathlib import Path
+import sqlite3
+
+import numpy as np
+import pyarrow.parquet as pq
+
+from app.db.results_repository import ResultRepository
+from app.db.session import open_session
+from app.pipelines.evaluation import EvaluationDatasetProvider
+from app.pipelines.retrain import RetrainPipeline
+from app.schemas.results import ResultMetadata
+from app.services.evaluation_store import EvaluationStore
+from app.services.feature_store import featurize
+from app.services.run_item_export import (
+    EXPORT_SCHEMA,
+    column_to_numpy,
+    current_partitions,
+    export_root_for,
+    export_run,
+    exported_run_ids,
+    labeled_rows_filter,
+    load_run_items,
+    sync_exports,
+)
+
+
+def _result(run_id: str, title: str, *, day: int, score: float | None, **extra) -> ResultMetadata:
+    created_at = datetime(2026, 2, day, 12, 0, tzinfo=timezone.utc)
+    return ResultMetadata(
+        run_id=run_id,
+        query_id="q1",
+        query_text="python",
+        search_query="site:example.com python",
+        domain="example.com",
+        title=title,
+        snippet=f"{title} snippet",
+        raw_url=f"https://example.com/{title}",
+        final_url=f"https://example.com/{title}",
+        created_at=created_at,
+        updated_at=created_at,
+        relevance_score=score,
+        scored_at=None if score is None else f"2026-02-{day:02d}T12:00:00Z",
+        **extra,
+    )
+
+
+def _seed(data_dir: Path, results: list[ResultMetadata]) -> Path:
+    db_path = data_dir / "db" / "runs" / "active.db"
+    session = open_session(db_path)
+    try:
+        ResultRepository(session).write_all(results)
+    finally:
+        session.close()
+    (data_dir / "db" / "current-db.txt").write_text("db/runs/active.db", encoding="utf-8")
+    return db_path
+
+
+def test_export_run_writes_partition_by_date_and_run(tmp_path):
+    db_path = _seed(
+        tmp_path,
+        [
+            _result("run-1", "alpha", day=8, score=0.8, visible_text="Alpha page text"),
+            _result("run-1", "beta", day=8, score=None),
+            _result("run-2", "gamma", day=9, score=-0.5),
+        ],
+    )
+    export_root = export_root_for(tmp_path)
+
+    target = export_run(db_path, "run-1", export_root)
+
+    assert target == export_root / "date=2026-02-08" / "run_id=run-1" / "part-0.parquet"
+    table = load_run_items(export_root, ["id", "title", "visible_text", "is_duplicate"])
+    assert table.column("title").to_pylist() == ["alpha", "beta"]
+    assert table.column("visible_text").to_pylist() == ["Alpha page text", None]
+    assert table.column("is_duplicate").to_pylist() == [False, False]
+    assert export_run(db_path, "missing-run", export_root) is None
+
+
+def test_sync_exports_backfills_missing_runs_only(tmp_path):
+    db_path = _seed(
+        tmp_path,
+        [_result("run-1", "alpha", day=8, score=0.8), _result("run-2", "gamma", day=9, score=-0.5)],
+    )
+    export_root = export_root_for(tmp_path)
+    export_run(db_path, "run-1", export_root)
+
+    assert sync_exports(db_path, export_root) == ["run-2"]
+    assert sync_exports(db_path, export_root) == []
+    assert exported_run_ids(export_root) == ["run-1", "run-2"]
+
+
+def test_load_run_items_selects_runs_columns_and_labeled_rows(tmp_path):
+    db_path = _seed(
+        tmp_path,
+        [
+            _result("run-1", "alpha", day=8, score=0.8),
+            _result("run-1", "copy", day=8, score=0.8, is_duplicate=True),
+            _result("run-2", "gamma", day=9, score=-0.5),
+            _result("run-2", "unscored", day=9, score=None),
+        ],
+    )
+    export_root = export_root_for(tmp_path)
+    sync_exports(db_path, export_root)
+
+    labeled = load_run_items(export_root, ["title", "relevance_score"], filter=labeled_rows_filter())
+    recent = load_run_items(
+        export_root, ["title"], filter=labeled_rows_filter(scored_after="2026-02-08T23:59:59Z")
+    )
+    only_run_2 = load_run_items(export_root, ["title"], run_ids=["run-2"])
+
+    assert labeled.column_names == ["title", "relevance_score"]
+    assert labeled.column("title").to_pylist() == ["alpha", "gamma"]
+    scores = column_to_numpy(labeled, "relevance_score")
+    assert scores.dtype == np.float64
+    assert scores.tolist() == [0.8, -0.5]
+    assert recent.column("title").to_pylist() == ["gamma"]
+    assert only_run_2.column("title").to_pylist() == ["gamma", "unscored"]
+    assert load_run_items(tmp_path / "empty", ["title"]).num_rows == 0
+
+
+def test_reexport_replaces_partition_from_previous_date(tmp_path):
+    export_root = export_root_for(tmp_path)
+    stale = export_root / "date=2026-01-01" / "run_id=run-1"
+    stale.mkdir(parents=True)
+    db_path = _seed(tmp_path, [_result("run-1", "alpha", day=8, score=0.8)])
+    export_run(db_path, "run-1", export_root)
+    (stale / "part-0.parquet").write_bytes(b"stale")
+
+    export_run(db_path, "run-1", export_root)
+
+    assert not (export_root / "date=2026-01-01").exists()
+    assert load_run_items(export_root, ["title"]).column("title").to_pylist() == ["alpha"]
+
+
+def test_evaluation_and_retrain_read_labels_from_exports(tmp_path):
+    data_dir = tmp_path / "data"
+    db_path = _seed(
+        data_dir,
+        [
+            _result("run-1", "alpha", day=8, score=0.8),
+            _result("run-1", "beta", day=8, score=-0.2),
+            _result("run-2", "gamma", day=9, score=0.4),
+        ],
+    )
+    sync_exports(db_path, export_root_for(data_dir))
+
+    dataset = EvaluationDatasetProvider(data_dir=data_dir).load_dataset()
+    samples = RetrainPipeline(
+        store=EvaluationStore(tmp_path / "evaluations.db"),
+        registry=object(),
+        data_dir=data_dir,
+    )._load_new_labels(since="2026-02-08T23:59:59Z")
+
+    assert dataset.dataset_id == "exports[2]+active.db[0]:3"
+    assert dataset.labels == [1, 0, 1]
+    assert dataset.features[0] == {"title": "alpha", "snippet": "alpha snippet", "domain": "example.com"}
+    assert [(sample.features["title"], sample.label) for sample in samples] == [("gamma", 1)]
+
+
+def test_stale_and_unexported_runs_are_read_from_the_db(tmp_path):
+    data_dir = tmp_path / "data"
+    db_path = _seed(
+        data_dir,
+        [
+            _result("run-1", "alpha", day=8, score=0.8),
+            _result("run-2", "beta", day=9, score=-0.2),
+        ],
+    )
+    export_root = export_root_for(data_dir)
+    sync_exports(db_path, export_root)
+    # Rescored after its export, plus a run that was never exported
+    with sqlite3.connect(db_path) as connection:
+        connection.execute(
+            "UPDATE run_items SET relevance_score = 0.6, scored_at = '2026-02-10T12:00:00Z' WHERE title = 'beta'"
+        )
+    _seed(data_dir, [_result("run-3", "gamma", day=10, score=-0.4)])
+
+    with sqlite3.connect(db_path) as connection:
+        assert list(current_partitions(connection, export_root)) == ["run-1"]
+    dataset = EvaluationDatasetProvider(data_dir=data_dir).load_dataset()
+    samples = RetrainPipeline(
+        store=EvaluationStore(tmp_path / "evaluations.db"),
+        registry=object(),
+        data_dir=data_dir,
+    )._load_new_labels(since="2026-02-08T23:59:59Z")
+
+    assert dataset.dataset_id == "exports[1]+active.db[2]:3"
+    assert [row["title"] for row in dataset.features] == ["alpha", "beta", "gamma"]
+    assert dataset.labels == [1, 1, 0]
+    assert sorted((sample.features["title"], sample.label) for sample in samples) == [("beta", 1), ("gamma", 0)]
+
+
+def test_exports_carry_feature_vectors_and_old_partitions_are_featurized(tmp_path):
+    data_dir = tmp_path / "data"
+    db_path = _seed(
+        data_dir,
+        [
+            _result("run-1", "alpha", day=8, score=0.8),
+            _result("run-2", "beta", day=9, score=-0.2),
+        ],
+    )
+    export_root = export_root_for(data_dir)
+    sync_exports(db_path, export_root)
+    # A partition written before feature columns existed
+    old_part = next(export_root.glob("date=*/run_id=run-2/part-0.parquet"))
+    table = pq.read_table(old_part)
+    pq.write_table(table.drop(["feature_version", "features"]), old_part)
+
+    dataset = EvaluationDatasetProvider(data_dir=data_dir).load_dataset()
+
+    stored = load_run_items(export_root, ["feature_version"], run_ids=["run-1"])
+    assert "features" in EXPORT_SCHEMA.names
+    assert stored.column("feature_version").to_pylist() == ["hashed-tokens-v1"]
+    assert len(dataset.matrix) == 2
+    expected = featurize("beta", "beta snippet", "example.com")
+    assert dataset.matrix.indices[dataset.matrix.indptr[1] :].tolist() == expected[0].tolist()
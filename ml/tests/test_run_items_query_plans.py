@@ -0,0 +1,110 @@
+"""Query-plan guards for the hot run_items read paths."""
+
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from app.db.session import open_session
+from app.pipelines.scoring import _PROPAGATE_RUN_CANONICALS, _PROPAGATE_RUN_DUPLICATES
+from app.services.cache import CACHED_RESULTS_SQL, LATEST_CACHE_METADATA_SQL, LATEST_LAST_SEEN_SQL
+
+
+# Mirrors the listing queries in api/.../repository/ResultRepository.java.
+_API_COLUMNS = (
+    "id, run_id, query_id, query_text, search_query, domain, title, snippet, "
+    "raw_url, final_url, created_at, raw_html_path, "
+    "cache_key, cached_at, last_seen_at, normalized_url, "
+    "canonical_id, is_duplicate, is_hidden, duplicate_count, "
+    "relevance_score, scored_at, score_version"
+)
+# Listings leave page text to the detail query
+_API_FROM = "run_items"
+
+# (name, sql, params, must avoid a temp b-tree sort)
+HOT_QUERIES = [
+    ("cache_latest_metadata", LATEST_CACHE_METADATA_SQL, ("key",), True),
+    ("cache_results", CACHED_RESULTS_SQL, ("run", "key"), True),
+    ("revisit_last_seen", LATEST_LAST_SEEN_SQL, ("https://a", "https://a"), False),
+    (
+        "dedupe_candidates",
+        "SELECT id FROM run_items WHERE run_id = ? AND (is_duplicate = 0 OR is_duplicate IS NULL)",
+        ("run",),
+        False,
+    ),
+    (
+        "scoring_unscored",
+        "SELECT id FROM run_items WHERE run_id = ? AND relevance_score IS NULL",
+        ("run",),
+        False,
+    ),
+    (
+        "api_results_by_run",
+        f"SELECT {_API_COLUMNS} FROM {_API_FROM} WHERE run_id = ? "
+        "AND (is_hidden = 0 OR is_hidden IS NULL) ORDER BY created_at DESC, id DESC",
+        ("run",),
+        True,
+    ),
+    (
+        "api_results_by_run_and_query",
+        f"SELECT {_API_COLUMNS} FROM {_API_FROM} WHERE run_id = ? AND query_id = ? "
+        "AND (is_hidden = 0 OR is_hidden IS NULL) ORDER BY created_at DESC, id DESC",
+        ("run", "query"),
+        True,
+    ),
+    (
+        "api_count_by_run",
+        "SELECT COUNT(*) FROM run_items WHERE run_id = ? AND (is_hidden = 0 OR is_hidden IS NULL)",
+        ("run",),
+        False,
+    ),
+    (
+        "api_count_duplicates",
+        "SELECT COUNT(*) FROM run_items WHERE run_id = ? AND is_duplicate = 1",
+        ("run",),
+        False,
+    ),
+]
+
+
+@pytest.fixture
+def migrated_db(tmp_path):
+    db_path = tmp_path / "plans.db"
+    open_session(db_path).close()
+    connection = sqlite3.connect(db_path)
+    yield connection
+    connection.close()
+
+
+def _plan(connection: sqlite3.Connection, sql: str, params: tuple | dict[str, object]) -> list[str]:
+    return [str(row[3]) for row in connection.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+@pytest.mark.parametrize(
+    ("name", "sql", "params", "ordered"),
+    HOT_QUERIES,
+    ids=[item[0] for item in HOT_QUERIES],
+)
+def test_hot_query_does_not_scan_run_items(migrated_db, name, sql, params, ordered):
+    plan = _plan(migrated_db, sql, params)
+
+    assert plan, name
+    assert not any(step == "SCAN run_items" for step in plan), f"{name} falls back to a full scan: {plan}"
+    if ordered:
+        assert not any("TEMP B-TREE" in step for step in plan), f"{name} sorts in a temp b-tree: {plan}"
+
+
+def test_cache_metadata_uses_composite_index(migrated_db):
+    plan = _plan(migrated_db, LATEST_CACHE_METADATA_SQL, ("key",))
+
+    assert any("idx_run_items__cache_key_cached_at" in step for step in plan)
+
+
+def test_run_score_propagation_uses_run_and_canonical_indexes(migrated_db):
+    duplicates = _plan(migrated_db, str(_PROPAGATE_RUN_DUPLICATES), {"run_id": "run"})
+    canonicals = _plan(migrated_db, str(_PROPAGATE_RUN_CANONICALS), {"run_id": "run"})
+
+    assert "idx_run_items__run_id_is_duplicate" in duplicates[0]
+    assert "idx_run_items__run_id" in canonicals[0]
+    assert "idx_run_items__canonical_id" in canonicals[1]
@@ -7,16 +7,23 @@ from datetime import datetime, timezone
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
-from app.db.models import Base, RunResult
+from app.db.models import Base, RunItemFeatures, RunResult
 from app.pipelines.scoring import (
     score_run_results,
     validate_score,
     get_canonical_score,
+    propagate_canonical_scores,
     MIN_SCORE,
     MAX_SCORE,
     DEFAULT_SCORE,
     DEFAULT_SCORE_VERSION,
 )
+from app.services.feature_store import (
+    FEATURIZER_VERSION,
+    decode_features,
+    encode_features,
+    featurize,
+)
 
 
 @pytest.fixture
@@ -171,6 +178,139 @@ class TestScoreRunResults:
             session.refresh(result)
             assert result.score_version == custom_version
 
+    def test_streams_chunks_through_the_model(self, session, sample_results, duplicate_result, monkeypatch):
+        """Rows are predicted chunk by chunk and written back per chunk."""
+        extra = RunResult(
+            run_id="test-run-1",
+            query_id="q3",
+            query_text="test query 3",
+            search_query="site:example.com test3",
+            domain="example.com",
+            title="Job 3",
+            snippet="Snippet 3",
+            raw_url="https://example.com/job3",
+            final_url="https://example.com/job3",
+            created_at="2026-02-13T10:03:00Z",
+            updated_at="2026-02-13T10:03:00Z",
+        )
+        session.add(extra)
+        session.commit()
+
+        calls = []
+
+        class _TitleModel:
+            version = "chunked"
+
+            def predict(self, X):
+                calls.append([row["title"] for row in X])
+                return [0.5 if row["title"] == "Job 3" else 0.25 for row in X]
+
+        class _Registry:
+            is_initialized = True
+
+            def get_model(self, identifier):
+                return _TitleModel()
+
+        monkeypatch.setattr("app.pipelines.scoring.get_registry", lambda: _Registry())
+
+        outcome = score_run_results(session, "test-run-1", model_identifier="title-model", chunk_size=2)
+
+        assert calls == [["Job 1", "Job 2"], ["Job 3"]]
+        assert (outcome.scored_count, outcome.skipped_count) == (3, 1)
+        assert outcome.rows_per_second > 0
+        session.refresh(extra)
+        session.refresh(duplicate_result)
+        assert (extra.relevance_score, extra.score_version) == (0.5, "chunked")
+        assert duplicate_result.relevance_score is None
+
+    def test_feature_models_read_stored_vectors_and_refresh_stale_ones(self, session, sample_results, monkeypatch):
+        """Feature-store models get a matrix; stale vectors are recomputed and stored."""
+        first, second = sample_results
+        stored = featurize("Stored title", "", None)
+        first.features = RunItemFeatures(version=FEATURIZER_VERSION, features=encode_features(stored))
+        second.features = RunItemFeatures(version="hashed-tokens-v0", features=encode_features(stored))
+        session.commit()
+
+        matrices = []
+
+        class _MatrixModel:
+            version = "matrix"
+            featurizer_version = FEATURIZER_VERSION
+
+            def fit_features(self, X, y):
+                return self
+
+            def predict_features(self, X):
+                matrices.append(X)
+                return [0.5] * len(X)
+
+            def predict(self, X):
+                raise AssertionError("dict features should not be built")
+
+        class _Registry:
+            is_initialized = True
+
+            def get_model(self, identifier):
+                return _MatrixModel()
+
+        monkeypatch.setattr("app.pipelines.scoring.get_registry", lambda: _Registry())
+
+        outcome = score_run_results(session, "test-run-1", model_identifier="matrix-model")
+
+        assert outcome.scored_count == 2
+        [matrix] = matrices
+        expected = featurize("Job 2", "Snippet 2", "example.com")
+        assert matrix.indices[: matrix.indptr[1]].tolist() == stored[0].tolist()
+        assert matrix.indices[matrix.indptr[1] :].tolist() == expected[0].tolist()
+        session.refresh(second.features)
+        assert second.features.version == FEATURIZER_VERSION
+        assert decode_features(second.features.features)[0].tolist() == expected[0].tolist()
+
+
+class TestPropagateCanonicalScores:
+    """Tests for the propagate_canonical_scores function."""
+
+    def test_copies_scores_to_same_run_and_cross_run_duplicates(self, session, sample_results, duplicate_result):
+        """Duplicates in this run and later runs inherit the canonical's score fields."""
+        later = RunResult(
+            run_id="test-run-2",
+            query_id="q1",
+            query_text="test query",
+            search_query="site:example.com test",
+            domain="example.com",
+            title="Job 1 Again",
+            snippet="Snippet 1",
+            raw_url="https://example.com/job1?ref=2",
+            final_url="https://example.com/job1",
+            created_at="2026-02-14T10:00:00Z",
+            updated_at="2026-02-14T10:00:00Z",
+            canonical_id=sample_results[0].id,
+            is_duplicate=True,
+            is_hidden=True,
+        )
+        session.add(later)
+        session.commit()
+        now = datetime(2026, 2, 13, 12, 0, 0, tzinfo=timezone.utc)
+        score_run_results(session, "test-run-1", score_version="v2", now=now)
+
+        updated = propagate_canonical_scores(session, "test-run-1")
+
+        assert updated == 2
+        for duplicate in (duplicate_result, later):
+            session.refresh(duplicate)
+            assert (duplicate.relevance_score, duplicate.scored_at, duplicate.score_version) == (
+                DEFAULT_SCORE,
+                "2026-02-13T12:00:00Z",
+                "v2",
+            )
+        # Already in sync: nothing to rewrite
+        assert propagate_canonical_scores(session, "test-run-2") == 0
+
+    def test_unscored_canonicals_are_not_propagated(self, session, sample_results, duplicate_result):
+        assert propagate_canonical_scores(session, "test-run-1") == 0
+        session.refresh(duplicate_result)
+        assert duplicate_result.relevance_score is None
+
 
 class TestValidateScore:
     """Tests for the validate_score function."""
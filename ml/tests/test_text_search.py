@@ -0,0 +1,159 @@
+from datetime import datetime, timezone
+
+from app.db.results_repository import ResultRepository
+from app.db.session import open_session
+from app.db.text_search import (
+    build_match_expression,
+    index_run_results,
+    search_results,
+)
+from app.pipelines.ingestion import RunInput, ingest_run
+from app.schemas.results import ResultMetadata, SearchResultItem
+
+
+_NOW = datetime(2026, 2, 8, 12, 0, tzinfo=timezone.utc)
+
+
+def _result(run_id: str, title: str, snippet: str, visible_text: str | None = None, **extra) -> ResultMetadata:
+    return ResultMetadata(
+        run_id=run_id,
+        query_id="q1",
+        query_text="python",
+        search_query="site:example.com python",
+        domain="example.com",
+        title=title,
+        snippet=snippet,
+        raw_url=f"https://example.com/{title.lower().replace(' ', '-')}",
+        final_url=f"https://example.com/{title.lower().replace(' ', '-')}",
+        created_at=_NOW,
+        updated_at=_NOW,
+        visible_text=visible_text,
+        **extra,
+    )
+
+
+def _seed(db_path, results):
+    session = open_session(db_path)
+    try:
+        ResultRepository(session).write_all(results)
+        for run_id in {result.run_id for result in results}:
+            index_run_results(session, run_id)
+    finally:
+        session.close()
+
+
+def test_search_ranks_title_matches_first_and_highlights(tmp_path):
+    db_path = tmp_path / "search.db"
+    _seed(
+        db_path,
+        [
+            _result("run-1", "Office Manager", "Front desk", "Candidates with some Python scripting are welcome."),
+            _result("run-1", "Python Engineer", "Backend platform team", "Build services."),
+        ],
+    )
+
+    hits = search_results(db_path, "python")
+
+    assert [hit.title for hit in hits] == ["Python Engineer", "Office Manager"]
+    assert "<mark>Python</mark>" in hits[0].highlight
+    assert hits[0].rank <= hits[1].rank
+
+
+def test_search_requires_all_terms_and_supports_prefix(tmp_path):
+    db_path = tmp_path / "search.db"
+    _seed(
+        db_path,
+        [
+            _result("run-1", "Senior Python Engineer", "Remote"),
+            _result("run-1", "Python Intern", "Onsite"),
+        ],
+    )
+
+    assert [hit.title for hit in search_results(db_path, "python remote")] == ["Senior Python Engineer"]
+    assert len(search_results(db_path, "pyth*")) == 2
+
+
+def test_search_filters_by_run_and_hidden_rows(tmp_path):
+    db_path = tmp_path / "search.db"
+    _seed(
+        db_path,
+        [
+            _result("run-1", "Python Engineer", "First run"),
+            _result("run-2", "Python Developer", "Second run"),
+            _result("run-2", "Python Developer Copy", "Second run", is_duplicate=True, is_hidden=True),
+        ],
+    )
+
+    assert [hit.run_id for hit in search_results(db_path, "python", run_id="run-2")] == ["run-2"]
+    assert len(search_results(db_path, "python", run_id="run-2", include_hidden=True)) == 2
+
+
+def test_index_run_results_is_idempotent(tmp_path):
+    db_path = tmp_path / "search.db"
+    _seed(db_path, [_result("run-1", "Python Engineer", "Remote")])
+
+    session = open_session(db_path)
+    try:
+        assert index_run_results(session, "run-1") == 0
+    finally:
+        session.close()
+
+    assert len(search_results(db_path, "python")) == 1
+
+
+def test_build_match_expression_quotes_user_input():
+    assert build_match_expression('python "dev') == '"python" "dev"'
+    assert build_match_expression("c++ AND OR") == '"c++" "AND" "OR"'
+    assert build_match_expression("eng*") == '"eng"*'
+    assert build_match_expression("  ") is None
+    assert build_match_expression(None) is None
+
+
+def test_search_handles_operator_like_input(tmp_path):
+    db_path = tmp_path / "search.db"
+    _seed(db_path, [_result("run-1", "Python Engineer", "Remote")])
+
+    assert search_results(db_path, 'python OR "NEAR(') == []
+    assert search_results(tmp_path / "missing.db", "python") == []
+
+
+def test_ingest_run_populates_text_index(tmp_path):
+    class StubSearchClient:
+        def search(self, *, run_id: str, search_query: str):
+            return [
+                SearchResultItem(
+                    title="Backend Engineer",
+                    snippet="Remote Kubernetes role",
+                    link="https://example.com/job",
+                    display_link="example.com",
+                )
+            ]
+
+    class StubResolver:
+        def resolve(self, url: str):
+            return type("Resolved", (), {"status_code": 200, "final_url": url, "redirected": False})()
+
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    (config_dir / "cache.yaml").write_text("cache:\n  ttlHours: 12\n  revisitThrottleDays: 7\n", encoding="utf-8")
+
+    ingest_run(
+        run_id="run-fts",
+        run_inputs=[
+            RunInput(
+                query_id="q1",
+                query_text="Backend",
+                domain="example.com",
+                search_query="site:example.com Backend",
+            )
+        ],
+        search_client=StubSearchClient(),
+        url_resolver=StubResolver(),
+        now=_NOW,
+        data_dir=tmp_path,
+        config_dir=config_dir,
+        scoring_enabled=False,
+    )
+
+    hits = search_results(tmp_path / "db" / "runs" / "run-fts.db", "kubernetes")
+    assert [hit.title for hit in hits] == ["Backend Engineer"]